@@ -1,114 +1,166 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import PyPDF2
-import docx
 import re
 import io
+import threading
+import time
+from bisect import bisect_left
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 import json
 import os
 
+from matching import SKILL_FIELDS, SKILL_WEIGHT, MatchIndex, PairSide, build_vectorizer, rank_pairs
+from skills import default_dictionary, load_taxonomy, shared_skill_names, split_skills
+from keywords import build_matchers
+from extraction import iter_docx_text, iter_pdf_text, iter_txt_text, join_text, load_parsers
+from retrieval import CandidateRetriever, DEFAULT_SHORTLIST_SIZE, MAX_SHORTLIST_SIZE, recall_at_k
+from jobs import JobQueue, QueueFull
+from cache import MatchCache, ResumeCache
+from storage import DEFAULT_PAGE_SIZE, SQLiteRepository
+from snapshots import SnapshotStore
+from materialized import DEFAULT_TOP_K, MaterializedMatches
+from semantic import DEFAULT_COMPONENTS as DEFAULT_SEMANTIC_COMPONENTS, SemanticIndex
+from shards import ShardPool
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics, stage
+from responses import COMPRESS_MIN_BYTES, compress, negotiate_encoding, parse_fields, project
+from profiling import DEFAULT_KEEP as DEFAULT_PROFILE_KEEP, MODES as PROFILE_MODES, Profiler
+from lazy import preload as preload_imports, status as import_status
+from filters import MatchFilter
+from batch_match import DEFAULT_MEMORY_MB as DEFAULT_BATCH_MEMORY_MB, DEFAULT_TOP_K as DEFAULT_BATCH_TOP_K, \
+    BatchMatchJob, open_output
+from ingest import (DEFAULT_INGEST_BATCH_SIZE, MAX_REPORTED_ERRORS, build_profile, detect_format,
+                    iter_batches, iter_records)
+
 app = Flask(__name__, static_folder='.')
 CORS(app)
 
-# In-memory storage (replace with database in production)
-users_db = {}
+# Durable storage, opened by create_app(); the profile lists below are in-memory copies the matcher indexes
+DATABASE_PATH = os.environ.get(
+    'DATABASE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'portal.db')
+)
+repository = None
+
+# Published match index versions, memory-mapped by every worker process (empty to disable)
+INDEX_SNAPSHOT_DIR = os.environ.get(
+    'INDEX_SNAPSHOT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), 'index')
+)
 internships_db = []
 candidates_db = []
 
-# NLP Keywords for skills extraction
-SKILLS_KEYWORDS = [
-    'python', 'java', 'javascript', 'react', 'node', 'angular', 'vue',
-    'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust',
-    'html', 'css', 'sql', 'mongodb', 'postgresql', 'mysql',
-    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git',
-    'machine learning', 'deep learning', 'data science', 'ai',
-    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-    'flask', 'django', 'spring boot', 'express',
-    'agile', 'scrum', 'devops', 'ci/cd',
-    'communication', 'teamwork', 'leadership', 'problem solving'
-]
-
-EDUCATION_KEYWORDS = ['bachelor', 'master', 'phd', 'diploma', 'degree', 'b.tech', 'm.tech', 'bca', 'mca', 'bba', 'mba']
+# NLP Keywords for skills extraction (loaded from data/taxonomy.json)
+SKILL_TAXONOMY = load_taxonomy()
+SKILLS_KEYWORDS = [entry['name'].lower() for entry in SKILL_TAXONOMY['skills']]
+EDUCATION_KEYWORDS = [entry['name'].lower() for entry in SKILL_TAXONOMY['education']]
 EXPERIENCE_KEYWORDS = ['intern', 'developer', 'engineer', 'analyst', 'manager', 'consultant', 'designer']
 
+# Bump when extraction or scoring changes so cached analyses are not reused
+RESUME_ANALYZER_VERSION = 4
+
+# Extraction caps so one huge upload cannot blow up a worker's memory
+RESUME_MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', 50))
+RESUME_MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', 200000))
+
+# Contact patterns, compiled once at import
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+
+class ResumeDocument:
+    """Resume text tokenized once, with extractor results memoized on it"""
+    
+    def __init__(self, text):
+        self.text = text
+        self.tokens = text.split()
+        self.word_count = len(self.tokens)
+        self.extracted = {}
+    
+    def get(self, name, extractor):
+        """Run `extractor` on this document once and reuse the result"""
+        if name not in self.extracted:
+            self.extracted[name] = extractor(self)
+        return self.extracted[name]
+
+
+def as_document(text):
+    """Wrap raw text in a ResumeDocument (documents pass through)"""
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
+
 
 class ResumeAnalyzer:
     """Analyzes resumes using NLP techniques"""
     
-    def __init__(self):
+    def __init__(self, taxonomy=None, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS):
+        taxonomy = taxonomy if taxonomy is not None else SKILL_TAXONOMY
+        self.max_pages = max_pages
+        self.max_chars = max_chars
         self.skills_keywords = SKILLS_KEYWORDS
         self.education_keywords = EDUCATION_KEYWORDS
+        # Single-pass matchers over every keyword and alias in the taxonomy
+        self.skill_matcher, self.education_matcher = build_matchers(taxonomy)
         
     def extract_text_from_pdf(self, file_stream):
         """Extract text from PDF file"""
         try:
-            pdf_reader = PyPDF2.PdfReader(file_stream)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+            return join_text(iter_pdf_text(file_stream, self.max_pages), self.max_chars, '\n')
         except Exception as e:
             return f"Error extracting PDF: {str(e)}"
     
     def extract_text_from_docx(self, file_stream):
         """Extract text from DOCX file"""
         try:
-            doc = docx.Document(file_stream)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return join_text(iter_docx_text(file_stream), self.max_chars, '\n')
         except Exception as e:
             return f"Error extracting DOCX: {str(e)}"
     
     def extract_text_from_txt(self, file_stream):
         """Extract text from TXT file"""
         try:
-            return file_stream.read().decode('utf-8')
+            return join_text(iter_txt_text(file_stream), self.max_chars)
         except Exception as e:
             return f"Error extracting TXT: {str(e)}"
     
     def extract_email(self, text):
         """Extract email from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        return emails[0] if emails else "Not found"
+        def find(doc):
+            match = EMAIL_PATTERN.search(doc.text)
+            return match.group(0) if match else "Not found"
+        return as_document(text).get('email', find)
     
     def extract_phone(self, text):
         """Extract phone number from text"""
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        return phones[0] if phones else "Not found"
+        def find(doc):
+            match = PHONE_PATTERN.search(doc.text)
+            return match.group(0) if match else "Not found"
+        return as_document(text).get('phone', find)
     
     def extract_skills(self, text):
         """Extract skills from text using keyword matching"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.skills_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))
+        return as_document(text).get('skills', lambda doc: self.skill_matcher.find_unique(doc.text))
+    
+    def extract_skill_positions(self, text):
+        """Every skill occurrence in the text with its character span"""
+        return [
+            {"skill": skill, "start": start, "end": end}
+            for skill, start, end in self.skill_matcher.finditer(as_document(text).text)
+        ]
     
     def extract_education(self, text):
         """Extract education information"""
-        text_lower = text.lower()
-        education = []
-        
-        for edu in self.education_keywords:
-            if edu.lower() in text_lower:
-                education.append(edu.upper())
-        
-        return list(set(education)) if education else ["Not specified"]
+        def find(doc):
+            education = self.education_matcher.find_unique(doc.text)
+            return education if education else ["Not specified"]
+        return as_document(text).get('education', find)
     
     def calculate_resume_score(self, text, skills, experience_years=0):
         """Calculate resume quality score"""
+        doc = as_document(text)
         score = 0
         
         # Skills score (40 points)
@@ -116,18 +168,18 @@ class ResumeAnalyzer:
             score += min(len(skills) * 4, 40)
         
         # Length score (20 points)
-        word_count = len(text.split())
+        word_count = doc.word_count
         if word_count > 100:
             score += min(word_count / 50, 20)
         
         # Contact info score (20 points)
-        if self.extract_email(text) != "Not found":
+        if self.extract_email(doc) != "Not found":
             score += 10
-        if self.extract_phone(text) != "Not found":
+        if self.extract_phone(doc) != "Not found":
             score += 10
         
         # Education score (10 points)
-        education = self.extract_education(text)
+        education = self.extract_education(doc)
         if len(education) > 0 and "Not specified" not in education:
             score += 10
         
@@ -136,47 +188,78 @@ class ResumeAnalyzer:
         
         return min(int(score), 100)
     
+    def analyze_text(self, text):
+        """Run every extractor and the scorer over one shared document"""
+        doc = as_document(text)
+        with stage('resume_analyzer', 'extract_skills'):
+            skills = self.extract_skills(doc)
+        
+        with stage('resume_analyzer', 'extract_fields'):
+            return {
+                "text": doc.text,
+                "email": self.extract_email(doc),
+                "phone": self.extract_phone(doc),
+                "skills": skills,
+                "education": self.extract_education(doc),
+                "score": self.calculate_resume_score(doc, skills),
+                "word_count": doc.word_count
+            }
+    
     def analyze_resume(self, file_stream, filename):
         """Complete resume analysis"""
         # Extract text based on file type
-        if filename.endswith('.pdf'):
-            text = self.extract_text_from_pdf(file_stream)
-        elif filename.endswith('.docx'):
-            text = self.extract_text_from_docx(file_stream)
-        elif filename.endswith('.txt'):
-            text = self.extract_text_from_txt(file_stream)
-        else:
+        extractors = {
+            '.pdf': self.extract_text_from_pdf,
+            '.docx': self.extract_text_from_docx,
+            '.txt': self.extract_text_from_txt
+        }
+        extension = os.path.splitext(filename)[1]
+        if extension not in extractors:
             return {"error": "Unsupported file format"}
         
-        # Extract information
-        email = self.extract_email(text)
-        phone = self.extract_phone(text)
-        skills = self.extract_skills(text)
-        education = self.extract_education(text)
-        
-        # Calculate score
-        score = self.calculate_resume_score(text, skills)
+        with stage('resume_analyzer', f"extract_text{extension}"):
+            text = extractors[extension](file_stream)
         
-        return {
-            "text": text,
-            "email": email,
-            "phone": phone,
-            "skills": skills,
-            "education": education,
-            "score": score,
-            "word_count": len(text.split())
-        }
+        return self.analyze_text(text)
 
 
 class HybridMatcher:
     """Hybrid matching using TF-IDF and Cosine Similarity"""
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=500,
-            ngram_range=(1, 2),
-            stop_words='english'
-        )
+    def __init__(self, candidates=None, internships=None, snapshot_store=None, match_cache=None,
+                 semantic_mode='lazy', semantic_components=DEFAULT_SEMANTIC_COMPONENTS, shards=0):
+        # Built on first ad-hoc match, so scikit-learn is not imported before it is needed
+        self._vectorizer = None
+        # Skill names/aliases -> IDs shared by every matching path
+        self.skill_dictionary = default_dictionary()
+        # Pre-fitted index over the stored profiles (None for ad-hoc matching)
+        self.index = None
+        # Top-K matches for every stored profile, updated as profiles are saved
+        self.materialized = None
+        if candidates is not None and internships is not None:
+            self.index = MatchIndex(self.create_profile_text, candidates, internships, self.skill_dictionary,
+                                    snapshot_store=snapshot_store)
+            self.materialized = MaterializedMatches(self.index)
+        # Dense LSA engine over the same stored rows ('lazy': fitted once first asked for, None: off)
+        self.semantic = None
+        if self.index is not None and semantic_mode:
+            self.semantic = SemanticIndex(self.index, semantic_components, eager=semantic_mode == 'eager')
+        # Worker processes each scoring a slice of the stored rows (None: score in this process)
+        self.shards = None
+        if self.index is not None and shards > 0:
+            self.shards = ShardPool(self.index, shards)
+            # Reload the shards as soon as a background refit lands, not on the next query
+            self.index.refit_listeners.append(self.shards.notify)
+        # Shortlisting index for approximate candidate retrieval
+        self.retriever = CandidateRetriever()
+        # Indexed match results for repeated queries (None to always recompute)
+        self.match_cache = match_cache
+    
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            self._vectorizer = build_vectorizer()
+        return self._vectorizer
     
     def create_profile_text(self, profile, user_type='candidate'):
         """Create text representation of profile for vectorization"""
@@ -204,14 +287,14 @@ class HybridMatcher:
         if not candidate_skills or not required_skills:
             return 0
         
-        candidate_set = set([s.lower().strip() for s in candidate_skills.split(',')])
-        required_set = set([s.lower().strip() for s in required_skills.split(',')])
+        candidate_ids, _ = self.skill_dictionary.lookup(candidate_skills)
+        required_ids, required_count = self.skill_dictionary.lookup(required_skills)
         
-        if len(required_set) == 0:
+        if required_count == 0:
             return 0
         
-        matched = candidate_set.intersection(required_set)
-        return (len(matched) / len(required_set)) * 100
+        matched = np.intersect1d(candidate_ids, required_ids, assume_unique=True)
+        return (len(matched) / required_count) * 100
     
     def hybrid_match(self, candidates, internships, top_n=10):
         """
@@ -219,11 +302,10 @@ class HybridMatcher:
         1. TF-IDF Cosine Similarity (60% weight)
         2. Direct Skill Matching (40% weight)
         """
-        results = []
-        
         # Create text representations
-        candidate_texts = [self.create_profile_text(c, 'candidate') for c in candidates]
-        internship_texts = [self.create_profile_text(i, 'internship') for i in internships]
+        with stage('hybrid_matcher', 'profile_text'):
+            candidate_texts = [self.create_profile_text(c, 'candidate') for c in candidates]
+            internship_texts = [self.create_profile_text(i, 'internship') for i in internships]
         
         # Combine for TF-IDF fitting
         all_texts = candidate_texts + internship_texts
@@ -233,84 +315,795 @@ class HybridMatcher:
         
         # Fit and transform
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(all_texts)
+            with stage('hybrid_matcher', 'fit_transform'):
+                tfidf_matrix = self.vectorizer.fit_transform(all_texts)
             
             # Split back into candidates and internships
-            candidate_vectors = tfidf_matrix[:len(candidates)]
-            internship_vectors = tfidf_matrix[len(candidates):]
-            
-            # Calculate cosine similarities
-            for i, candidate in enumerate(candidates):
-                for j, internship in enumerate(internships):
-                    # TF-IDF Cosine Similarity (60%)
-                    cosine_sim = cosine_similarity(
-                        candidate_vectors[i:i+1],
-                        internship_vectors[j:j+1]
-                    )[0][0]
-                    tfidf_score = cosine_sim * 60
-                    
-                    # Direct Skill Match (40%)
-                    skill_match = self.calculate_skill_match(
-                        candidate.get('skills', ''),
-                        internship.get('requiredSkills', '')
-                    )
-                    skill_score = (skill_match / 100) * 40
-                    
-                    # Combined score
-                    total_score = tfidf_score + skill_score
-                    
-                    # Get matched skills
-                    candidate_skills = set([s.lower().strip() for s in candidate.get('skills', '').split(',')])
-                    required_skills = set([s.lower().strip() for s in internship.get('requiredSkills', '').split(',')])
-                    matched_skills = list(candidate_skills.intersection(required_skills))
-                    
-                    results.append({
-                        'candidate': candidate,
-                        'internship': internship,
-                        'match_score': round(total_score, 2),
-                        'tfidf_score': round(tfidf_score, 2),
-                        'skill_score': round(skill_score, 2),
-                        'matched_skills': [s.title() for s in matched_skills]
-                    })
+            with stage('hybrid_matcher', 'skill_lookup'):
+                candidate_side = PairSide.from_profiles(
+                    candidates, 'candidate', tfidf_matrix[:len(candidates)], self.skill_dictionary
+                )
+                internship_side = PairSide.from_profiles(
+                    internships, 'internship', tfidf_matrix[len(candidates):], self.skill_dictionary
+                )
             
-            # Sort by match score
-            results.sort(key=lambda x: x['match_score'], reverse=True)
-            return results[:top_n]
+            return self.score_pairs(candidates, internships, candidate_side, internship_side, top_n)
             
         except Exception as e:
             print(f"Error in hybrid matching: {str(e)}")
             return []
     
-    def find_matches_for_candidate(self, candidate_profile, internships, top_n=10):
-        """Find top internship matches for a candidate"""
-        matches = self.hybrid_match([candidate_profile], internships, top_n * 2)
+    def indexed_match(self, profile, user_type, top_n=10, retrieval='exact',
+                      shortlist_size=DEFAULT_SHORTLIST_SIZE, engine='tfidf', skill_weight=SKILL_WEIGHT,
+                      match_filter=None):
+        """
+        Hybrid matching of a single profile against the pre-fitted index.
+        Only the incoming profile is vectorized; stored rows are reused.
+        With retrieval='ann', stored candidates are first shortlisted and
+        only the shortlist is scored exactly. engine='semantic' scores with
+        the dense LSA engine instead (TF-IDF until that is fitted).
+        With a `match_filter`, only stored rows passing it are scored.
+        Exact TF-IDF queries fan out to the shard processes when sharding is on.
+        """
+        if self.index is None or not self.index.sync():
+            return None
+        
+        try:
+            return self._indexed_match(profile, user_type, top_n, retrieval, shortlist_size, engine, skill_weight,
+                                       match_filter)
+        except Exception as e:
+            print(f"Error in indexed matching: {str(e)}")
+            return []
+    
+    def _indexed_match(self, profile, user_type, top_n, retrieval, shortlist_size, engine, skill_weight,
+                       match_filter):
+        """indexed_match on a synced index; errors propagate so cached_match never caches them"""
+        if engine == 'semantic' and self.semantic is not None:
+            matches = self.semantic_match(profile, user_type, top_n, skill_weight, match_filter)
+            if matches is not None:
+                return matches
+        
+        if self.shards is not None and (user_type == 'candidate' or retrieval == 'exact'):
+            matches = self.sharded_match(profile, user_type, top_n, match_filter)
+            if matches is not None:
+                return matches
+        
+        with stage('hybrid_matcher', 'query_vectorize'):
+            query_side, stored_side, overlap = self.index.query(profile, user_type)
+        
+        rows = None
+        if match_filter is not None:
+            with stage('hybrid_matcher', 'filter'):
+                rows = self.index.sides[match_filter.user_type].attributes.rows(match_filter, len(stored_side))
+        
+        if user_type == 'candidate':
+            internships = self.index.internships
+            if rows is not None:
+                stored_side = stored_side.take(rows)
+                internships = [internships[r] for r in rows]
+                overlap = overlap[rows]
+            return self.score_pairs([profile], internships, query_side, stored_side, top_n,
+                                    overlap[np.newaxis, :])
+        
+        candidates = self.index.candidates
+        # A filtered set no bigger than the shortlist is cheaper to score exactly
+        if retrieval == 'ann' and (rows is None or len(rows) > shortlist_size):
+            with stage('hybrid_matcher', 'shortlist'):
+                shortlist = self.retriever.shortlist(query_side, stored_side, overlap, shortlist_size)
+            rows = shortlist if rows is None else shortlist[np.isin(shortlist, rows, assume_unique=True)]
+        if rows is not None:
+            stored_side = stored_side.take(rows)
+            candidates = [candidates[r] for r in rows]
+            overlap = overlap[rows]
+        return self.score_pairs(candidates, [profile], stored_side, query_side, top_n,
+                                overlap[:, np.newaxis])
+    
+    def semantic_match(self, profile, user_type, top_n=10, skill_weight=SKILL_WEIGHT, match_filter=None):
+        """Matches from the dense LSA engine, shaped like score_pairs; None until it is fitted"""
+        with stage('hybrid_matcher', 'semantic_score'):
+            ranked = self.semantic.rank(profile, user_type, top_n, skill_weight, match_filter)
+        if ranked is None:
+            return None
+        return self.ranked_results(profile, user_type, ranked, 'semantic_score')
+    
+    def sharded_match(self, profile, user_type, top_n=10, match_filter=None):
+        """Matches scored by the shard processes, shaped like score_pairs; None if they cannot answer"""
+        with stage('hybrid_matcher', 'sharded_score'):
+            ranked = self.shards.rank(profile, user_type, top_n, match_filter)
+        if ranked is None:
+            return None
+        return self.ranked_results(profile, user_type, ranked, 'tfidf_score')
+    
+    def ranked_results(self, profile, user_type, ranked, text_score):
+        """Result entries for (query skill IDs, [(row, total, text score, skill score)]) over stored rows"""
+        query_ids, top = ranked
+        target = 'internship' if user_type == 'candidate' else 'candidate'
+        others = self.index.sides[target].rows
+        other_skills = self.index.sides[target].skills.profile_skills
         
         results = []
-        for match in matches[:top_n]:
-            internship = match['internship'].copy()
-            internship['matchScore'] = match['match_score']
-            internship['matchedSkills'] = match['matched_skills']
-            results.append(internship)
+        for row, total_score, text_score_value, skill_score in top:
+            results.append({
+                user_type: profile,
+                target: others[row],
+                'match_score': round(total_score, 2),
+                text_score: round(text_score_value, 2),
+                'skill_score': round(skill_score, 2),
+                'matched_skills': shared_skill_names(self.skill_dictionary, query_ids, other_skills[row])
+            })
         
         return results
     
-    def find_matches_for_internship(self, internship_profile, candidates, top_n=10):
-        """Find top candidate matches for an internship"""
-        matches = self.hybrid_match(candidates, [internship_profile], top_n * 2)
+    def match_key(self, profile, user_type):
+        """
+        Canonical digest of what a profile's matches depend on: its profile
+        text (case and whitespace folded, as the vectorizer does) and its
+        set of skills
+        """
+        text = ' '.join(self.create_profile_text(profile, user_type).lower().split())
+        skills = sorted(set(split_skills(profile.get(SKILL_FIELDS[user_type]))))
+        return MatchCache.digest(text, skills)
+    
+    def cached_match(self, profile, user_type, top_n=10, retrieval='exact',
+                     shortlist_size=DEFAULT_SHORTLIST_SIZE, engine='tfidf', skill_weight=SKILL_WEIGHT,
+                     match_filter=None):
+        """
+        indexed_match through the match cache, keyed by the profile and the
+        version of the side it is matched against (bumped by every save there).
+        A failed match is not cached: every caller waiting on it gets [].
+        """
+        def compute():
+            return self._indexed_match(profile, user_type, top_n, retrieval, shortlist_size, engine, skill_weight,
+                                       match_filter)
+        
+        if self.match_cache is None or self.index is None or not self.index.sync():
+            return self.indexed_match(profile, user_type, top_n, retrieval, shortlist_size, engine, skill_weight,
+                                      match_filter)
         
+        target = 'internship' if user_type == 'candidate' else 'candidate'
+        semantic = engine == 'semantic' and self.semantic is not None
+        key = (user_type, self.match_key(profile, user_type), top_n, retrieval,
+               shortlist_size if retrieval == 'ann' else None, self.index.sides[target].version,
+               engine, skill_weight if semantic else None, self.semantic.version if semantic else None,
+               match_filter.key() if match_filter is not None else None)
+        try:
+            return self.match_cache.get_or_compute(key, compute)
+        except Exception as e:
+            print(f"Error in indexed matching: {str(e)}")
+            return []
+    
+    def score_pairs(self, candidates, internships, candidate_side, internship_side, top_n=10, overlap=None):
+        """
+        Score every candidate/internship pair in one batched pass and
+        build result entries for the top N only
+        """
         results = []
-        for match in matches[:top_n]:
-            candidate = match['candidate'].copy()
-            candidate['matchScore'] = match['match_score']
-            candidate['matchedSkills'] = match['matched_skills']
-            results.append(candidate)
+        
+        with stage('hybrid_matcher', 'score_pairs'):
+            ranked = rank_pairs(candidate_side, internship_side, top_n, overlap)
+        for i, j, total_score, tfidf_score, skill_score in ranked:
+            # Get matched skills
+            matched_skills = shared_skill_names(
+                self.skill_dictionary, candidate_side.skill_ids[i], internship_side.skill_ids[j]
+            )
+            
+            results.append({
+                'candidate': candidates[i],
+                'internship': internships[j],
+                'match_score': round(total_score, 2),
+                'tfidf_score': round(tfidf_score, 2),
+                'skill_score': round(skill_score, 2),
+                'matched_skills': matched_skills
+            })
+        
+        return results
+    
+    def stored_matches(self, user_type, row, top_n=10, fields=None):
+        """
+        Precomputed matches for a stored profile (row in the index), shaped
+        like find_matches_*; None if the row is not materialized yet.
+        """
+        if self.materialized is None:
+            return None
+        top = self.materialized.top(user_type, row)
+        if top is None:
+            return None
+        
+        target = 'internship' if user_type == 'candidate' else 'candidate'
+        profile_skills = self.index.sides[user_type].skills.profile_skills
+        other_skills = self.index.sides[target].skills.profile_skills
+        others = self.index.sides[target].rows
+        
+        results = []
+        for other_row, total_score, _, _ in top[:top_n]:
+            results.append(project(others[other_row], fields, {
+                'matchScore': round(total_score, 2),
+                'matchedSkills': shared_skill_names(
+                    self.skill_dictionary, profile_skills[row], other_skills[other_row]
+                )
+            }))
         
         return results
+    
+    def find_matches_for_candidate(self, candidate_profile, internships, top_n=10, fields=None,
+                                   engine='tfidf', skill_weight=SKILL_WEIGHT, match_filter=None):
+        """
+        Find top internship matches for a candidate (only `fields` of each, if given).
+        engine='semantic' uses the dense LSA engine for stored internships;
+        `match_filter` limits the internships considered.
+        """
+        matches = None
+        if self.index is not None and internships is self.index.internships:
+            matches = self.cached_match(candidate_profile, 'candidate', top_n * 2,
+                                        engine=engine, skill_weight=skill_weight, match_filter=match_filter)
+        if matches is None:
+            if match_filter is not None:
+                internships = [i for i in internships if match_filter.matches(i)]
+            matches = self.hybrid_match([candidate_profile], internships, top_n * 2)
+        
+        return [project(match['internship'], fields,
+                        {'matchScore': match['match_score'], 'matchedSkills': match['matched_skills']})
+                for match in matches[:top_n]]
+    
+    def find_matches_for_internship(self, internship_profile, candidates, top_n=10, retrieval='exact',
+                                    shortlist_size=DEFAULT_SHORTLIST_SIZE, fields=None, engine='tfidf',
+                                    skill_weight=SKILL_WEIGHT, match_filter=None):
+        """
+        Find top candidate matches for an internship (only `fields` of each, if given).
+        retrieval='ann' reranks only a shortlist from the candidate retriever;
+        engine='semantic' uses the dense LSA engine for stored candidates;
+        `match_filter` limits the candidates considered.
+        """
+        matches = None
+        if self.index is not None and candidates is self.index.candidates:
+            matches = self.cached_match(internship_profile, 'internship', top_n * 2,
+                                        retrieval, shortlist_size, engine, skill_weight, match_filter)
+        if matches is None:
+            if match_filter is not None:
+                candidates = [c for c in candidates if match_filter.matches(c)]
+            matches = self.hybrid_match(candidates, [internship_profile], top_n * 2)
+        
+        return [project(match['candidate'], fields,
+                        {'matchScore': match['match_score'], 'matchedSkills': match['matched_skills']})
+                for match in matches[:top_n]]
 
 
 # Initialize analyzers
 resume_analyzer = ResumeAnalyzer()
-matcher = HybridMatcher()
+resume_cache = ResumeCache(
+    version=f"{RESUME_ANALYZER_VERSION}.{SKILL_TAXONOMY.get('version', 0)}.{RESUME_MAX_PAGES}.{RESUME_MAX_CHARS}",
+    max_entries=int(os.environ.get('RESUME_CACHE_ENTRIES', 2048)),
+    max_bytes=int(os.environ.get('RESUME_CACHE_BYTES', 64 * 1024 * 1024)),
+    disk_dir=os.environ.get('RESUME_CACHE_DIR') or None
+)
+# Repeated dashboard queries reuse results until the matched side changes or the TTL passes
+MATCH_CACHE_ENTRIES = int(os.environ.get('MATCH_CACHE_ENTRIES', 4096))
+MATCH_CACHE_TTL = float(os.environ.get('MATCH_CACHE_TTL', 300))
+# Dense LSA engine: 'lazy' fits it in the background after the first semantic query,
+# 'eager' at startup, 'off' disables it
+SEMANTIC_ENGINE = os.environ.get('SEMANTIC_ENGINE', 'lazy')
+SEMANTIC_COMPONENTS = int(os.environ.get('SEMANTIC_COMPONENTS', DEFAULT_SEMANTIC_COMPONENTS))
+# Shard processes for exact TF-IDF queries over large corpora (0: score in the serving process)
+MATCH_SHARDS = int(os.environ.get('MATCH_SHARDS', 0))
+matcher = HybridMatcher(
+    candidates=candidates_db,
+    internships=internships_db,
+    snapshot_store=SnapshotStore(INDEX_SNAPSHOT_DIR) if INDEX_SNAPSHOT_DIR else None,
+    match_cache=MatchCache(MATCH_CACHE_ENTRIES, MATCH_CACHE_TTL) if MATCH_CACHE_ENTRIES > 0 else None,
+    semantic_mode=None if SEMANTIC_ENGINE == 'off' else SEMANTIC_ENGINE,
+    semantic_components=SEMANTIC_COMPONENTS,
+    shards=MATCH_SHARDS
+)
+
+_profile_lock = threading.Lock()
+
+
+def load_profiles():
+    """
+    Append profiles stored since the last load (by this or any other worker
+    process) to the in-memory lists and index them. IDs only grow, so the
+    lists stay in ID order.
+    """
+    with _profile_lock:
+        for user_type, rows in (('candidate', candidates_db), ('internship', internships_db)):
+            last_id = rows[-1]['id'] if rows else 0
+            rows.extend(repository.profiles_after(user_type, last_id))
+    with stage('hybrid_matcher', 'index_sync'):
+        matcher.index.sync()
+    # Score new rows into the materialized top-K (and the dense engine, once wanted) and deal
+    # them out to the shard processes, all in the background
+    matcher.materialized.notify()
+    if matcher.semantic is not None:
+        matcher.semantic.notify()
+    if matcher.shards is not None:
+        matcher.shards.notify()
+
+
+# ==================== STARTUP ====================
+# 'background': warm up in a thread while the worker already answers light requests,
+# 'blocking': warm up inside create_app(), 'off': load libraries and profiles on first use
+WARMUP_MODE = os.environ.get('WARMUP_MODE', 'background')
+
+readiness = {"state": "pending", "startedAt": None, "durationMs": None, "imports": None, "error": None}
+
+
+def warmup():
+    """
+    Import the lazily loaded libraries (matcher and resume parsers), load the
+    stored profiles and fit or map the match index, then mark the worker ready
+    """
+    readiness.update(state="warming", startedAt=datetime.now().isoformat())
+    start = time.perf_counter()
+    try:
+        readiness["imports"] = preload_imports()
+        load_profiles()
+        readiness["state"] = "ready"
+    except Exception as e:
+        print(f"Error warming up: {str(e)}")
+        readiness.update(state="failed", error=str(e))
+    readiness["durationMs"] = round((time.perf_counter() - start) * 1e3, 1)
+
+
+def is_ready():
+    return readiness["state"] in ('ready', 'lazy')
+
+
+_init_lock = threading.Lock()
+
+
+def create_app():
+    """
+    Open the database and start warming up, once per serving process.
+    Importing this module does neither, so processes that re-import it
+    (resume parsing and batch scoring workers, the batch CLI) stay free of
+    open databases and warmup threads.
+    """
+    global repository
+    with _init_lock:
+        if repository is not None:
+            return app
+        repository = SQLiteRepository(DATABASE_PATH)
+    
+    if WARMUP_MODE == 'blocking':
+        warmup()
+    elif WARMUP_MODE == 'off':
+        readiness["state"] = "lazy"
+    else:
+        threading.Thread(target=warmup, name='warmup', daemon=True).start()
+    return app
+
+
+@app.before_request
+def ensure_app():
+    # Servers pointed at `app:app` instead of `app:create_app()` initialize on the first request
+    if repository is None:
+        create_app()
+
+
+# ==================== RESUME PROCESS POOL ====================
+
+# PDF/DOCX parsing is CPU-bound, so batches fan out to worker processes
+RESUME_POOL_WORKERS = int(os.environ.get('RESUME_POOL_WORKERS', os.cpu_count() or 1))
+BATCH_MAX_FILES = 5000
+BATCH_MAX_FILE_BYTES = 10 * 1024 * 1024
+BATCH_FILE_TIMEOUT = 60     # Seconds without any file finishing before in-flight files time out
+BATCH_MAX_ATTEMPTS = 2      # Attempts per file when a worker process dies
+
+_resume_pool = None
+_resume_pool_lock = threading.Lock()
+
+
+def get_resume_pool():
+    """Shared process pool for resume parsing, created on first use"""
+    global _resume_pool
+    with _resume_pool_lock:
+        if _resume_pool is None:
+            # Forked workers inherit the parser libraries instead of each importing them
+            load_parsers()
+            _resume_pool = ProcessPoolExecutor(max_workers=RESUME_POOL_WORKERS)
+        return _resume_pool
+
+
+def reset_resume_pool(pool):
+    """
+    Drop a broken or stuck pool so later work gets fresh worker processes.
+    Running tasks cannot be cancelled, so its workers are terminated.
+    """
+    global _resume_pool
+    with _resume_pool_lock:
+        if _resume_pool is pool:
+            _resume_pool = None
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def analysis_payload(result):
+    """Public subset of an analyze_resume result"""
+    return {
+        "email": result['email'],
+        "phone": result['phone'],
+        "skills": result['skills'],
+        "education": result['education'],
+        "score": result['score'],
+        "wordCount": result['word_count']
+    }
+
+
+def analyze_resume_bytes(filename, data):
+    """
+    Process-pool entry point: analyze one uploaded file from its raw bytes.
+    Successful results carry the extracted text for the resume cache.
+    """
+    result = resume_analyzer.analyze_resume(io.BytesIO(data), filename)
+    
+    if "error" in result:
+        return {"success": False, "message": result["error"]}
+    if result['text'].startswith('Error extracting'):
+        return {"success": False, "message": result['text']}
+    
+    return {"success": True, "analysis": analysis_payload(result), "text": result['text']}
+
+
+def cache_resume_result(key, result):
+    """Store a successful analyze_resume_bytes result and return it without the text"""
+    text = result.pop('text', None)
+    if result.get('success') and text is not None:
+        resume_cache.put(key, text, result['analysis'])
+    return result
+
+
+def iter_zip_resumes(stream):
+    """Yield (filename, data, error) for each file inside a zip archive"""
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile as e:
+        yield "archive", None, f"Invalid zip archive: {str(e)}"
+        return
+    
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            if info.file_size > BATCH_MAX_FILE_BYTES:
+                yield info.filename, None, "File too large"
+                continue
+            try:
+                yield info.filename, archive.read(info), None
+            except Exception as e:
+                yield info.filename, None, f"Error reading from archive: {str(e)}"
+
+
+def iter_batch_resumes():
+    """Yield (filename, data, error) for every resume in a batch upload"""
+    count = 0
+    sources = []
+    for file in request.files.getlist('resumes'):
+        if file.filename.lower().endswith('.zip'):
+            sources.append(iter_zip_resumes(file.stream))
+        else:
+            sources.append([(file.filename, file.read(), None)])
+    for file in request.files.getlist('archive'):
+        sources.append(iter_zip_resumes(file.stream))
+    if request.mimetype in ('application/zip', 'application/x-zip-compressed'):
+        sources.append(iter_zip_resumes(io.BytesIO(request.get_data())))
+    
+    for source in sources:
+        for filename, data, error in source:
+            count += 1
+            if count > BATCH_MAX_FILES:
+                yield filename, None, f"Batch limit of {BATCH_MAX_FILES} files reached"
+                return
+            if data is not None and len(data) > BATCH_MAX_FILE_BYTES:
+                yield filename, None, "File too large"
+                continue
+            yield filename, data, error
+
+
+def stream_batch_results(files):
+    """
+    Analyze files on the process pool and yield one NDJSON line per file
+    as each finishes, followed by a summary line. Failures (bad files,
+    crashed or stuck workers) are reported per file and never end the batch.
+    """
+    pool = get_resume_pool()
+    pending = {}    # future -> (filename, data, attempt)
+    files = iter(files)
+    exhausted = False
+    total = succeeded = 0
+    
+    def line(filename, result):
+        return json.dumps(dict({"file": filename}, **result)) + '\n'
+    
+    def submit(filename, data, attempt):
+        """Queue one file, replacing a pool that broke meanwhile; an error line if that fails too"""
+        nonlocal pool
+        for _ in range(BATCH_MAX_ATTEMPTS):
+            try:
+                pending[pool.submit(analyze_resume_bytes, filename, data)] = (filename, data, attempt)
+                return None
+            except (BrokenProcessPool, RuntimeError):
+                # Broken by a crashed worker, or shut down by another request's reset
+                reset_resume_pool(pool)
+                pool = get_resume_pool()
+        return line(filename, {"success": False, "message": "Worker pool unavailable"})
+    
+    while True:
+        # Keep a bounded number of files in flight so uploads stream through
+        while not exhausted and len(pending) < RESUME_POOL_WORKERS * 2:
+            try:
+                filename, data, error = next(files)
+            except StopIteration:
+                exhausted = True
+                break
+            total += 1
+            if error:
+                yield line(filename, {"success": False, "message": error})
+                continue
+            cached = resume_cache.get(resume_cache.key(data, filename))
+            if cached is not None:
+                succeeded += 1
+                yield line(filename, {"success": True, "analysis": cached['analysis'], "cached": True})
+                continue
+            error = submit(filename, data, 1)
+            if error:
+                yield error
+        
+        if not pending:
+            break
+        
+        done, _ = wait(pending, timeout=BATCH_FILE_TIMEOUT, return_when=FIRST_COMPLETED)
+        if not done:
+            # Nothing finished in time: give up on the in-flight files
+            for filename, _, _ in pending.values():
+                yield line(filename, {"success": False, "message": "Timed out"})
+            pending.clear()
+            reset_resume_pool(pool)
+            pool = get_resume_pool()
+            continue
+        
+        retry = []
+        for future in done:
+            filename, data, attempt = pending.pop(future)
+            try:
+                result = cache_resume_result(resume_cache.key(data, filename), future.result())
+            except BrokenProcessPool:
+                # A worker died (e.g. a parser crash); innocent files get another try
+                if attempt < BATCH_MAX_ATTEMPTS:
+                    retry.append((filename, data, attempt + 1))
+                    continue
+                result = {"success": False, "message": "Worker process crashed"}
+            except Exception as e:
+                result = {"success": False, "message": str(e)}
+            
+            succeeded += 1 if result.get("success") else 0
+            yield line(filename, result)
+        
+        if retry:
+            # Files still in flight on the dead pool surface as broken on a later pass
+            reset_resume_pool(pool)
+            pool = get_resume_pool()
+            for filename, data, attempt in retry:
+                error = submit(filename, data, attempt)
+                if error:
+                    yield error
+    
+    yield json.dumps({"done": True, "total": total, "succeeded": succeeded,
+                      "failed": total - succeeded}) + '\n'
+
+
+# Asynchronous single-resume analysis (POST /api/analyze-resume?async=1)
+resume_jobs = JobQueue(
+    get_resume_pool,
+    reset_pool=reset_resume_pool,
+    workers=int(os.environ.get('RESUME_JOB_WORKERS', RESUME_POOL_WORKERS)),
+    max_depth=int(os.environ.get('RESUME_JOB_QUEUE_DEPTH', 100)),
+    timeout=float(os.environ.get('RESUME_JOB_TIMEOUT', 60))
+)
+
+
+# ==================== BATCH MATCH REPORTS ====================
+
+# Top-K candidates for every internship (see batch_match.py); CSV/Parquet reports go to BATCH_REPORT_DIR
+BATCH_REPORT_DIR = os.environ.get(
+    'BATCH_REPORT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), 'reports')
+)
+# Memory for score blocks, shared by the job's worker processes
+BATCH_MEMORY_MB = int(os.environ.get('BATCH_MEMORY_MB', DEFAULT_BATCH_MEMORY_MB))
+BATCH_OUTPUTS = ('storage', 'csv', 'parquet')
+BATCH_MAX_TOP_K = 500
+BATCH_RUN_PATTERN = re.compile(r'[A-Za-z0-9_.-]{1,64}')
+
+batch_runs = {}     # Run name -> status of runs started by this process
+_batch_lock = threading.Lock()
+
+
+def start_batch_run(run, output_kind, top_k, match_filter, restart=False):
+    """
+    Run a batch match job on a background thread; returns its status,
+    updated as chunks finish. Raises ValueError if the output is unavailable.
+    """
+    if output_kind == 'storage':
+        output = open_output(repository=repository, run=run)
+    else:
+        output = open_output(os.path.join(BATCH_REPORT_DIR, f"{run}.{output_kind}"))
+    
+    status = {"run": run, "output": output_kind, "state": "running", "progress": {"done": 0, "total": None},
+              "summary": None, "error": None, "startedAt": datetime.now().isoformat(), "finishedAt": None}
+    
+    def progress(done, total):
+        status["progress"] = {"done": done, "total": total}
+    
+    def work():
+        try:
+            load_profiles()
+            job = BatchMatchJob(matcher.index, top_k, match_filter, BATCH_MEMORY_MB)
+            status["summary"] = job.run(output, restart, progress)
+            status["state"] = "done"
+        except Exception as e:
+            print(f"Error in batch matching: {str(e)}")
+            status.update(state="failed", error=str(e))
+        status["finishedAt"] = datetime.now().isoformat()
+    
+    threading.Thread(target=work, name=f'batch-{run}', daemon=True).start()
+    return status
+
+
+# ==================== METRICS ====================
+
+# Stage timers and request metrics; switch off with METRICS_ENABLED=0 or PUT /api/metrics
+metrics.enabled = os.environ.get('METRICS_ENABLED', '1') != '0'
+# Required (X-Admin-Token header) for admin-only endpoints; unset disables them
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN') or None
+
+http_requests = metrics.counter('portal_http_requests_total', 'HTTP requests by endpoint, method and status',
+                                labels=('endpoint', 'method', 'status'))
+http_latency = metrics.histogram('portal_http_request_duration_seconds', 'HTTP request latency by endpoint',
+                                 labels=('endpoint',))
+http_in_flight = metrics.gauge('portal_http_requests_in_flight', 'HTTP requests currently being served')
+
+metrics.gauge_callback('portal_profiles', 'Stored profiles loaded into this process',
+                       lambda: {('candidate',): len(candidates_db), ('internship',): len(internships_db)},
+                       labels=('type',))
+metrics.gauge_callback('portal_index_features', 'Terms in the fitted TF-IDF vocabulary',
+                       lambda: matcher.index.n_features)
+metrics.gauge_callback('portal_index_version', 'Fits of the match index in this process',
+                       lambda: matcher.index.version)
+metrics.gauge_callback('portal_materialized_matches', 'Non-zero matches held in the materialized top-K tables',
+                       lambda: {('candidate',): matcher.materialized.stats()['candidateMatches'],
+                                ('internship',): matcher.materialized.stats()['internshipMatches']},
+                       labels=('type',))
+metrics.gauge_callback('portal_resume_cache_hit_ratio', 'Resume cache hits / lookups',
+                       lambda: resume_cache.stats()['hitRate'])
+metrics.gauge_callback('portal_resume_cache_entries', 'Resume analyses held in memory',
+                       lambda: resume_cache.stats()['entries'])
+metrics.gauge_callback('portal_match_cache_hit_ratio', 'Match cache hits (including coalesced calls) / lookups',
+                       lambda: matcher.match_cache.stats()['hitRate'] if matcher.match_cache else None)
+metrics.gauge_callback('portal_match_cache_entries', 'Match results held in the match cache',
+                       lambda: len(matcher.match_cache.memory) if matcher.match_cache else None)
+metrics.gauge_callback('portal_resume_jobs_queued', 'Queued asynchronous resume analyses',
+                       lambda: resume_jobs.depth())
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default JSON provider that also times response serialization"""
+    
+    def response(self, *args, **kwargs):
+        with stage('flask', 'json_response'):
+            return super().response(*args, **kwargs)
+
+
+app.json = TimedJSONProvider(app)
+
+
+@app.before_request
+def start_request_metrics():
+    if metrics.enabled:
+        g.metrics_start = time.perf_counter()
+        http_in_flight.inc()
+
+
+@app.after_request
+def record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    http_in_flight.dec()
+    # The URL rule, not the path, so /api/candidates/<id> is one series
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    status = g.pop('metrics_status', 500 if error is not None else 200)
+    http_requests.inc(endpoint, request.method, str(status))
+    http_latency.observe(endpoint, value=time.perf_counter() - start)
+
+
+@app.after_request
+def encode_response(response):
+    """
+    ETag + conditional GET and gzip/br compression for buffered JSON
+    responses (streamed NDJSON and file downloads pass through untouched).
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200 or
+            response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.accept_encodings)
+    if response.content_length is None or response.content_length < COMPRESS_MIN_BYTES:
+        encoding = None
+    
+    if request.method in ('GET', 'HEAD'):
+        # Hash of the uncompressed body; compressed bytes are a different
+        # representation, so they get their own validator
+        response.add_etag()
+        if encoding is not None:
+            response.set_etag(f"{response.get_etag()[0]}-{encoding}")
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+    
+    if encoding is not None:
+        with stage('flask', f'compress_{encoding}'):
+            response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def is_admin():
+    return ADMIN_TOKEN is not None and request.headers.get('X-Admin-Token') == ADMIN_TOKEN
+
+
+# ==================== PROFILING ====================
+
+# PROFILE_MODE=sample|cprofile profiles every request and keeps the slowest;
+# otherwise an admin opts a single request in with an `X-Profile: sample|cprofile` header
+profiler = Profiler(
+    mode=os.environ.get('PROFILE_MODE') or None,
+    keep=int(os.environ.get('PROFILE_KEEP', DEFAULT_PROFILE_KEEP)),
+    interval=float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5)) / 1000
+)
+
+
+@app.before_request
+def start_profile():
+    mode = request.headers.get('X-Profile')
+    if not (mode and is_admin()):
+        # Keep the profile listing itself out of the buffers
+        mode = profiler.mode if not request.path.startswith('/api/admin/') else None
+    if mode in PROFILE_MODES:
+        g.profile = profiler.start(mode)
+        g.profile_start = time.perf_counter()
+        g.profile_started_at = datetime.now().isoformat()
+
+
+@app.after_request
+def add_profile_header(response):
+    if 'profile' in g:
+        response.headers['X-Profile-Id'] = g.profile.id
+    return response
+
+
+@app.teardown_request
+def finish_profile(error=None):
+    recorder = g.pop('profile', None)
+    if recorder is None:
+        return
+    profiler.finish(
+        recorder, time.perf_counter() - g.pop('profile_start'),
+        method=request.method,
+        path=request.full_path.rstrip('?'),
+        endpoint=request.url_rule.rule if request.url_rule is not None else None,
+        status=g.get('metrics_status', 500 if error is not None else 200),
+        startedAt=g.pop('profile_started_at')
+    )
 
 
 # ==================== API ROUTES ====================
@@ -333,16 +1126,16 @@ def register():
     if not email or not password or not user_type:
         return jsonify({"success": False, "message": "Missing required fields"}), 400
     
-    if email in users_db:
-        return jsonify({"success": False, "message": "User already exists"}), 400
-    
-    users_db[email] = {
+    user = {
         "email": email,
         "password": password,  # In production, hash this!
         "userType": user_type,
         "createdAt": datetime.now().isoformat()
     }
     
+    if not repository.add_user(user):
+        return jsonify({"success": False, "message": "User already exists"}), 400
+    
     return jsonify({
         "success": True,
         "message": "Registration successful",
@@ -358,10 +1151,12 @@ def login():
     email = data.get('email')
     password = data.get('password')
     
-    if email not in users_db:
+    user = repository.get_user(email)
+    
+    if user is None:
         return jsonify({"success": False, "message": "User not found"}), 404
     
-    if users_db[email]['password'] != password:
+    if user['password'] != password:
         return jsonify({"success": False, "message": "Invalid password"}), 401
     
     return jsonify({
@@ -369,7 +1164,7 @@ def login():
         "message": "Login successful",
         "user": {
             "email": email,
-            "userType": users_db[email]['userType']
+            "userType": user['userType']
         }
     })
 
@@ -385,53 +1180,82 @@ def analyze_resume_endpoint():
     if file.filename == '':
         return jsonify({"success": False, "message": "No file selected"}), 400
     
+    # Werkzeug spools large uploads to a temp file; hash and parse straight from it
+    cache_key = resume_cache.key(file.stream, file.filename)
+    cached = resume_cache.get(cache_key)
+    
+    # Optionally hand the work to the job queue and return a job ID right away
+    if request.args.get('async', request.form.get('async', '')).lower() in ('1', 'true', 'yes'):
+        data = file.read()
+        if cached is not None:
+            job = resume_jobs.completed({"success": True, "analysis": cached['analysis'], "cached": True},
+                                        kind='analyze-resume')
+        else:
+            try:
+                job = resume_jobs.submit(analyze_resume_bytes, file.filename, data, kind='analyze-resume',
+                                         on_done=lambda result: cache_resume_result(cache_key, result))
+            except QueueFull as e:
+                response = jsonify({"success": False, "message": str(e)})
+                response.headers['Retry-After'] = '5'
+                return response, 429
+        return jsonify({
+            "success": True,
+            "jobId": job.id,
+            "status": job.status,
+            "statusUrl": f"/api/jobs/{job.id}"
+        }), 202
+    
+    if cached is not None:
+        return jsonify({"success": True, "analysis": cached['analysis'], "cached": True})
+    
     # Analyze resume
-    result = resume_analyzer.analyze_resume(io.BytesIO(file.read()), file.filename)
+    result = resume_analyzer.analyze_resume(file.stream, file.filename)
     
     if "error" in result:
         return jsonify({"success": False, "message": result["error"]}), 400
     
+    if not result['text'].startswith('Error extracting'):
+        resume_cache.put(cache_key, result['text'], analysis_payload(result))
+    
     return jsonify({
         "success": True,
-        "analysis": {
-            "email": result['email'],
-            "phone": result['phone'],
-            "skills": result['skills'],
-            "education": result['education'],
-            "score": result['score'],
-            "wordCount": result['word_count']
-        }
+        "analysis": analysis_payload(result)
     })
 
 
+@app.route('/api/analyze-resumes/batch', methods=['POST'])
+def analyze_resumes_batch():
+    """
+    Analyze many resumes at once (multipart `resumes` files and/or a zip
+    archive), streaming one NDJSON result line per file as it completes
+    """
+    if not request.files and request.mimetype not in ('application/zip', 'application/x-zip-compressed'):
+        return jsonify({"success": False, "message": "No files uploaded"}), 400
+    
+    return Response(
+        stream_with_context(stream_batch_results(iter_batch_resumes())),
+        mimetype='application/x-ndjson'
+    )
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress and result of a background job"""
+    job = resume_jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    
+    return jsonify({"success": True, "job": job.to_dict()})
+
+
 @app.route('/api/save-candidate-profile', methods=['POST'])
 def save_candidate_profile():
     """Save candidate profile"""
     data = request.json
     
     # Add to candidates database
-    candidate = {
-        "id": len(candidates_db) + 1,
-        "name": data.get('name'),
-        "email": data.get('email'),
-        "phone": data.get('phone'),
-        "education": data.get('education'),
-        "institution": data.get('institution'),
-        "graduationYear": data.get('graduationYear'),
-        "skills": data.get('skills'),
-        "experience": data.get('experience'),
-        "interests": data.get('interests'),
-        "availability": data.get('availability'),
-        "workMode": data.get('workMode'),
-        "certifications": data.get('certifications', '').split(',') if data.get('certifications') else [],
-        "portfolio": data.get('portfolio', ''),
-        "linkedin": data.get('linkedin', ''),
-        "github": data.get('github', ''),
-        "resumeScore": data.get('resumeScore', 0),
-        "createdAt": datetime.now().isoformat()
-    }
-    
-    candidates_db.append(candidate)
+    candidate = repository.add_profile('candidate', build_profile('candidate', data))
+    load_profiles()
     
     return jsonify({
         "success": True,
@@ -445,26 +1269,8 @@ def save_internship():
     """Save internship posting"""
     data = request.json
     
-    internship = {
-        "id": len(internships_db) + 1,
-        "title": data.get('title'),
-        "company": data.get('company'),
-        "location": data.get('location'),
-        "department": data.get('department'),
-        "duration": data.get('duration'),
-        "stipend": data.get('stipend'),
-        "workMode": data.get('workMode'),
-        "description": data.get('description'),
-        "requiredSkills": data.get('requiredSkills'),
-        "requirements": data.get('requirements'),
-        "benefits": data.get('benefits', '').split(',') if data.get('benefits') else [],
-        "deadline": data.get('deadline'),
-        "interviewProcess": data.get('interviewProcess', ''),
-        "mentorship": data.get('mentorship', ''),
-        "createdAt": datetime.now().isoformat()
-    }
-    
-    internships_db.append(internship)
+    internship = repository.add_profile('internship', build_profile('internship', data))
+    load_profiles()
     
     return jsonify({
         "success": True,
@@ -473,6 +1279,98 @@ def save_internship():
     })
 
 
+def bulk_ingest_response(user_type):
+    """
+    Import many profiles from a JSON array, NDJSON or CSV upload (request
+    body or multipart `file`). Rows are validated and inserted in batches,
+    and the matcher picks up each batch in one pass.
+    """
+    upload = request.files.get('file')
+    stream = upload.stream if upload is not None else request.stream
+    try:
+        fmt = detect_format(request.args.get('format'), request.mimetype,
+                            upload.filename if upload is not None else None)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    batch_size = max(1, request.args.get('batchSize', DEFAULT_INGEST_BATCH_SIZE, type=int))
+    
+    inserted, rejected, errors = 0, 0, []
+    message = None
+    try:
+        for profiles, batch_errors in iter_batches(user_type, iter_records(stream, fmt), batch_size):
+            if profiles:
+                repository.add_profiles(user_type, profiles)
+                inserted += len(profiles)
+                # One index update per batch instead of one per row
+                load_profiles()
+            rejected += len(batch_errors)
+            errors.extend({"row": row, "message": text}
+                          for row, text in batch_errors[:MAX_REPORTED_ERRORS - len(errors)])
+    except ValueError as e:
+        # Malformed upload: batches before the error stay imported
+        message = f"Upload stopped at a malformed record: {str(e)}"
+    
+    response = {
+        "success": message is None,
+        "inserted": inserted,
+        "rejected": rejected,
+        "errors": errors
+    }
+    if message is not None:
+        response["message"] = message
+    return jsonify(response), 200 if message is None else 400
+
+
+@app.route('/api/internships/bulk', methods=['POST'])
+def bulk_internships():
+    """Bulk import internships"""
+    return bulk_ingest_response('internship')
+
+
+@app.route('/api/candidates/bulk', methods=['POST'])
+def bulk_candidates():
+    """Bulk import candidate profiles"""
+    return bulk_ingest_response('candidate')
+
+
+MATCH_ENGINES = ('tfidf', 'semantic')
+
+
+def match_engine_options(data):
+    """(engine, skill weight) requested for a match call; ValueError if invalid"""
+    engine = data.get('engine', 'tfidf')
+    if engine not in MATCH_ENGINES:
+        raise ValueError("engine must be 'tfidf' or 'semantic'")
+    try:
+        skill_weight = float(data.get('skillWeight', SKILL_WEIGHT))
+    except (TypeError, ValueError):
+        skill_weight = None
+    if skill_weight is None or not 0 <= skill_weight <= 100:
+        raise ValueError("skillWeight must be a number from 0 to 100")
+    return engine, skill_weight
+
+
+def shortlist_size_option(data):
+    """Shortlist size requested for ANN retrieval; ValueError if invalid"""
+    shortlist_size = data.get('shortlistSize', DEFAULT_SHORTLIST_SIZE)
+    if isinstance(shortlist_size, bool):
+        shortlist_size = None
+    try:
+        shortlist_size = int(shortlist_size)
+    except (TypeError, ValueError):
+        shortlist_size = None
+    if shortlist_size is None or not 1 <= shortlist_size <= MAX_SHORTLIST_SIZE:
+        raise ValueError(f"shortlistSize must be an integer from 1 to {MAX_SHORTLIST_SIZE}")
+    return shortlist_size
+
+
+def engine_in_use(engine):
+    """Engine that actually scores: 'semantic' falls back to TF-IDF until it is fitted"""
+    if engine == 'semantic' and matcher.semantic is not None and matcher.semantic.ready:
+        return 'semantic'
+    return 'tfidf'
+
+
 @app.route('/api/find-matches-for-candidate', methods=['POST'])
 def find_matches_for_candidate():
     """Find matching internships for a candidate using hybrid NLP matching"""
@@ -486,6 +1384,9 @@ def find_matches_for_candidate():
         "certifications": data.get('certifications', '')
     }
     
+    # Pick up profiles other worker processes have stored
+    load_profiles()
+    
     if not internships_db:
         return jsonify({
             "success": True,
@@ -493,13 +1394,24 @@ def find_matches_for_candidate():
             "message": "No internships available"
         })
     
-    # Find matches
-    matches = matcher.find_matches_for_candidate(candidate_profile, internships_db, top_n=10)
+    try:
+        engine, skill_weight = match_engine_options(data)
+        match_filter = MatchFilter.parse('internship', data.get('filters'))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    engine_used = engine_in_use(engine)
+    
+    # Find matches (only the requested fields of each, e.g. fields=title,company,matchScore)
+    fields = parse_fields(request.args.get('fields') or data.get('fields'))
+    matches = matcher.find_matches_for_candidate(candidate_profile, internships_db, top_n=10, fields=fields,
+                                                 engine=engine, skill_weight=skill_weight,
+                                                 match_filter=match_filter)
     
     return jsonify({
         "success": True,
         "matches": matches,
-        "totalMatches": len(matches)
+        "totalMatches": len(matches),
+        "engine": engine_used
     })
 
 
@@ -516,6 +1428,9 @@ def find_matches_for_internship():
         "title": data.get('title', '')
     }
     
+    # Pick up profiles other worker processes have stored
+    load_profiles()
+    
     if not candidates_db:
         return jsonify({
             "success": True,
@@ -523,42 +1438,336 @@ def find_matches_for_internship():
             "message": "No candidates available"
         })
     
-    # Find matches
-    matches = matcher.find_matches_for_internship(internship_profile, candidates_db, top_n=10)
+    retrieval = data.get('retrieval', 'exact')
+    if retrieval not in ('exact', 'ann'):
+        return jsonify({"success": False, "message": "retrieval must be 'exact' or 'ann'"}), 400
+    try:
+        shortlist_size = shortlist_size_option(data)
+        engine, skill_weight = match_engine_options(data)
+        match_filter = MatchFilter.parse('candidate', data.get('filters'))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    engine_used = engine_in_use(engine)
+    
+    # Find matches (only the requested fields of each, e.g. fields=name,skills,matchScore)
+    fields = parse_fields(request.args.get('fields') or data.get('fields'))
+    evaluate_recall = retrieval == 'ann' and engine_used == 'tfidf' and data.get('evaluateRecall')
+    strip_id = evaluate_recall and fields is not None and 'id' not in fields
+    matches = matcher.find_matches_for_internship(internship_profile, candidates_db, top_n=10,
+                                                  retrieval=retrieval, shortlist_size=shortlist_size,
+                                                  fields=fields + ['id'] if strip_id else fields,
+                                                  engine=engine, skill_weight=skill_weight,
+                                                  match_filter=match_filter)
+    
+    response = {
+        "success": True,
+        "matches": matches,
+        "totalMatches": len(matches),
+        "retrieval": retrieval if engine_used == 'tfidf' else 'exact',
+        "engine": engine_used
+    }
+    
+    # Optionally measure how much of the exact top 10 the shortlist kept
+    if evaluate_recall:
+        exact = matcher.find_matches_for_internship(internship_profile, candidates_db, top_n=10, fields=['id'],
+                                                    match_filter=match_filter)
+        response["recallAt10"] = recall_at_k([m['id'] for m in exact], [m['id'] for m in matches], 10)
+        if strip_id:
+            for match in matches:
+                del match['id']
+    
+    return jsonify(response)
+
+
+@app.route('/api/search/skills', methods=['GET'])
+def search_by_skills():
+    """Find stored candidates or internships holding the given skills"""
+    skills = request.args.get('skills', '')
+    profile_type = request.args.get('type', 'candidate')
+    match = request.args.get('match', 'all')
+    limit = request.args.get('limit', 50, type=int)
+    
+    if profile_type not in ('candidate', 'internship'):
+        return jsonify({"success": False, "message": "type must be 'candidate' or 'internship'"}), 400
+    if match not in ('all', 'any'):
+        return jsonify({"success": False, "message": "match must be 'all' or 'any'"}), 400
+    if not skills:
+        return jsonify({"success": False, "message": "No skills given"}), 400
+    
+    load_profiles()
+    
+    # Posting-list lookup, no scan over the stored profiles
+    profiles = candidates_db if profile_type == 'candidate' else internships_db
+    rows = matcher.index.skill_index(profile_type).rows_with(skills, match)
+    
+    return jsonify({
+        "success": True,
+        "results": [profiles[r] for r in rows[:limit].tolist()],
+        "total": len(rows)
+    })
+
+
+def list_profiles_response(user_type):
+    """Cursor-paginated, filtered listing shared by /api/internships and /api/candidates"""
+    filters = {name: request.args.get(name)
+               for name in ('location', 'workMode', 'department', 'skills', 'stipendMin', 'stipendMax', 'q')}
+    try:
+        profiles, next_cursor = repository.list_profiles(
+            user_type, filters,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    
+    return jsonify({
+        "success": True,
+        "results": profiles,
+        "nextCursor": next_cursor
+    })
+
+
+@app.route('/api/internships', methods=['GET'])
+def list_internships():
+    """List stored internships, newest first"""
+    return list_profiles_response('internship')
+
+
+@app.route('/api/candidates', methods=['GET'])
+def list_candidates():
+    """List stored candidate profiles, newest first"""
+    return list_profiles_response('candidate')
+
+
+def stored_matches_response(user_type, profile_id):
+    """Materialized top matches for a stored profile, computed on demand if not materialized yet"""
+    load_profiles()
+    rows = candidates_db if user_type == 'candidate' else internships_db
+    row = bisect_left(rows, profile_id, key=lambda profile: profile['id'])
+    if row == len(rows) or rows[row]['id'] != profile_id:
+        return jsonify({"success": False, "message": "Profile not found"}), 404
+    
+    top_n = max(1, min(request.args.get('limit', DEFAULT_TOP_K, type=int), DEFAULT_TOP_K))
+    fields = parse_fields(request.args.get('fields'))
+    matches = matcher.stored_matches(user_type, row, top_n, fields)
+    materialized = matches is not None
+    if matches is None:
+        if user_type == 'candidate':
+            matches = matcher.find_matches_for_candidate(rows[row], internships_db, top_n=top_n, fields=fields)
+        else:
+            matches = matcher.find_matches_for_internship(rows[row], candidates_db, top_n=top_n, fields=fields)
     
     return jsonify({
         "success": True,
         "matches": matches,
-        "totalMatches": len(matches)
+        "totalMatches": len(matches),
+        "materialized": materialized
     })
 
 
+@app.route('/api/candidates/<int:profile_id>/matches', methods=['GET'])
+def candidate_matches(profile_id):
+    """Top internship matches for a stored candidate"""
+    return stored_matches_response('candidate', profile_id)
+
+
+@app.route('/api/internships/<int:profile_id>/matches', methods=['GET'])
+def internship_matches(profile_id):
+    """Top candidate matches for a stored internship"""
+    return stored_matches_response('internship', profile_id)
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get platform statistics"""
+    load_profiles()
+    
     return jsonify({
         "success": True,
         "stats": {
-            "totalUsers": len(users_db),
+            "totalUsers": repository.count_users(),
             "totalCandidates": len(candidates_db),
             "totalInternships": len(internships_db),
-            "totalMatches": len(candidates_db) * len(internships_db)
+            "totalMatches": matcher.materialized.stats()['candidateMatches'],
+            "materializedMatches": matcher.materialized.stats(),
+            "semanticEngine": matcher.semantic.stats() if matcher.semantic is not None else None,
+            "matchShards": matcher.shards.stats() if matcher.shards is not None else None,
+            "resumeCache": resume_cache.stats(),
+            "matchCache": matcher.match_cache.stats() if matcher.match_cache is not None else None
         }
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text-format metrics for this process"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+@app.route('/api/metrics', methods=['PUT'])
+def toggle_metrics():
+    """Switch stage and request metrics on or off at runtime (admin only)"""
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    data = request.json or {}
+    if not isinstance(data.get('enabled'), bool):
+        return jsonify({"success": False, "message": "enabled must be true or false"}), 400
+    metrics.enabled = data['enabled']
+    
+    return jsonify({"success": True, "enabled": metrics.enabled})
+
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_request_profiles():
+    """Kept request profiles, slowest first (admin only)"""
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    return jsonify({
+        "success": True,
+        "mode": profiler.mode,
+        "profiles": profiler.store.list()
+    })
+
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """
+    Download one profile (admin only): collapsed stacks for sampled
+    requests, a pstats dump for cProfile ones (`format=text` for a summary)
+    """
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    profile = profiler.store.get(profile_id)
+    if profile is None:
+        return jsonify({"success": False, "message": "Profile not found"}), 404
+    
+    recorder = profile['recorder']
+    if recorder.mode == 'sample':
+        return Response(recorder.result(), mimetype='text/plain')
+    if request.args.get('format') == 'text':
+        return Response(recorder.summary(), mimetype='text/plain')
+    return Response(recorder.result(), mimetype='application/octet-stream',
+                    headers={'Content-Disposition': f'attachment; filename=profile-{profile_id}.prof'})
+
+
+@app.route('/api/admin/profiles', methods=['DELETE'])
+def clear_profiles():
+    """Drop every kept profile (admin only)"""
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    profiler.store.clear()
+    return jsonify({"success": True})
+
+
+@app.route('/api/admin/profiling', methods=['PUT'])
+def set_profiling_mode():
+    """Profile every request (`mode`: sample or cprofile) or only opted-in ones (null) (admin only)"""
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    mode = (request.json or {}).get('mode')
+    if mode is not None and mode not in PROFILE_MODES:
+        return jsonify({"success": False, "message": "mode must be 'sample', 'cprofile' or null"}), 400
+    profiler.mode = mode
+    
+    return jsonify({"success": True, "mode": profiler.mode})
+
+
+@app.route('/api/admin/batch-matches', methods=['POST'])
+def create_batch_run():
+    """
+    Start a top-K candidates report for every internship passing `filters`
+    (admin only). Re-posting an interrupted run resumes it; poll
+    GET /api/admin/batch-matches/<run> for progress.
+    """
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    data = request.json or {}
+    run = str(data.get('run') or f"batch-{datetime.now().strftime('%Y%m%d')}")
+    if not BATCH_RUN_PATTERN.fullmatch(run):
+        return jsonify({"success": False, "message": "run may only use letters, digits, '_', '.' and '-'"}), 400
+    output = data.get('output', 'storage')
+    if output not in BATCH_OUTPUTS:
+        return jsonify({"success": False, "message": f"output must be one of {', '.join(BATCH_OUTPUTS)}"}), 400
+    try:
+        top_k = int(data.get('topK', DEFAULT_BATCH_TOP_K))
+        match_filter = MatchFilter.parse('internship', data.get('filters'))
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    if not 1 <= top_k <= BATCH_MAX_TOP_K:
+        return jsonify({"success": False, "message": f"topK must be between 1 and {BATCH_MAX_TOP_K}"}), 400
+    
+    with _batch_lock:
+        if batch_runs.get(run, {}).get('state') == 'running':
+            return jsonify({"success": False, "message": f"Run '{run}' is already running"}), 409
+        try:
+            batch_runs[run] = start_batch_run(run, output, top_k, match_filter, bool(data.get('restart')))
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+    
+    return jsonify({"success": True, "batch": batch_runs[run]}), 202
+
+
+@app.route('/api/admin/batch-matches', methods=['GET'])
+def list_batch_runs():
+    """Batch runs started by this process (admin only)"""
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    return jsonify({"success": True, "runs": list(batch_runs.values())})
+
+
+@app.route('/api/admin/batch-matches/<run>', methods=['GET'])
+def get_batch_run(run):
+    """
+    Status and parameters of a batch run (admin only); with ?internshipId=
+    that internship's matches from a run stored in the database
+    """
+    if not is_admin():
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    
+    status = batch_runs.get(run)
+    params = repository.batch_run(run)
+    if status is None and params is None:
+        return jsonify({"success": False, "message": "Run not found"}), 404
+    
+    result = {"success": True, "batch": status, "params": params}
+    internship_id = request.args.get('internshipId')
+    if internship_id is not None:
+        if not internship_id.isdigit():
+            return jsonify({"success": False, "message": "internshipId must be a number"}), 400
+        result["matches"] = repository.get_batch_matches(run, int(internship_id))
+    
+    return jsonify(result)
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint: liveness (the process answers) and readiness
+    (warmup finished). With ?probe=ready it answers 503 until ready.
+    """
+    ready = is_ready()
+    status = 503 if request.args.get('probe') == 'ready' and not ready else 200
+    
     return jsonify({
         "status": "healthy",
+        "live": True,
+        "ready": ready,
+        "readiness": dict(readiness),
+        "lazyImports": import_status(),
         "timestamp": datetime.now().isoformat(),
         "services": {
             "resume_analyzer": "active",
-            "hybrid_matcher": "active",
+            "hybrid_matcher": "active" if matcher.index.ready else "idle",
             "database": "active"
         }
-    })
+    }), status
 
 
 if __name__ == '__main__':
@@ -576,4 +1785,4 @@ if __name__ == '__main__':
     print()
     
     # Run the app
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,464 @@
+"""
+Batch Matching
+Offline top-K candidates for every internship (or every open one), e.g.
+for a nightly placement report. Internships are split into chunks; each
+chunk is scored against all candidates in blocks of sparse matrix products
+sized by a memory budget, on a process pool, and written as soon as it
+finishes to CSV, Parquet or the database. A chunk is recorded as done
+together with its rows, so an interrupted run picks up where it stopped.
+
+    python batch_match.py --output reports/top50.csv --top-k 50 --open-only
+    python batch_match.py --run nightly --top-k 50 --open-only     # into the database
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from jobs import pool_context
+from matching import score_block, skill_matrix
+from materialized import TopKTable
+from skills import shared_skill_names
+
+
+DEFAULT_TOP_K = 50
+DEFAULT_MEMORY_MB = 512
+# Peak bytes per candidate x internship cell of a block: score_block's dense
+# temporaries plus folding the block into the chunk's top-K table (about 100
+# measured with tracemalloc; the rest is headroom)
+BYTES_PER_CELL = 160
+MAX_CHUNK_INTERNSHIPS = 256     # Bounds the work an interruption loses
+MIN_CANDIDATE_BLOCK = 1024
+
+# Output columns, in order
+REPORT_FIELDS = ('internshipId', 'title', 'company', 'rank', 'candidateId', 'name', 'email',
+                 'matchScore', 'tfidfScore', 'skillScore', 'matchedSkills')
+
+
+def plan_blocks(n_candidates, n_internships, memory_bytes, workers, chunk=None, worker_bytes=0):
+    """
+    (internships per chunk, candidates per block, workers) so that every
+    worker's score blocks stay within its share of `memory_bytes`.
+    `worker_bytes` is the corpus copy each pool worker holds (0 when forked
+    workers share it): workers are cut until the copies take at most half
+    the budget, and the blocks get what is left. `chunk` keeps the chunk
+    size of a run being resumed.
+    """
+    workers = max(1, workers)
+    if workers > 1 and worker_bytes:
+        workers = max(1, min(workers, memory_bytes // (2 * worker_bytes)))
+    # A single worker scores in this process, on the corpus already here
+    spare = memory_bytes - (worker_bytes * workers if workers > 1 else 0)
+    cells = max(1, spare // workers // BYTES_PER_CELL)
+    if chunk is None:
+        chunk = min(MAX_CHUNK_INTERNSHIPS, max(1, math.ceil(n_internships / workers)),
+                    max(1, cells // MIN_CANDIDATE_BLOCK))
+    block = max(1, min(n_candidates, cells // chunk))
+    return chunk, block, workers
+
+
+class ChunkScorer:
+    """
+    Everything needed to score chunks of internships and build their report
+    rows. Picklable, so each pool worker receives it once, through the
+    pool's initializer, and concurrent runs never share state.
+    """
+
+    def __init__(self, candidates, internships, candidate_info, internship_info, dictionary,
+                 top_k, chunk_rows=None, block_rows=None):
+        self.candidates = candidates                # Candidate PairSide
+        self.internships = internships              # PairSide of the selected internships
+        self.candidate_info = candidate_info        # Row -> (id, name, email)
+        self.internship_info = internship_info      # Selected row -> (id, title, company)
+        self.dictionary = dictionary
+        self.top_k = top_k
+        self.chunk_rows = chunk_rows
+        self.block_rows = block_rows
+        n_skills = 1 + max([int(ids[-1]) for ids in candidates.skill_ids + internships.skill_ids if len(ids)],
+                           default=0)
+        self.candidate_skills = skill_matrix(candidates.skill_ids, n_skills)
+        self.internship_skills = skill_matrix(internships.skill_ids, n_skills)
+
+    def nbytes(self):
+        """Approximate memory of one unpickled copy (what a forkserver/spawn worker holds)"""
+        total = 0
+        for side in (self.candidates, self.internships):
+            for block in getattr(side.vectors, 'blocks', [side.vectors]):
+                total += block.data.nbytes + block.indices.nbytes + block.indptr.nbytes
+            total += side.skill_counts.nbytes + sum(ids.nbytes + 96 for ids in side.skill_ids)
+        for matrix in (self.candidate_skills, self.internship_skills):
+            total += matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        for info in (self.candidate_info, self.internship_info):
+            total += sum(sys.getsizeof(info_tuple) + sum(sys.getsizeof(value) for value in info_tuple)
+                         for info_tuple in info)
+        return total
+
+    def score(self, chunk):
+        """(chunk, report rows) with the top-K candidates for one chunk of internships"""
+        start, stop = chunk * self.chunk_rows, min(len(self.internships), (chunk + 1) * self.chunk_rows)
+        owners = self.internships.slice(start, stop)
+        owner_skills = self.internship_skills[start:stop].T.tocsc()
+
+        table = TopKTable(self.top_k)
+        table.grow(stop - start)
+        for block_start in range(0, len(self.candidates), self.block_rows):
+            block = self.candidates.slice(block_start, block_start + self.block_rows)
+            overlap = (self.candidate_skills[block_start:block_start + self.block_rows] @ owner_skills).toarray()
+            total, tfidf, skill = score_block(block, owners, overlap)
+            table.merge(0, stop - start, np.arange(block_start, block_start + len(block)), total.T, tfidf.T, skill.T)
+        return chunk, self.report(start, table)
+
+    def report(self, start, table):
+        """Output rows for a chunk's TopKTable, best match first per internship"""
+        report = []
+        for owner in range(len(table)):
+            row = start + owner
+            internship_id, title, company = self.internship_info[row]
+            for rank, (candidate_row, total, tfidf, skill) in enumerate(table.top(owner), 1):
+                candidate_id, name, email = self.candidate_info[candidate_row]
+                report.append({
+                    'internshipId': internship_id,
+                    'title': title,
+                    'company': company,
+                    'rank': rank,
+                    'candidateId': candidate_id,
+                    'name': name,
+                    'email': email,
+                    'matchScore': round(total, 2),
+                    'tfidfScore': round(tfidf, 2),
+                    'skillScore': round(skill, 2),
+                    'matchedSkills': ', '.join(shared_skill_names(
+                        self.dictionary, self.internships.skill_ids[row], self.candidates.skill_ids[candidate_row]
+                    ))
+                })
+        return report
+
+
+_worker_scorer = None       # Scorer of the run a pool worker process serves, set by its initializer
+
+
+def init_worker(scorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def score_in_worker(chunk):
+    return _worker_scorer.score(chunk)
+
+
+# ==================== OUTPUTS ====================
+# Each output resumes a run only if it was started with the same parameters
+# (`stored_params`): `open` returns the chunks already written, `write` adds
+# one chunk atomically.
+
+class CsvOutput:
+    """One CSV file; a progress file next to it records the chunks written and the file size after them"""
+
+    def __init__(self, path):
+        self.path = path
+        self.progress_path = f"{path}.progress.json"
+        self.file = None
+        self.progress = None
+
+    def stored_params(self):
+        if not (os.path.exists(self.progress_path) and os.path.exists(self.path)):
+            return None
+        with open(self.progress_path) as f:
+            return json.load(f)['params']
+
+    def open(self, params, restart=False):
+        progress = None
+        if not restart and self.stored_params() is not None:
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+            if progress['params'] != params:
+                raise ValueError(f"{self.path} was started with other parameters; rerun with restart")
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if progress is None:
+            self.file = open(self.path, 'w', newline='', encoding='utf-8')
+            csv.writer(self.file).writerow(REPORT_FIELDS)
+            progress = {'params': params, 'chunks': [], 'bytes': self.file.tell()}
+        else:
+            # Drop anything written after the last recorded chunk
+            self.file = open(self.path, 'r+', newline='', encoding='utf-8')
+            self.file.truncate(progress['bytes'])
+            self.file.seek(progress['bytes'])
+        self.progress = progress
+        self._save_progress()
+        return set(progress['chunks'])
+
+    def _save_progress(self):
+        temp_path = f"{self.progress_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.progress, f)
+        os.replace(temp_path, self.progress_path)
+
+    def write(self, chunk, rows):
+        writer = csv.writer(self.file)
+        writer.writerows([row[field] for field in REPORT_FIELDS] for row in rows)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.progress['chunks'].append(chunk)
+        self.progress['bytes'] = self.file.tell()
+        self._save_progress()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class ParquetOutput:
+    """A directory of Parquet files, one per chunk (readable as one dataset); needs pyarrow"""
+
+    MANIFEST = '_batch.json'
+
+    def __init__(self, path):
+        self.path = path
+        # Optional dependency, imported only when Parquet is asked for (not at app startup)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Parquet output needs the pyarrow package (pip install pyarrow)")
+        self.pyarrow = pyarrow
+
+    def _part(self, chunk):
+        return os.path.join(self.path, f"part-{chunk:05d}.parquet")
+
+    def stored_params(self):
+        manifest = os.path.join(self.path, self.MANIFEST)
+        if not os.path.exists(manifest):
+            return None
+        with open(manifest) as f:
+            return json.load(f)
+
+    def open(self, params, restart=False):
+        manifest = os.path.join(self.path, self.MANIFEST)
+        if not restart and os.path.exists(manifest):
+            if self.stored_params() != params:
+                raise ValueError(f"{self.path} was started with other parameters; rerun with restart")
+            return {int(name[5:10]) for name in os.listdir(self.path)
+                    if name.startswith('part-') and name.endswith('.parquet')}
+
+        os.makedirs(self.path, exist_ok=True)
+        for name in os.listdir(self.path):
+            if name.startswith('part-'):
+                os.remove(os.path.join(self.path, name))
+        with open(manifest, 'w') as f:
+            json.dump(params, f)
+        return set()
+
+    def write(self, chunk, rows):
+        table = self.pyarrow.table({field: [row[field] for row in rows] for field in REPORT_FIELDS})
+        # Written under a temporary name, so a part file only exists once complete
+        temp_path = f"{self._part(chunk)}.tmp"
+        self.pyarrow.parquet.write_table(table, temp_path)
+        os.replace(temp_path, self._part(chunk))
+
+    def close(self):
+        pass
+
+
+class StorageOutput:
+    """Rows in the repository's batch_matches table under a run name"""
+
+    def __init__(self, repository, run):
+        self.repository = repository
+        self.run = run
+
+    def stored_params(self):
+        return self.repository.batch_run(self.run)
+
+    def open(self, params, restart=False):
+        stored = self.repository.batch_run(self.run)
+        if stored is not None and not restart:
+            if stored != params:
+                raise ValueError(f"Run '{self.run}' was started with other parameters; rerun with restart")
+            return self.repository.batch_chunks(self.run)
+        self.repository.start_batch_run(self.run, params)
+        return set()
+
+    def write(self, chunk, rows):
+        self.repository.add_batch_matches(self.run, chunk, rows)
+
+    def close(self):
+        pass
+
+
+def open_output(path=None, repository=None, run=None):
+    """Output for a CSV path, a Parquet path (file name ending in .parquet) or a repository run"""
+    if path is None:
+        return StorageOutput(repository, run)
+    if path.endswith('.parquet'):
+        return ParquetOutput(path)
+    if path.endswith('.csv'):
+        return CsvOutput(path)
+    raise ValueError("Output must end in .csv or .parquet")
+
+
+# ==================== JOB ====================
+
+class BatchMatchJob:
+    """
+    Top-K candidates for every internship of a fitted MatchIndex passing
+    `match_filter` (e.g. open ones), against all of its candidates.
+    """
+
+    def __init__(self, index, top_k=DEFAULT_TOP_K, match_filter=None, memory_mb=DEFAULT_MEMORY_MB, workers=None):
+        self.index = index
+        self.top_k = top_k
+        self.match_filter = match_filter
+        self.memory_bytes = memory_mb * 2 ** 20
+        self.workers = workers or os.cpu_count() or 1
+
+    def _snapshot(self):
+        """Candidate side, selected internship rows and their side, from one index version"""
+        self.index.sync()
+        with self.index.lock:
+            if not self.index.ready:
+                return None
+            n_features = self.index.n_features
+            candidates = self.index.sides['candidate'].pair_side(n_features)
+            internships = self.index.sides['internship'].pair_side(n_features)
+        rows = np.arange(len(internships))
+        if self.match_filter is not None:
+            rows = self.index.sides['internship'].attributes.rows(self.match_filter, len(internships))
+        return candidates, rows, internships.take(rows)
+
+    def params(self, candidates, rows, chunk_rows):
+        """What the results depend on; a run only resumes with identical parameters"""
+        internship_ids = [self.index.internships[r].get('id') for r in rows]
+        candidate_count = len(candidates)
+        return {
+            'topK': self.top_k,
+            'filter': repr(self.match_filter.key()) if self.match_filter is not None else None,
+            'internships': len(internship_ids),
+            'internshipIds': hashlib.sha1(json.dumps(internship_ids).encode()).hexdigest(),
+            'candidates': candidate_count,
+            'lastCandidateId': self.index.candidates[candidate_count - 1].get('id') if candidate_count else None,
+            'chunkInternships': chunk_rows
+        }
+
+    def run(self, output, restart=False, progress=None):
+        """
+        Score every chunk not yet in `output` and write each as it finishes.
+        `progress(done, total)` is called after every chunk. Returns a summary.
+        """
+        start_time = time.perf_counter()
+        snapshot = self._snapshot()
+        if snapshot is None:
+            raise ValueError("No profiles to match")
+        candidates, rows, internships = snapshot
+
+        with self.index.lock:
+            candidate_info = [(c.get('id'), c.get('name'), c.get('email'))
+                              for c in self.index.candidates[:len(candidates)]]
+            internship_info = [(i.get('id'), i.get('title'), i.get('company'))
+                               for i in (self.index.internships[r] for r in rows)]
+        scorer = ChunkScorer(candidates, internships, candidate_info, internship_info, self.index.dictionary,
+                             self.top_k)
+        # Forked workers share the corpus; forkserver/spawn workers each unpickle their own copy
+        context = pool_context()
+        worker_bytes = 0 if context.get_start_method() == 'fork' else scorer.nbytes()
+
+        chunk_rows, block_rows, workers = plan_blocks(len(candidates), len(internships), self.memory_bytes,
+                                                      self.workers, worker_bytes=worker_bytes)
+        params = self.params(candidates, rows, chunk_rows)
+        previous = None if restart else output.stored_params()
+        if previous is not None and dict(previous, chunkInternships=chunk_rows) == params:
+            # Resuming: keep the run's chunk boundaries (another worker count or budget would move them)
+            chunk_rows, block_rows, workers = plan_blocks(len(candidates), len(internships), self.memory_bytes,
+                                                          self.workers, previous['chunkInternships'], worker_bytes)
+            params = previous
+        scorer.chunk_rows, scorer.block_rows = chunk_rows, block_rows
+        done = output.open(params, restart)
+        n_chunks = math.ceil(len(internships) / chunk_rows)
+        pending = [chunk for chunk in range(n_chunks) if chunk not in done]
+        summary = {
+            "internships": len(internships),
+            "candidates": len(candidates),
+            "chunks": n_chunks,
+            "resumedChunks": n_chunks - len(pending),
+            "chunkInternships": chunk_rows,
+            "candidateBlock": block_rows,
+            "workers": workers,
+            "rows": 0
+        }
+
+        def finish(chunk, report):
+            output.write(chunk, report)
+            summary["rows"] += len(report)
+            done.add(chunk)
+            if progress is not None:
+                progress(len(done), n_chunks)
+
+        try:
+            if workers == 1 or len(pending) <= 1:
+                for chunk in pending:
+                    finish(*scorer.score(chunk))
+            else:
+                # Workers also build the report rows, so the coordinator only writes
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                         initializer=init_worker, initargs=(scorer,)) as pool:
+                    for future in as_completed([pool.submit(score_in_worker, chunk) for chunk in pending]):
+                        finish(*future.result())
+        finally:
+            output.close()
+
+        summary["seconds"] = round(time.perf_counter() - start_time, 2)
+        return summary
+
+
+# ==================== COMMAND LINE ====================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Top-K candidates for every internship, as a CSV/Parquet "
+                                                 "report or into the database")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--output', help='report file: .csv, or .parquet (a directory of part files)')
+    target.add_argument('--run', help='store results in the database under this run name')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help='candidates per internship')
+    parser.add_argument('--open-only', action='store_true', help='only internships whose deadline has not passed')
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_MB,
+                        help='memory budget for score blocks and worker corpus copies, shared by all workers')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--restart', action='store_true', help='discard any earlier progress of this output')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Only the database and the matcher are needed, not the app's warmup
+    from app import DATABASE_PATH, HybridMatcher
+    from filters import MatchFilter
+    from storage import SQLiteRepository
+
+    repository = SQLiteRepository(DATABASE_PATH)
+    candidates = repository.profiles_after('candidate')
+    internships = repository.profiles_after('internship')
+    matcher = HybridMatcher(candidates, internships, semantic_mode=None)
+    match_filter = MatchFilter.parse('internship', {'openOnly': True}) if args.open_only else None
+
+    try:
+        output = open_output(args.output, repository, args.run)
+        job = BatchMatchJob(matcher.index, args.top_k, match_filter, args.memory_mb, args.workers)
+        summary = job.run(output, args.restart,
+                          progress=lambda done, total: print(f"  {done}/{total} chunks", flush=True))
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return 1
+    print(f"✅ {json.dumps(summary)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
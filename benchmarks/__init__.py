@@ -0,0 +1,4 @@
+"""
+Benchmarks for the matching and resume-analysis hot paths.
+Run from the repository root, e.g. `python -m benchmarks.resume_analysis`.
+"""
@@ -0,0 +1,89 @@
+"""
+Deterministic synthetic data for benchmarks
+"""
+
+import io
+import random
+
+import docx
+
+from app import EDUCATION_KEYWORDS, SKILLS_KEYWORDS
+from seed_data import FIRST_NAMES, LAST_NAMES, synthetic_candidate, synthetic_internship
+
+
+FILLER_WORDS = [
+    'worked', 'on', 'a', 'team', 'that', 'built', 'scalable', 'services', 'for', 'customers',
+    'improved', 'performance', 'by', 'designing', 'the', 'new', 'pipeline', 'and', 'maintaining',
+    'good', 'documentation', 'with', 'stakeholders', 'across', 'projects', 'delivered', 'features'
+]
+
+
+def synthetic_resume(rng):
+    """One plain-text resume with contact details, skills, education and filler"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = name.lower().replace(' ', '.') + f"{rng.randint(1, 999)}@example.com"
+    phone = f"+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}"
+    skills = ', '.join(rng.sample(SKILLS_KEYWORDS, rng.randint(3, 12)))
+    education = rng.choice(EDUCATION_KEYWORDS).upper()
+    body = ' '.join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(80, 600)))
+    return (
+        f"{name}\nEmail: {email}\nPhone: {phone}\n"
+        f"Education: {education} in Computer Science\n"
+        f"Skills: {skills}\n\nExperience\n{body}\n"
+    )
+
+
+def synthetic_resumes(count, seed=42):
+    """`count` resumes, identical for the same seed"""
+    rng = random.Random(seed)
+    return [synthetic_resume(rng) for _ in range(count)]
+
+
+def synthetic_profiles(user_type, count, seed=42):
+    """`count` candidates or internships with taxonomy skills and filler text, identical for the same seed"""
+    rng = random.Random(seed)
+    make = synthetic_candidate if user_type == 'candidate' else synthetic_internship
+    return [make(rng, SKILLS_KEYWORDS, FILLER_WORDS) for _ in range(count)]
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def synthetic_pdf(pages):
+    """Minimal uncompressed PDF with one page per string in `pages`"""
+    n = len(pages)
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [" + " ".join(f"{4 + 2 * i} 0 R" for i in range(n)) + f"] /Count {n} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for i, page in enumerate(pages):
+        lines = " ".join(f"({_pdf_escape(line)}) '" for line in page.splitlines())
+        content = f"BT /F1 10 Tf 40 760 Td 12 TL {lines} ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Contents {5 + 2 * i} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1'))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1'))
+    out.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1'))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1'))
+    return out.getvalue()
+
+
+def synthetic_docx(paragraphs):
+    """DOCX bytes with one paragraph per string in `paragraphs`"""
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
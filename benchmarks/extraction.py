@@ -0,0 +1,94 @@
+"""
+Peak memory and time per upload for resume text extraction, before and
+after streaming extraction with page/character caps.
+
+    python -m benchmarks.extraction --pages 300
+
+Peak memory is measured with tracemalloc, i.e. Python-level allocations
+(PyPDF2 is pure Python; lxml's C allocations for DOCX are not counted).
+"""
+
+import argparse
+import io
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+
+import PyPDF2
+import docx
+
+from app import ResumeAnalyzer
+from benchmarks.datagen import synthetic_docx, synthetic_pdf, synthetic_resume
+
+
+def legacy_extract_pdf(data):
+    """Whole upload in memory, text grown with += per page"""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    return text
+
+
+def legacy_extract_docx(data):
+    document = docx.Document(io.BytesIO(data))
+    text = ""
+    for paragraph in document.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def spooled(data):
+    """Upload as the server sees it: a temp file spooled to disk past 500 KB"""
+    stream = tempfile.SpooledTemporaryFile(max_size=500 * 1024)
+    stream.write(data)
+    stream.seek(0)
+    return stream
+
+
+def measure(extract):
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = extract()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_mb": round(peak / 2 ** 20, 2), "seconds": round(elapsed, 3), "chars": len(text)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=300, help='pages in the synthetic PDF')
+    parser.add_argument('--paragraphs', type=int, default=5000, help='paragraphs in the synthetic DOCX')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [synthetic_resume(rng)[:3000] for _ in range(args.pages)]
+    pdf = synthetic_pdf(pages)
+    paragraphs = [line for page in pages for line in page.splitlines() if line][:args.paragraphs]
+    document = synthetic_docx(paragraphs)
+
+    analyzer = ResumeAnalyzer()
+    results = {
+        "pdf": {
+            "pages": args.pages,
+            "upload_mb": round(len(pdf) / 2 ** 20, 2),
+            "before": measure(lambda: legacy_extract_pdf(pdf)),
+            "after": measure(lambda: analyzer.extract_text_from_pdf(spooled(pdf)))
+        },
+        "docx": {
+            "paragraphs": len(paragraphs),
+            "upload_mb": round(len(document) / 2 ** 20, 2),
+            "before": measure(lambda: legacy_extract_docx(document)),
+            "after": measure(lambda: analyzer.extract_text_from_docx(spooled(document)))
+        },
+        "limits": {"max_pages": analyzer.max_pages, "max_chars": analyzer.max_chars}
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
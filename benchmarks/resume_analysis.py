@@ -0,0 +1,80 @@
+"""
+Per-resume analysis time, before and after the single-pass document model.
+
+    python -m benchmarks.resume_analysis --count 10000
+"""
+
+import argparse
+import json
+import re
+import time
+
+from app import EDUCATION_KEYWORDS, SKILLS_KEYWORDS, ResumeAnalyzer
+from benchmarks.datagen import synthetic_resumes
+
+
+def legacy_analyze(text):
+    """The analysis as it ran before: string regexes and repeated extraction"""
+    def email(t):
+        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', t)
+        return emails[0] if emails else "Not found"
+
+    def phone(t):
+        phones = re.findall(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', t)
+        return phones[0] if phones else "Not found"
+
+    def skills(t):
+        lower = t.lower()
+        return list(set(s.title() for s in SKILLS_KEYWORDS if s in lower))
+
+    def education(t):
+        lower = t.lower()
+        found = [e.upper() for e in EDUCATION_KEYWORDS if e in lower]
+        return list(set(found)) if found else ["Not specified"]
+
+    found_skills = skills(text)
+    result = {"email": email(text), "phone": phone(text), "skills": found_skills,
+              "education": education(text)}
+
+    # calculate_resume_score re-ran the extractors and split the text again
+    score = min(len(found_skills) * 4, 40)
+    word_count = len(text.split())
+    if word_count > 100:
+        score += min(word_count / 50, 20)
+    score += 10 if email(text) != "Not found" else 0
+    score += 10 if phone(text) != "Not found" else 0
+    score += 10 if "Not specified" not in education(text) else 0
+    result["score"] = min(int(score), 100)
+    result["word_count"] = len(text.split())
+    return result
+
+
+def time_per_resume(analyze, resumes):
+    start = time.perf_counter()
+    for text in resumes:
+        analyze(text)
+    return (time.perf_counter() - start) / len(resumes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000, help='number of synthetic resumes')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    resumes = synthetic_resumes(args.count, args.seed)
+    analyzer = ResumeAnalyzer()
+
+    before = time_per_resume(legacy_analyze, resumes)
+    after = time_per_resume(analyzer.analyze_text, resumes)
+
+    print(json.dumps({
+        "resumes": args.count,
+        "before_us_per_resume": round(before * 1e6, 1),
+        "after_us_per_resume": round(after * 1e6, 1),
+        "speedup": round(before / after, 2)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
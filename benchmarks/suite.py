@@ -0,0 +1,531 @@
+"""
+Latency, throughput and peak RSS for the matching and resume-analysis hot
+paths, as JSON, optionally compared against a saved baseline.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --output current.json
+    python -m benchmarks.suite --quick --cases 'hybrid_match|flask'
+
+Each case runs in a fresh process, so its peak RSS is its own, and the app
+is imported there against a throwaway database. Comparison exits with
+status 1 if any case got slower (p50/p95/p99) or bigger (peak RSS) by more
+than --threshold.
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:     # Not available on Windows
+    resource = None
+
+
+DEFAULT_SIZES = ['1000x100', '1000x1000', '1000x10000', '10000x100', '10000x1000', '10000x10000',
+                 '100000x100', '100000x1000', '100000x10000']
+QUICK_SIZES = ['1000x100', '1000x1000', '10000x100']
+DEFAULT_INDEX_SIZE = '10000x1000'
+DEFAULT_THRESHOLD = 0.20
+QUERY_COUNT = 200
+RESUME_COUNT = 50
+# Metrics compared against the baseline; higher is worse for all of them
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'peak_rss_mb')
+
+
+def parse_size(size):
+    candidates, internships = size.lower().split('x')
+    return int(candidates), int(internships)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def timed(fn, iterations, warmup=1, items=1):
+    """
+    Run `fn` `warmup` + `iterations` times and summarize the timed runs.
+    `items` is the work per call (e.g. pairs scored) for throughput.
+    """
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+        "mean_ms": round(total / iterations * 1e3, 3),
+        "throughput_per_s": round(iterations * items / total, 2) if total else None
+    }
+
+
+def timed_each(fn, inputs, warmup=1):
+    """Like timed(), calling `fn` once per input"""
+    inputs = list(inputs)
+    for value in inputs[:warmup]:
+        fn(value)
+    position = iter(range(len(inputs)))
+    return timed(lambda: fn(inputs[next(position)]), len(inputs), warmup=0)
+
+
+# ==================== CASES ====================
+# Cases import the app lazily: it must load inside the case's own process,
+# after DATABASE_PATH points at that process's scratch database.
+
+def case_hybrid_match(seed, size):
+    """Ad-hoc hybrid_match (fit + score all pairs) of C candidates x I internships"""
+    from app import HybridMatcher
+    from benchmarks.datagen import synthetic_profiles
+
+    n_candidates, n_internships = parse_size(size)
+    candidates = synthetic_profiles('candidate', n_candidates, seed)
+    internships = synthetic_profiles('internship', n_internships, seed + 1)
+    matcher = HybridMatcher()
+    pairs = n_candidates * n_internships
+    small = pairs <= 10 ** 7
+    result = timed(lambda: matcher.hybrid_match(candidates, internships, top_n=10),
+                   iterations=5 if small else 1, warmup=1 if small else 0, items=pairs)
+    result["unit"] = "pairs"
+    return result
+
+
+def _indexed_matcher(seed, size):
+    """Matcher with a fitted index over C stored candidates and I stored internships"""
+    from app import HybridMatcher
+    from benchmarks.datagen import synthetic_profiles
+
+    n_candidates, n_internships = parse_size(size)
+    candidates = synthetic_profiles('candidate', n_candidates, seed)
+    internships = synthetic_profiles('internship', n_internships, seed + 1)
+    matcher = HybridMatcher(candidates, internships)
+    matcher.index.sync()
+    return matcher, candidates, internships
+
+
+def case_find_matches_for_candidate(seed, size):
+    """One candidate query against the indexed internships"""
+    from benchmarks.datagen import synthetic_profiles
+
+    matcher, _, internships = _indexed_matcher(seed, size)
+    queries = synthetic_profiles('candidate', QUERY_COUNT, seed + 2)
+    return timed_each(lambda q: matcher.find_matches_for_candidate(q, internships, top_n=10), queries)
+
+
+def case_find_matches_for_internship(seed, size, retrieval='exact'):
+    """One internship query against the indexed candidates"""
+    from benchmarks.datagen import synthetic_profiles
+
+    matcher, candidates, _ = _indexed_matcher(seed, size)
+    queries = synthetic_profiles('internship', QUERY_COUNT, seed + 2)
+    return timed_each(lambda q: matcher.find_matches_for_internship(q, candidates, top_n=10,
+                                                                     retrieval=retrieval), queries)
+
+
+def _alias_variant(profile, aliases):
+    """The candidate with every skill that has an alias written as that alias (e.g. 'ml')"""
+    skills = [name.strip() for name in profile['skills'].split(',')]
+    return dict(profile, skills=', '.join(aliases.get(name.lower(), name) for name in skills))
+
+
+def _overlap_at_10(left, right):
+    return len({m['id'] for m in left[:10]} & {m['id'] for m in right[:10]}) / 10
+
+
+def case_semantic_match(seed, size):
+    """
+    Candidate queries on the dense LSA engine vs TF-IDF: latency of both,
+    fit time, and quality as the share of the top 10 that survives writing
+    the query's skills as aliases, plus agreement between the engines
+    """
+    from benchmarks.datagen import synthetic_profiles
+    from skills import load_taxonomy
+
+    matcher, _, internships = _indexed_matcher(seed, size)
+    for i, internship in enumerate(internships):
+        internship['id'] = i + 1
+    start = time.perf_counter()
+    matcher.semantic.wanted = True
+    matcher.semantic.sync()
+    fit_seconds = time.perf_counter() - start
+
+    queries = synthetic_profiles('candidate', QUERY_COUNT, seed + 2)
+    result = timed_each(lambda q: matcher.find_matches_for_candidate(q, internships, engine='semantic'), queries)
+    tfidf = timed_each(lambda q: matcher.find_matches_for_candidate(q, internships), queries)
+    result["tfidf_p50_ms"] = tfidf["p50_ms"]
+    result["tfidf_p95_ms"] = tfidf["p95_ms"]
+    result["fit_seconds"] = round(fit_seconds, 3)
+
+    aliases = {entry['name'].lower(): entry['aliases'][0]
+               for entry in load_taxonomy()['skills'] if entry.get('aliases')}
+    quality = {"alias_overlap_at_10": {}}
+    top = {}
+    for engine in ('tfidf', 'semantic'):
+        top[engine] = [matcher.find_matches_for_candidate(q, internships, engine=engine) for q in queries]
+        renamed = [matcher.find_matches_for_candidate(_alias_variant(q, aliases), internships, engine=engine)
+                   for q in queries]
+        quality["alias_overlap_at_10"][engine] = round(
+            sum(map(_overlap_at_10, top[engine], renamed)) / len(queries), 3
+        )
+    quality["engine_agreement_at_10"] = round(sum(map(_overlap_at_10, top['tfidf'], top['semantic'])) / len(queries), 3)
+    result["quality"] = quality
+    return result
+
+
+SHARD_COUNTS = (0, 2, 4)
+SHARD_CLIENTS = 8
+
+
+def case_sharded_match(seed, size, shards):
+    """
+    Internship queries from SHARD_CLIENTS concurrent threads against the
+    indexed candidates, scored by `shards` shard processes (0: in process).
+    Throughput is queries per second of wall time; peak RSS is the
+    coordinator's only.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from app import HybridMatcher
+    from benchmarks.datagen import synthetic_profiles
+
+    n_candidates, n_internships = parse_size(size)
+    candidates = synthetic_profiles('candidate', n_candidates, seed)
+    internships = synthetic_profiles('internship', n_internships, seed + 1)
+    matcher = HybridMatcher(candidates, internships, shards=shards)
+    matcher.index.sync()
+    if matcher.shards is not None:
+        # Queries fall back to in-process scoring until the shards are loaded
+        matcher.shards.sync()
+    queries = synthetic_profiles('internship', QUERY_COUNT, seed + 2)
+
+    def query(profile):
+        start = time.perf_counter()
+        matcher.indexed_match(profile, 'internship', top_n=10)
+        return time.perf_counter() - start
+
+    query(queries[0])
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SHARD_CLIENTS) as clients:
+        latencies = sorted(clients.map(query, queries))
+    wall = time.perf_counter() - start
+    if matcher.shards is not None:
+        matcher.shards.close()
+    return {
+        "iterations": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1e3, 3),
+        "throughput_per_s": round(len(latencies) / wall, 2),
+        "shards": shards,
+        "clients": SHARD_CLIENTS
+    }
+
+
+FILTERS = {
+    'none': None,
+    'work_mode': {'workMode': 'Remote'},
+    'work_mode_location': {'workMode': 'Remote', 'location': 'Mumbai'},
+    'work_mode_location_stipend': {'workMode': 'Remote', 'location': 'Mumbai', 'stipendMin': 45000}
+}
+
+
+def case_filtered_match(seed, size):
+    """
+    Candidate queries with hard filters of growing selectivity: rows left
+    after filtering and the latency of each (the case's own percentiles
+    are for the most selective filter)
+    """
+    from benchmarks.datagen import synthetic_profiles
+    from filters import MatchFilter
+
+    matcher, _, internships = _indexed_matcher(seed, size)
+    queries = synthetic_profiles('candidate', QUERY_COUNT, seed + 2)
+    by_filter = {}
+    for name, values in FILTERS.items():
+        match_filter = MatchFilter.parse('internship', values)
+        rows = matcher.index.sides['internship'].attributes.rows(match_filter) if match_filter else internships
+        result = timed_each(lambda q: matcher.find_matches_for_candidate(q, internships, match_filter=match_filter),
+                            queries)
+        by_filter[name] = {"rows": len(rows), "p50_ms": result["p50_ms"], "p95_ms": result["p95_ms"]}
+    result["by_filter"] = by_filter
+    return result
+
+
+def _resume_files(seed, kind):
+    """(filename, bytes) for RESUME_COUNT generated resumes of one file type"""
+    from benchmarks.datagen import synthetic_docx, synthetic_pdf, synthetic_resume
+
+    rng = random.Random(seed)
+    files = []
+    for i in range(RESUME_COUNT):
+        text = synthetic_resume(rng)
+        if kind == 'txt':
+            data = text.encode('utf-8')
+        elif kind == 'docx':
+            data = synthetic_docx(text.splitlines())
+        else:
+            data = synthetic_pdf([text])
+        files.append((f"resume{i}.{kind}", data))
+    return files
+
+
+def case_analyze_resume(seed, kind):
+    """ResumeAnalyzer.analyze_resume on a generated upload (extraction + analysis)"""
+    from app import resume_analyzer
+
+    files = _resume_files(seed, kind)
+    return timed_each(lambda f: resume_analyzer.analyze_resume(io.BytesIO(f[1]), f[0]), files)
+
+
+def _check(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def case_flask(seed, endpoint, size):
+    """End-to-end request through the Flask test client, over C candidates and I internships in the database"""
+    import app as portal
+    from benchmarks.datagen import synthetic_profiles
+
+    n_candidates, n_internships = parse_size(size)
+    portal.repository.add_profiles('candidate', synthetic_profiles('candidate', n_candidates, seed))
+    portal.repository.add_profiles('internship', synthetic_profiles('internship', n_internships, seed + 1))
+    portal.load_profiles()
+    portal.matcher.materialized.catch_up()
+    client = portal.app.test_client()
+
+    if endpoint in ('find-matches-for-candidate', 'find-matches-for-internship'):
+        user_type = endpoint.rsplit('-', 1)[1]
+        queries = synthetic_profiles(user_type, QUERY_COUNT, seed + 2)
+        return timed_each(lambda q: _check(client.post(f'/api/{endpoint}', json=q)), queries)
+    if endpoint == 'analyze-resume':
+        files = _resume_files(seed, 'txt')
+        return timed_each(lambda f: _check(client.post('/api/analyze-resume', content_type='multipart/form-data',
+                                                       data={'resume': (io.BytesIO(f[1]), f[0])})), files)
+    if endpoint == 'candidate-matches':
+        ids = [row['id'] for row in portal.candidates_db[:QUERY_COUNT]]
+        return timed_each(lambda i: _check(client.get(f'/api/candidates/{i}/matches')), ids)
+    if endpoint == 'internships':
+        return timed(lambda: _check(client.get('/api/internships?location=Mumbai&limit=20')), QUERY_COUNT)
+    return timed(lambda: _check(client.get('/api/stats')), QUERY_COUNT)
+
+
+STARTUP_RUNS = 5
+WARMUP_MODES = ('off', 'blocking')
+
+
+def parse_importtime(stderr):
+    """(cumulative seconds of `import app`, [(module, cumulative seconds)] of its direct imports)"""
+    total, direct = None, []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        if name.strip() == 'app' and depth == 0:
+            total = int(cumulative) / 1e6
+        elif depth == 1:
+            direct.append((name.strip(), int(cumulative) / 1e6))
+    return total, direct
+
+
+def case_startup(seed, mode):
+    """
+    Cold start of a fresh interpreter running `import app` and
+    `create_app()` under `python -X importtime`, with WARMUP_MODE=mode and
+    an empty database
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, WARMUP_MODE=mode)
+    imports = []
+
+    def start():
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app; app.create_app()'],
+                                   cwd=root, env=env, capture_output=True, text=True, check=True)
+        imports.append(parse_importtime(completed.stderr))
+
+    result = timed(start, STARTUP_RUNS)
+    totals = sorted(total for total, _ in imports[1:])
+    _, direct = imports[-1]
+    result["import_app_ms"] = round(percentile(totals, 0.50) * 1e3, 1)
+    result["slowest_imports"] = {name: round(seconds * 1e3, 1)
+                                 for name, seconds in sorted(direct, key=lambda item: -item[1])[:10]}
+    return result
+
+
+FLASK_ENDPOINTS = ('find-matches-for-candidate', 'find-matches-for-internship', 'analyze-resume',
+                   'candidate-matches', 'internships', 'stats')
+
+
+def build_cases(sizes, index_size):
+    """Case name -> (function, extra args after the seed), in run order"""
+    cases = {}
+    for size in sizes:
+        cases[f"hybrid_match[{size}]"] = (case_hybrid_match, (size,))
+    cases[f"find_matches_for_candidate[{index_size}]"] = (case_find_matches_for_candidate, (index_size,))
+    cases[f"find_matches_for_internship[{index_size}]"] = (case_find_matches_for_internship, (index_size,))
+    cases[f"find_matches_for_internship_ann[{index_size}]"] = (
+        case_find_matches_for_internship, (index_size, 'ann')
+    )
+    cases[f"semantic_match[{index_size}]"] = (case_semantic_match, (index_size,))
+    cases[f"filtered_match[{index_size}]"] = (case_filtered_match, (index_size,))
+    for shards in SHARD_COUNTS:
+        cases[f"sharded_match[{index_size}][{shards}]"] = (case_sharded_match, (index_size, shards))
+    for kind in ('txt', 'docx', 'pdf'):
+        cases[f"analyze_resume[{kind}]"] = (case_analyze_resume, (kind,))
+    for endpoint in FLASK_ENDPOINTS:
+        cases[f"flask[{endpoint}]"] = (case_flask, (endpoint, index_size))
+    for mode in WARMUP_MODES:
+        cases[f"startup[{mode}]"] = (case_startup, (mode,))
+    return cases
+
+
+def run_case(fn, seed, args, scratch_dir):
+    """Entry point inside the case's own process"""
+    os.environ['DATABASE_PATH'] = os.path.join(scratch_dir, 'portal.db')
+    os.environ['INDEX_SNAPSHOT_DIR'] = ''
+    # Warm up before the case so no warmup thread competes with the timed calls
+    os.environ['WARMUP_MODE'] = 'blocking'
+    # Repeated uploads would otherwise be served from the resume cache
+    os.environ['RESUME_CACHE_ENTRIES'] = '0'
+    os.environ.pop('RESUME_CACHE_DIR', None)
+    from app import create_app
+    create_app()
+    result = fn(seed, *args)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_isolated(fn, seed, args):
+    """Run one case in a fresh spawned process with its own scratch directory"""
+    with tempfile.TemporaryDirectory(prefix='bench-') as scratch_dir:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            return pool.submit(run_case, fn, seed, args, scratch_dir).result()
+
+
+# ==================== REPORT ====================
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Per-case ratio (current / baseline) for each compared metric, and the
+    names of metrics that regressed by more than `threshold`.
+    """
+    comparison = {}
+    for name, result in results.items():
+        before = baseline.get('results', {}).get(name)
+        if before is None or 'error' in result or 'error' in before:
+            continue
+        entry = {"ratios": {}, "regressions": []}
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            entry["ratios"][metric] = round(ratio, 3)
+            if ratio > 1 + threshold:
+                entry["regressions"].append(metric)
+        comparison[name] = entry
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=None,
+                        help=f"comma-separated CxI sizes for hybrid_match (default: {','.join(DEFAULT_SIZES)})")
+    parser.add_argument('--index-size', default=DEFAULT_INDEX_SIZE,
+                        help='CxI stored profiles for find_matches_* and the Flask cases')
+    parser.add_argument('--quick', action='store_true', help=f"small sizes only ({','.join(QUICK_SIZES)}, index 1000x100)")
+    parser.add_argument('--cases', default=None, help='regex selecting cases by name')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help='write the JSON report here as well as to stdout')
+    parser.add_argument('--baseline', default=None, help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown before a metric counts as a regression (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    sizes = args.sizes.split(',') if args.sizes else (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    index_size = '1000x100' if args.quick and args.index_size == DEFAULT_INDEX_SIZE else args.index_size
+    cases = build_cases(sizes, index_size)
+    if args.cases:
+        cases = {name: case for name, case in cases.items() if re.search(args.cases, name)}
+
+    results = {}
+    for name, (fn, case_args) in cases.items():
+        print(f"{name} ...", file=sys.stderr, flush=True)
+        try:
+            results[name] = run_isolated(fn, args.seed, case_args)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {str(e)}"}
+            print(f"Error in benchmark {name}: {str(e)}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "index_size": index_size
+        },
+        "results": results
+    }
+
+    regressed = False
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare(results, baseline, args.threshold)
+        report["comparison"] = {
+            "baseline_revision": baseline.get('meta', {}).get('revision'),
+            "threshold": args.threshold,
+            "cases": comparison
+        }
+        regressed = any(entry["regressions"] for entry in comparison.values())
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
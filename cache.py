@@ -0,0 +1,217 @@
+"""
+Caches
+Size-bounded LRU cache, plus the content-addressed resume cache and the
+match-result cache built on it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and approximate size in bytes"""
+
+    def __init__(self, max_entries=1024, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.entries = OrderedDict()    # key -> (value, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self.entries[key] = (value, size)
+            self.bytes += size
+            while self.entries and (len(self.entries) > self.max_entries or
+                                    (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def _entry_size(entry):
+    return len(entry.get('text', '')) + len(json.dumps(entry.get('analysis', {})))
+
+
+class ResumeCache:
+    """
+    Content-addressed cache of parsed resumes.
+
+    Keys are a SHA-256 of the uploaded bytes plus the file type and the
+    analyzer/taxonomy version, so a re-upload of the same file skips text
+    extraction and analysis, and changing the extractor invalidates old
+    entries. Entries live in an in-memory LRU and, optionally, as JSON
+    files under `disk_dir`.
+    """
+
+    def __init__(self, version, max_entries=2048, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.version = version
+        self.memory = LRUCache(max_entries, max_bytes, sizeof=_entry_size)
+        self.disk_dir = disk_dir
+        self.disk_hits = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def key(self, data, filename):
+        """Cache key for raw bytes or a seekable stream (read in chunks, then rewound)"""
+        hasher = hashlib.sha256()
+        if hasattr(data, 'read'):
+            for chunk in iter(lambda: data.read(HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+            data.seek(0)
+        else:
+            hasher.update(data)
+        digest = hasher.hexdigest()
+        extension = os.path.splitext(filename or '')[1].lower()
+        return f"{digest}{extension}:{self.version}"
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+    def get(self, key):
+        """Cached {"text", "analysis"} entry for `key`, or None"""
+        entry = self.memory.get(key)
+        if entry is not None or not self.disk_dir:
+            return entry
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.disk_hits += 1
+        self.memory.put(key, entry)
+        return entry
+
+    def put(self, key, text, analysis):
+        entry = {"text": text, "analysis": analysis}
+        self.memory.put(key, entry)
+        if not self.disk_dir:
+            return
+        # Write-then-rename so concurrent readers never see a partial file
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Error writing resume cache: {str(e)}")
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats["diskHits"] = self.disk_hits
+        stats["diskEnabled"] = bool(self.disk_dir)
+        return stats
+
+
+class MatchCache:
+    """
+    Match results keyed by a canonical digest of the query profile plus the
+    version of the corpus it was matched against, so saving a profile on
+    that side invalidates older entries by never looking them up again.
+    Entries also expire after `ttl` seconds, and concurrent misses on one
+    key are computed once: later callers wait for the first (single-flight).
+    """
+
+    def __init__(self, max_entries=4096, ttl=300):
+        self.memory = LRUCache(max_entries)
+        self.ttl = ttl
+        self.inflight = {}      # key -> Future of the call computing it
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def digest(*parts):
+        """Stable key component for JSON-serializable parts"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_or_compute(self, key, compute):
+        """Cached value for `key`, or `compute()` run once for every concurrent caller"""
+        entry = self.memory.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            with self.lock:
+                self.hits += 1
+            return entry[1]
+
+        with self.lock:
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+            self.memory.put(key, (time.monotonic() + self.ttl, value))
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[key]
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self.memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "ttlSeconds": self.ttl
+        }
@@ -0,0 +1,71 @@
+"""
+Resume Text Extraction
+Pulls text out of PDF, DOCX and TXT uploads page by page (or paragraph by
+paragraph) from any seekable stream, so uploads can stay spooled on disk,
+and stops once a page or character cap is reached.
+"""
+
+import codecs
+
+from lazy import lazy_import
+
+# Parser libraries are imported on the first upload of their file type
+PyPDF2 = lazy_import('PyPDF2')
+docx = lazy_import('docx')
+docx_ns = lazy_import('docx.oxml.ns')
+docx_paragraph = lazy_import('docx.text.paragraph')
+
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 200000
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def load_parsers():
+    """Import the PDF and DOCX libraries now instead of on the first upload"""
+    for module in (PyPDF2, docx, docx_ns, docx_paragraph):
+        module.load()
+
+
+def iter_pdf_text(stream, max_pages=DEFAULT_MAX_PAGES):
+    """Text of each PDF page, up to `max_pages` pages"""
+    reader = PyPDF2.PdfReader(stream)
+    for index in range(min(len(reader.pages), max_pages)):
+        yield reader.pages[index].extract_text() or ''
+
+
+def iter_docx_text(stream):
+    """Text of each top-level DOCX paragraph, wrapped one at a time"""
+    document = docx.Document(stream)
+    for element in document.element.body.iterchildren(docx_ns.qn('w:p')):
+        yield docx_paragraph.Paragraph(element, document).text
+
+
+def iter_txt_text(stream, encoding='utf-8'):
+    """Decoded text of a plain-text stream, one read chunk at a time"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def join_text(chunks, max_chars=DEFAULT_MAX_CHARS, separator=''):
+    """
+    Join text chunks once, stopping after `max_chars` characters.
+    Chunks past the cap are never produced, so later pages are not parsed.
+    """
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if size + len(chunk) >= max_chars:
+            parts.append(chunk[:max(max_chars - size, 0)])
+            break
+        parts.append(chunk)
+        size += len(chunk) + len(separator)
+    if hasattr(chunks, 'close'):
+        chunks.close()
+    return separator.join(parts)
+
@@ -0,0 +1,222 @@
+"""
+Match Filters
+Hard constraints on the profiles a match query may return (work mode,
+location, availability, minimum stipend, deadline), checked before any
+scoring. Each index side keeps the attributes as columns, with per-value
+posting lists for the categorical ones and float arrays for the numeric
+ones, so a query intersects the shortest postings first and only the
+surviving rows are scored.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from storage import location_key, parse_stipend, text_key
+
+
+# Filter name -> key function, per side being filtered (exact, case-insensitive;
+# location compares the city, as in the profile listing filters)
+CATEGORICAL_FILTERS = {
+    'candidate': {
+        'workMode': text_key,
+        'location': location_key,
+        'availability': text_key
+    },
+    'internship': {
+        'workMode': text_key,
+        'location': location_key
+    }
+}
+# Numeric columns and the profile -> value functions filling them
+NUMERIC_COLUMNS = {
+    'candidate': {},
+    'internship': {
+        'stipend': lambda p: parse_stipend(p.get('stipend')),
+        'deadline': lambda p: parse_deadline(p.get('deadline'), p.get('createdAt'))
+    }
+}
+RANGE_FILTERS = {'candidate': (), 'internship': ('stipendMin', 'openOnly', 'deadlineAfter')}
+# Accepted spellings of a boolean filter value
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+# Profile fields read by the filters above, so a trimmed copy of a profile filters the same
+FILTER_FIELDS = {
+    'candidate': ('workMode', 'location', 'availability'),
+    'internship': ('workMode', 'location', 'stipend', 'deadline', 'createdAt')
+}
+
+DEADLINE_PATTERN = re.compile(r'(\d+)\s*(day|week|month)s?', re.IGNORECASE)
+DEADLINE_UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+
+def parse_deadline(deadline, created_at=None):
+    """
+    Deadline as a date ordinal: ISO dates as given, relative ones
+    ("30 days") counted from the profile's createdAt; None if unknown
+    """
+    if not deadline:
+        return None
+    try:
+        return date.fromisoformat(str(deadline)[:10]).toordinal()
+    except ValueError:
+        pass
+    match = DEADLINE_PATTERN.search(str(deadline))
+    if not match or not created_at:
+        return None
+    try:
+        start = datetime.fromisoformat(str(created_at)).date()
+    except ValueError:
+        return None
+    days = int(match.group(1)) * DEADLINE_UNIT_DAYS[match.group(2).lower()]
+    return (start + timedelta(days=days)).toordinal()
+
+
+def parse_bool(value, name):
+    """A real boolean or "true"/"false"/"1"/"0"; ValueError for anything else"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in BOOLEAN_VALUES:
+        return BOOLEAN_VALUES[value.strip().lower()]
+    raise ValueError(f"{name} must be a boolean")
+
+
+def filter_record(profile, user_type):
+    """Copy of `profile` holding only the fields the filters read"""
+    return {field: profile.get(field) for field in FILTER_FIELDS[user_type]}
+
+
+class MatchFilter:
+    """Parsed hard constraints on the profiles of one side (`user_type`)"""
+
+    def __init__(self, user_type, equals=None, stipend_min=None, deadline_after=None):
+        self.user_type = user_type
+        self.equals = equals or {}              # Filter name -> key
+        self.stipend_min = stipend_min
+        self.deadline_after = deadline_after    # Date ordinal; unknown deadlines pass
+
+    @classmethod
+    def parse(cls, user_type, values, today=None):
+        """
+        Filter from request values, e.g. {"workMode": "Remote", "stipendMin": 20000,
+        "openOnly": true}; None when nothing is constrained.
+        Raises ValueError for unknown or malformed filters.
+        """
+        if not values:
+            return None
+        if not isinstance(values, dict):
+            raise ValueError("filters must be an object")
+        values = {name: value for name, value in values.items() if value not in (None, '', False)}
+        allowed = set(CATEGORICAL_FILTERS[user_type]) | set(RANGE_FILTERS[user_type])
+        unknown = sorted(set(values) - allowed)
+        if unknown:
+            raise ValueError(f"Unsupported filters for {user_type}s: {', '.join(unknown)}")
+
+        equals = {name: key_fn(values[name]) for name, key_fn in CATEGORICAL_FILTERS[user_type].items()
+                  if name in values}
+        stipend_min = None
+        if 'stipendMin' in values:
+            try:
+                stipend_min = int(values['stipendMin'])
+            except (TypeError, ValueError):
+                raise ValueError("stipendMin must be a number")
+        deadline_after = None
+        if 'openOnly' in values and parse_bool(values['openOnly'], 'openOnly'):
+            deadline_after = (today or date.today()).toordinal()
+        if 'deadlineAfter' in values:
+            try:
+                after = date.fromisoformat(str(values['deadlineAfter'])).toordinal()
+            except ValueError:
+                raise ValueError("deadlineAfter must be a date (YYYY-MM-DD)")
+            deadline_after = max(deadline_after or after, after)
+
+        if not equals and stipend_min is None and deadline_after is None:
+            return None
+        return cls(user_type, equals, stipend_min, deadline_after)
+
+    def key(self):
+        """Hashable form, for cache keys"""
+        return (self.user_type, tuple(sorted(self.equals.items())), self.stipend_min, self.deadline_after)
+
+    def minimums(self):
+        """(numeric column, lowest allowed value, whether unknown values pass)"""
+        if self.stipend_min is not None:
+            yield 'stipend', self.stipend_min, False
+        if self.deadline_after is not None:
+            yield 'deadline', self.deadline_after, True
+
+    def matches(self, profile):
+        """Whether one profile passes (for profile lists that are not indexed)"""
+        for name, key in self.equals.items():
+            if CATEGORICAL_FILTERS[self.user_type][name](profile.get(name)) != key:
+                return False
+        for column, low, unknown_passes in self.minimums():
+            value = NUMERIC_COLUMNS[self.user_type][column](profile)
+            if value is None:
+                if not unknown_passes:
+                    return False
+            elif value < low:
+                return False
+        return True
+
+
+class AttributeColumns:
+    """Filterable attributes of one index side, row-aligned with its source list"""
+
+    def __init__(self, user_type):
+        self.user_type = user_type
+        self.postings = {name: {} for name in CATEGORICAL_FILTERS[user_type]}   # Name -> key -> rows
+        self.values = {name: [] for name in NUMERIC_COLUMNS[user_type]}
+        self.count = 0
+        self._arrays = {}       # Cached numpy copies of postings / numeric columns
+
+    def __len__(self):
+        return self.count
+
+    def add_profiles(self, profiles):
+        """Add profiles appended after the ones already held"""
+        for profile in profiles:
+            for name, key_fn in CATEGORICAL_FILTERS[self.user_type].items():
+                key = key_fn(profile.get(name))
+                if key is not None:
+                    self.postings[name].setdefault(key, []).append(self.count)
+            for name, value_fn in NUMERIC_COLUMNS[self.user_type].items():
+                value = value_fn(profile)
+                self.values[name].append(np.nan if value is None else float(value))
+            self.count += 1
+
+    def _array(self, cache_key, values, dtype):
+        array = self._arrays.get(cache_key)
+        if array is None or len(array) < len(values):
+            array = self._arrays[cache_key] = np.array(values, dtype=dtype)
+        return array
+
+    def posting(self, name, key):
+        if key not in self.postings[name]:
+            return np.empty(0, dtype=np.intp)
+        return self._array((name, key), self.postings[name][key], np.intp)
+
+    def column(self, name):
+        return self._array(name, self.values[name], np.float64)
+
+    def rows(self, match_filter, n_rows=None):
+        """
+        Ascending rows below `n_rows` that pass `match_filter`. Equality
+        filters intersect postings (shortest first); numeric minimums are
+        then checked on the surviving rows only.
+        """
+        n_rows = self.count if n_rows is None else min(n_rows, self.count)
+        rows = None
+        for posting in sorted((self.posting(name, key) for name, key in match_filter.equals.items()), key=len):
+            rows = posting if rows is None else np.intersect1d(rows, posting, assume_unique=True)
+        if rows is not None:
+            rows = rows[rows < n_rows]
+
+        for name, low, unknown_passes in match_filter.minimums():
+            values = self.column(name)[:n_rows] if rows is None else self.column(name)[rows]
+            keep = values >= low
+            if unknown_passes:
+                keep |= np.isnan(values)
+            rows = np.flatnonzero(keep) if rows is None else rows[keep]
+
+        return np.arange(n_rows) if rows is None else rows
@@ -0,0 +1,245 @@
+"""
+Bulk Ingest
+Incremental parsers for JSON arrays, NDJSON and CSV uploads, plus the
+per-row validation and record shaping shared with the single-record save
+endpoints. Rows are yielded one at a time so an import of any size is
+inserted batch by batch without holding the whole upload in memory.
+"""
+
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+
+
+READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_INGEST_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+# Longest single JSON array element buffered before the upload is rejected
+MAX_JSON_ELEMENT_CHARS = 1024 * 1024
+# Longest literal the decoder can fail inside without seeing its end ("false", "\uXXXX", "1.5e-3")
+MAX_JSON_TOKEN_CHARS = 32
+
+FORMATS = ('json', 'ndjson', 'csv')
+CONTENT_TYPES = {
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv'
+}
+EXTENSIONS = {'.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv'}
+
+# Fields copied from a submitted record, with the default for missing ones
+CANDIDATE_FIELDS = {
+    'name': None, 'email': None, 'phone': None, 'education': None, 'institution': None,
+    'graduationYear': None, 'skills': None, 'experience': None, 'interests': None,
+    'availability': None, 'workMode': None, 'certifications': '', 'portfolio': '', 'linkedin': '',
+    'github': '', 'resumeScore': 0
+}
+INTERNSHIP_FIELDS = {
+    'title': None, 'company': None, 'location': None, 'department': None, 'duration': None,
+    'stipend': None, 'workMode': None, 'description': None, 'requiredSkills': None,
+    'requirements': None, 'benefits': '', 'deadline': None, 'interviewProcess': '', 'mentorship': ''
+}
+# Comma-separated fields stored as lists
+LIST_FIELDS = {'candidate': 'certifications', 'internship': 'benefits'}
+# Fields a bulk row must have for the profile to be matchable
+REQUIRED_FIELDS = {
+    'candidate': ('name', 'skills'),
+    'internship': ('title', 'company', 'requiredSkills')
+}
+
+
+class RowError(ValueError):
+    """A single row that cannot be imported; the rest of the upload continues"""
+
+
+def detect_format(requested=None, content_type=None, filename=None):
+    """Upload format from an explicit name, the file extension or the content type"""
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        return requested
+    if filename:
+        for extension, name in EXTENSIONS.items():
+            if filename.lower().endswith(extension):
+                return name
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    if media_type in CONTENT_TYPES:
+        return CONTENT_TYPES[media_type]
+    raise ValueError("Unknown upload format; pass format=json|ndjson|csv")
+
+
+def iter_text(stream, chunk_size=READ_CHUNK_SIZE):
+    """Decode a binary stream as UTF-8 (BOM tolerated) chunk by chunk"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        yield decoder.decode(data)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_json_array(stream, max_element_chars=MAX_JSON_ELEMENT_CHARS):
+    """
+    Objects of a top-level JSON array, decoded one element at a time.
+    Malformed JSON raises ValueError (nothing after it can be trusted), as
+    does an element longer than `max_element_chars`, so a bad upload is
+    never buffered whole.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter_text(stream)
+    buffer, pos, eof = '', 0, False
+    expect = '['           # '[', then 'value' or ']', then ',' or ']' after each element
+
+    def fill():
+        nonlocal buffer, pos, eof
+        if len(buffer) - pos > max_element_chars:
+            raise ValueError(f"JSON array element longer than {max_element_chars} characters")
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+        else:
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            fill()
+            continue
+
+        char = buffer[pos]
+        if expect == '[':
+            if char != '[':
+                raise ValueError("Expected a JSON array")
+            expect = 'value or ]'
+            pos += 1
+        elif char == ']' and expect != 'value':
+            return
+        elif expect == ', or ]':
+            if char != ',':
+                raise ValueError("Invalid JSON: expected ',' or ']' between array elements")
+            expect = 'value'
+            pos += 1
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Only an element cut off by the end of the chunk can be fixed by reading more
+                if eof or not _maybe_truncated(e, len(buffer)):
+                    raise ValueError(f"Invalid JSON: {e.msg}")
+                fill()
+                continue
+            if len(buffer) - end < MAX_JSON_TOKEN_CHARS and not eof:
+                # A number near the end of the buffer may continue in the next chunk
+                fill()
+                continue
+            pos = end
+            expect = ', or ]'
+            yield value
+
+
+def _maybe_truncated(error, length):
+    """True if a decode error could be the element running past the end of the buffer"""
+    # Strings report their opening quote; any other error within a token's length of the end
+    return error.msg.startswith('Unterminated string') or length - error.pos <= MAX_JSON_TOKEN_CHARS
+
+
+def iter_ndjson(stream):
+    """One value per non-empty line; a bad line becomes a RowError for that row only"""
+    for line in io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield RowError(f"Invalid JSON: {e.msg}")
+
+
+def iter_csv(stream):
+    """Rows of a CSV file with a header line, as dicts (empty cells dropped)"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    try:
+        for row in reader:
+            if None in row:
+                yield RowError("More cells than header columns")
+                continue
+            yield {key: value for key, value in row.items() if key and value not in (None, '')}
+    except csv.Error as e:
+        raise ValueError(f"Invalid CSV: {str(e)}")
+
+
+PARSERS = {'json': iter_json_array, 'ndjson': iter_ndjson, 'csv': iter_csv}
+
+
+def iter_records(stream, fmt):
+    """Parsed rows of an upload; bad rows are yielded as RowError instances"""
+    return PARSERS[fmt](stream)
+
+
+def _split_list(value):
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return value.split(',') if value else []
+
+
+def build_profile(user_type, data):
+    """Stored record for a submitted candidate or internship (same shape as the save endpoints)"""
+    fields = CANDIDATE_FIELDS if user_type == 'candidate' else INTERNSHIP_FIELDS
+    profile = {field: data.get(field, default) for field, default in fields.items()}
+    list_field = LIST_FIELDS[user_type]
+    profile[list_field] = _split_list(profile[list_field])
+    profile['createdAt'] = datetime.now().isoformat()
+    return profile
+
+
+def validate_row(user_type, row):
+    """Validated stored record for one bulk row; raises RowError"""
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError("Row must be an object")
+
+    for field, value in row.items():
+        if isinstance(value, (dict, bool)) or (isinstance(value, list) and field != LIST_FIELDS[user_type]):
+            raise RowError(f"Invalid value for {field}")
+    missing = [field for field in REQUIRED_FIELDS[user_type] if not str(row.get(field) or '').strip()]
+    if missing:
+        raise RowError(f"Missing required fields: {', '.join(missing)}")
+
+    score = row.get('resumeScore')
+    if user_type == 'candidate' and isinstance(score, str):
+        # CSV cells are always strings
+        try:
+            row = {**row, 'resumeScore': int(score) if score.strip().isdigit() else float(score)}
+        except ValueError:
+            raise RowError("resumeScore must be a number")
+    return build_profile(user_type, row)
+
+
+def iter_batches(user_type, rows, batch_size=DEFAULT_INGEST_BATCH_SIZE):
+    """
+    Yield (valid profiles, [(row number, message)]) per batch of up to
+    `batch_size` rows. Row numbers are 1-based positions in the upload.
+    """
+    batch, errors = [], []
+    for number, row in enumerate(rows, 1):
+        try:
+            batch.append(validate_row(user_type, row))
+        except RowError as e:
+            errors.append((number, str(e)))
+        if len(batch) + len(errors) >= batch_size:
+            yield batch, errors
+            batch, errors = [], []
+    if batch or errors:
+        yield batch, errors
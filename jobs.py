@@ -0,0 +1,205 @@
+"""
+Background Jobs
+In-process job queue for slow work (e.g. resume parsing). Jobs run on a
+process pool through a small set of dispatcher threads, with a bounded
+queue for backpressure and a per-job timeout.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_MAX_DEPTH = 100
+DEFAULT_JOB_TIMEOUT = 60        # Seconds a job may run before it is marked timed out
+DEFAULT_JOB_TTL = 3600          # Seconds finished jobs stay queryable
+DEFAULT_JOB_ATTEMPTS = 2        # Attempts per job when the pool breaks under it
+
+
+def pool_context():
+    """
+    Start method for worker processes. Fork shares the parent's memory
+    copy-on-write but is only safe from a single-threaded process (the
+    command line); from the threaded server, forkserver (spawn where that
+    is missing) starts workers that inherit none of its threads or locks.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class QueueFull(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+class Job:
+    """One unit of background work and its current state"""
+
+    def __init__(self, fn, args, kind, on_done=None):
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.args = args
+        self.kind = kind
+        self.on_done = on_done
+        self.status = 'queued'      # queued -> running -> done | failed | timeout
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed', 'timeout')
+
+    def to_dict(self):
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at
+        }
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue.
+
+    `get_pool` returns the executor jobs run on; dispatcher threads pull
+    jobs off the queue, submit them to the pool and wait up to `timeout`
+    seconds for each. A running task cannot be cancelled, so on a timeout
+    or a broken pool `reset_pool(pool)` replaces the pool (terminating its
+    workers); jobs that were only caught in a broken pool are retried.
+    Submitting to a full queue raises QueueFull.
+    """
+
+    def __init__(self, get_pool, workers=DEFAULT_JOB_WORKERS, max_depth=DEFAULT_MAX_DEPTH,
+                 timeout=DEFAULT_JOB_TIMEOUT, ttl=DEFAULT_JOB_TTL, reset_pool=None,
+                 attempts=DEFAULT_JOB_ATTEMPTS):
+        self.get_pool = get_pool
+        self.reset_pool = reset_pool
+        self.attempts = attempts
+        self.workers = workers
+        self.timeout = timeout
+        self.ttl = ttl
+        self.queue = queue.Queue(maxsize=max_depth)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self._threads = []
+
+    def _start(self):
+        with self.lock:
+            if self._threads:
+                return
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self._dispatch, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, fn, *args, kind='job', on_done=None):
+        """
+        Queue `fn(*args)` to run on the pool; returns the Job.
+        `on_done(result)`, if given, runs in this process and its return
+        value becomes the job's result.
+        """
+        self._start()
+        self._purge()
+        job = Job(fn, args, kind, on_done)
+        with self.lock:
+            self.jobs[job.id] = job
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job.id]
+            raise QueueFull(f"Job queue is full ({self.queue.maxsize} jobs waiting)")
+        return job
+
+    def completed(self, result, kind='job'):
+        """Register a job whose result is already known (e.g. served from a cache)"""
+        self._purge()
+        job = Job(None, (), kind)
+        job.status = 'done'
+        job.progress = 1.0
+        job.result = result
+        job.started_at = job.finished_at = job.created_at
+        with self.lock:
+            self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def _purge(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job.finished and job.finished_at < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
+
+    def _dispatch(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self._run(job)
+            finally:
+                self.queue.task_done()
+
+    def _run(self, job):
+        job.status = 'running'
+        job.progress = 0.1
+        job.started_at = time.time()
+        for attempt in range(1, self.attempts + 1):
+            pool = self.get_pool()
+            try:
+                try:
+                    future = pool.submit(job.fn, *job.args)
+                except RuntimeError as e:
+                    # Shut down by a concurrent reset between get_pool and submit
+                    raise BrokenProcessPool(str(e))
+                result = future.result(timeout=self.timeout)
+                job.result = job.on_done(result) if job.on_done else result
+                job.status = 'done'
+            except FutureTimeoutError:
+                # The stuck worker keeps running until its pool is torn down
+                self._reset(pool)
+                job.status = 'timeout'
+                job.error = f"Job exceeded {self.timeout}s"
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed parsing a bad file); later jobs need a fresh pool
+                self._reset(pool)
+                if attempt < self.attempts:
+                    continue
+                job.status = 'failed'
+                job.error = str(e) or e.__class__.__name__
+            except Exception as e:
+                job.status = 'failed'
+                job.error = str(e) or e.__class__.__name__
+            break
+        job.progress = 1.0
+        job.finished_at = time.time()
+        # Payloads can be large (raw uploads); drop them once the job is over
+        job.args = ()
+        job.on_done = None
+
+    def _reset(self, pool):
+        if self.reset_pool is not None:
+            self.reset_pool(pool)
@@ -0,0 +1,115 @@
+"""
+Keyword Extraction
+Matches every keyword of a taxonomy in a single pass over the text using
+one compiled regex built from a trie of the keywords, with word
+boundaries so "go" does not match inside "good" and "b.com" in an email
+address is not read as a B.Com degree.
+"""
+
+import re
+
+from skills import load_taxonomy, normalize_skill
+
+
+# A keyword only matches when it is not glued to other word characters, nor
+# part of an email address or dotted host name ("jo@b.com", "www.python.org")
+_LEFT_BOUNDARY = r'(?<![\w@])(?<!\w\.)'
+_RIGHT_BOUNDARY = r'(?![\w@])(?!\.\w)'
+
+
+def _trie_pattern(phrases):
+    """
+    Regex alternation for `phrases` with shared prefixes factored out.
+    Matching cost per text position depends on keyword length, not on how
+    many keywords there are. Longer keywords are tried first so
+    "node.js" wins over "node".
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def render(node):
+        branches = []
+        for ch in sorted(k for k in node if k):
+            token = r'\s+' if ch == ' ' else re.escape(ch)
+            branches.append(token + render(node[ch]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Greedy optional: try the longer keyword, fall back to the shorter one
+            return '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds every occurrence of a set of keywords (and aliases) in one scan
+
+    >>> matcher = KeywordMatcher({'B.Com': 'B.COM', 'bcom': 'B.COM', 'Python': 'Python'})
+    >>> matcher.find_unique('Mail jo@b.com, jo.python@bcom.in or see www.python.org')
+    []
+    >>> matcher.find_unique('B.Com (2023). Skills: Python.')
+    ['B.COM', 'Python']
+    """
+
+    def __init__(self, keywords):
+        # Normalized keyword or alias -> value reported for a match
+        self.values = {}
+        for phrase, value in keywords.items():
+            key = normalize_skill(phrase)
+            if key:
+                self.values.setdefault(key, value)
+
+        if self.values:
+            pattern = _LEFT_BOUNDARY + '(?:' + _trie_pattern(self.values) + ')' + _RIGHT_BOUNDARY
+        else:
+            pattern = r'(?!)'
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+
+    def __len__(self):
+        return len(self.values)
+
+    def finditer(self, text):
+        """Yield (value, start, end) for every keyword occurrence in `text`"""
+        for match in self.pattern.finditer(text):
+            value = self.values.get(normalize_skill(match.group(0)))
+            if value is not None:
+                yield value, match.start(), match.end()
+
+    def find_unique(self, text):
+        """Distinct values found in `text`, in order of first occurrence"""
+        return list(dict.fromkeys(value for value, _, _ in self.finditer(text)))
+
+
+def skill_keywords(taxonomy):
+    """Keyword -> display name for every extractable skill and alias"""
+    keywords = {}
+    for entry in taxonomy.get('skills', []):
+        if not entry.get('extract', True):
+            continue
+        keywords[entry['name']] = entry['name']
+        for alias in entry.get('aliases', []):
+            keywords[alias] = entry['name']
+    return keywords
+
+
+def education_keywords(taxonomy):
+    """Keyword -> upper-cased qualification for every education entry and alias"""
+    keywords = {}
+    for entry in taxonomy.get('education', []):
+        keywords[entry['name']] = entry['name'].upper()
+        for alias in entry.get('aliases', []):
+            keywords[alias] = entry['name'].upper()
+    return keywords
+
+
+def build_matchers(taxonomy=None):
+    """(skill_matcher, education_matcher) for a taxonomy (default: the bundled file)"""
+    taxonomy = taxonomy if taxonomy is not None else load_taxonomy()
+    return KeywordMatcher(skill_keywords(taxonomy)), KeywordMatcher(education_keywords(taxonomy))
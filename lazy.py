@@ -0,0 +1,68 @@
+"""
+Lazy Imports
+Heavy dependencies (scikit-learn, PyPDF2, python-docx) are bound to a
+stand-in at import time and only imported on first attribute access, so a
+worker that never matches or parses a resume never pays for them.
+"""
+
+import importlib
+import threading
+import time
+
+
+class LazyModule:
+    """Stand-in for module `name`; the first attribute access imports it"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+        self.load_seconds = None
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        """Import the module now (a no-op once loaded) and return it"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    self.load_seconds = time.perf_counter() - start
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        value = getattr(self.load(), attr)
+        # Cache on the stand-in so later lookups skip __getattr__ entirely
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'{' (loaded)' if self.loaded else ''}>"
+
+
+_modules = {}
+
+
+def lazy_import(name):
+    """Shared stand-in for module `name`"""
+    if name not in _modules:
+        _modules[name] = LazyModule(name)
+    return _modules[name]
+
+
+def preload():
+    """Import every lazily bound module; returns {name: seconds it took}"""
+    timings = {}
+    for name, module in list(_modules.items()):
+        module.load()
+        timings[name] = round(module.load_seconds, 3)
+    return timings
+
+
+def status():
+    """{name: loaded} for every lazily bound module"""
+    return {name: module.loaded for name, module in _modules.items()}
@@ -0,0 +1,574 @@
+"""
+Matching Index
+Keeps a pre-fitted TF-IDF model over the stored internships and candidates
+so match queries only have to vectorize the incoming profile.
+"""
+
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from filters import AttributeColumns
+from lazy import lazy_import
+from skills import SKILL_ID_DTYPE, SkillIndex, default_dictionary
+
+
+# scikit-learn takes most of the app's import time; load it on the first fit
+sklearn_text = lazy_import('sklearn.feature_extraction.text')
+sklearn_pairwise = lazy_import('sklearn.metrics.pairwise')
+
+# Fraction of rows added since the last fit that triggers a background IDF refit
+DEFAULT_REFIT_THRESHOLD = 0.25
+
+# Hybrid score weights (out of 100)
+TFIDF_WEIGHT = 60
+SKILL_WEIGHT = 40
+
+# Seconds between checks for a newer published snapshot
+SNAPSHOT_CHECK_INTERVAL = 5.0
+
+# Times load_snapshot re-reads CURRENT when the version it named was pruned meanwhile
+SNAPSHOT_LOAD_ATTEMPTS = 2
+
+# Upper bound on candidate x internship cells scored in one block
+MAX_BLOCK_CELLS = 2 ** 22
+
+# Profile field holding the comma-separated skill list for each side
+SKILL_FIELDS = {
+    'candidate': 'skills',
+    'internship': 'requiredSkills'
+}
+
+
+def build_vectorizer():
+    """Create the TF-IDF vectorizer shared by every matching path"""
+    return sklearn_text.TfidfVectorizer(
+        max_features=500,
+        ngram_range=(1, 2),
+        stop_words='english'
+    )
+
+
+def skill_matrix(skill_ids, n_skills):
+    """Binary CSR matrix with one row per skill ID array"""
+    indptr = np.zeros(len(skill_ids) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ids) for ids in skill_ids])
+    indices = np.concatenate(skill_ids) if skill_ids else np.empty(0, dtype=SKILL_ID_DTYPE)
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(skill_ids), n_skills))
+
+
+class RowBlocks:
+    """
+    CSR blocks read as one matrix without copying them together, so a
+    memory-mapped snapshot base stays shared while rows saved since live in
+    a private tail block. Row slices and row selections return plain CSR
+    matrices holding only the rows asked for.
+    """
+
+    def __init__(self, blocks, n_features):
+        self.blocks = blocks
+        self.offsets = np.cumsum([0] + [block.shape[0] for block in blocks])
+        self.shape = (int(self.offsets[-1]), n_features)
+
+    def _stack(self, parts):
+        parts = [part for part in parts if part.shape[0]]
+        if not parts:
+            return sparse.csr_matrix((0, self.shape[1]))
+        return parts[0] if len(parts) == 1 else sparse.vstack(parts, format='csr')
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(self.shape[0])
+            return self._stack([block[max(start - offset, 0):max(min(stop - offset, block.shape[0]), 0)]
+                                for block, offset in zip(self.blocks, self.offsets)])
+        rows = np.asarray(key, dtype=np.intp)
+        order = np.argsort(rows, kind='stable')
+        ordered = rows[order]
+        bounds = np.searchsorted(ordered, self.offsets)
+        stacked = self._stack([block[ordered[bounds[i]:bounds[i + 1]] - self.offsets[i]]
+                               for i, block in enumerate(self.blocks)])
+        return stacked if np.all(order[:-1] < order[1:]) else stacked[np.argsort(order)]
+
+    def tocsr(self):
+        return self._stack(self.blocks)
+
+
+class PairSide:
+    """Everything the scorer needs about one side of a batch of pairs"""
+
+    def __init__(self, vectors, skill_ids, skill_counts, version=None):
+        self.vectors = vectors              # TF-IDF rows (CSR)
+        self.skill_ids = skill_ids          # Row -> sorted skill ID array
+        self.skill_counts = np.asarray(skill_counts, dtype=np.float64)
+        self.has_skills = self.skill_counts > 0
+        self.version = version              # Index version the vectors came from
+
+    @classmethod
+    def from_profiles(cls, profiles, user_type, vectors, dictionary, grow=True):
+        field = SKILL_FIELDS[user_type]
+        lookups = [dictionary.lookup(p.get(field, ''), grow) for p in profiles]
+        return cls(vectors, [ids for ids, _ in lookups], [count for _, count in lookups])
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def skill_matrix(self, n_skills):
+        return skill_matrix(self.skill_ids, n_skills)
+
+    def slice(self, start, stop):
+        return PairSide(self.vectors[start:stop], self.skill_ids[start:stop],
+                        self.skill_counts[start:stop], self.version)
+
+    def take(self, rows):
+        """Subset of this side restricted to the given row indices"""
+        return PairSide(self.vectors[rows], [self.skill_ids[r] for r in rows],
+                        self.skill_counts[rows], self.version)
+
+
+def score_block(candidates, internships, overlap=None):
+    """
+    Hybrid scores for every candidate x internship pair in one block.
+    `overlap` (shared skill counts) is computed from the skill IDs unless
+    the caller already has it from the posting lists.
+    Returns (total, tfidf, skill) arrays shaped (n_candidates, n_internships).
+    """
+    # TF-IDF Cosine Similarity (60%) as one sparse matrix product
+    tfidf_scores = sklearn_pairwise.cosine_similarity(candidates.vectors, internships.vectors) * TFIDF_WEIGHT
+
+    # Direct Skill Match (40%): shared skills over required skills
+    if overlap is None:
+        n_skills = 1 + max([int(ids[-1]) for ids in candidates.skill_ids + internships.skill_ids if len(ids)],
+                           default=0)
+        overlap = (candidates.skill_matrix(n_skills) @ internships.skill_matrix(n_skills).T).toarray()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skill_match = (overlap / internships.skill_counts[np.newaxis, :]) * 100
+    skill_scores = (skill_match / 100) * SKILL_WEIGHT
+    valid = candidates.has_skills[:, np.newaxis] & internships.has_skills[np.newaxis, :]
+    skill_scores = np.where(valid, skill_scores, 0.0)
+
+    return tfidf_scores + skill_scores, tfidf_scores, skill_scores
+
+
+def select_top(scores, k, positions=None):
+    """
+    Indices of the k best scores, ordered like a stable sort on the score
+    rounded to 2 decimals (descending), ties broken by `positions`.
+    """
+    if positions is None:
+        positions = np.arange(scores.size)
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if scores.size > k:
+        kth = scores[np.argpartition(scores, -k)[-k:]].min()
+        # Keep anything that could round to the same value as the k-th score
+        keep = np.flatnonzero(scores > kth - 0.01)
+    else:
+        keep = np.arange(scores.size)
+
+    order = np.lexsort((positions[keep], -np.round(scores[keep], 2)))
+    return keep[order[:k]]
+
+
+def rank_pairs(candidates, internships, top_n, overlap=None):
+    """
+    Score all candidate x internship pairs in bounded blocks and return
+    the top N as (candidate_idx, internship_idx, total, tfidf, skill) tuples.
+    `overlap`, if given, is the full (n_candidates, n_internships) skill
+    overlap array.
+    """
+    n_candidates, n_internships = len(candidates), len(internships)
+    if n_candidates == 0 or n_internships == 0:
+        return []
+
+    col_chunk = min(n_internships, MAX_BLOCK_CELLS)
+    row_chunk = max(1, MAX_BLOCK_CELLS // col_chunk)
+
+    kept_positions, kept_scores = [], []
+    for row_start in range(0, n_candidates, row_chunk):
+        row_block = candidates.slice(row_start, row_start + row_chunk)
+        for col_start in range(0, n_internships, col_chunk):
+            col_block = internships.slice(col_start, col_start + col_chunk)
+            block_overlap = None
+            if overlap is not None:
+                block_overlap = overlap[row_start:row_start + row_chunk, col_start:col_start + col_chunk]
+            total, tfidf, skill = score_block(row_block, col_block, block_overlap)
+
+            rows, cols = np.divmod(np.arange(total.size), total.shape[1])
+            positions = (rows + row_start) * n_internships + cols + col_start
+            best = select_top(total.ravel(), top_n, positions)
+            kept_positions.append(positions[best])
+            kept_scores.append(np.stack([total.ravel()[best], tfidf.ravel()[best],
+                                         skill.ravel()[best]], axis=1))
+
+    positions = np.concatenate(kept_positions)
+    scores = np.concatenate(kept_scores)
+    best = select_top(scores[:, 0], top_n, positions)
+
+    results = []
+    for idx in best:
+        i, j = divmod(int(positions[idx]), n_internships)
+        total, tfidf, skill = scores[idx]
+        results.append((i, j, float(total), float(tfidf), float(skill)))
+    return results
+
+
+class IndexSide:
+    """TF-IDF rows and skill postings for one side of the index (candidates or internships)"""
+
+    def __init__(self, rows, user_type, dictionary):
+        self.rows = rows            # Source list, e.g. candidates_db
+        self.user_type = user_type
+        self.count = 0              # Rows vectorized so far
+        self.version = 0            # Bumped whenever rows are added or refitted
+        self.blocks = []            # TF-IDF CSR blocks, compacted lazily on read
+        self.shared = False         # First block is a memory-mapped snapshot, never copied into the rest
+        self.skills = SkillIndex(dictionary, SKILL_FIELDS[user_type])
+        self.attributes = AttributeColumns(user_type)
+
+    def pending_rows(self):
+        """Rows appended to the source list but not yet vectorized"""
+        return self.rows[self.count:]
+
+    def reset(self, count, matrix, shared=False):
+        self.count = count
+        self.blocks = [matrix] if matrix is not None and matrix.shape[0] else []
+        self.shared = shared and bool(self.blocks)
+        self.version += 1
+
+    def append(self, count, matrix):
+        self.count += count
+        self.blocks.append(matrix)
+        self.version += 1
+
+    def add_skills(self, rows):
+        """Index skills for rows not yet in the skill postings"""
+        self.skills.add_profiles(rows)
+
+    def add_attributes(self):
+        """Add filter columns for rows appended to the source list"""
+        self.attributes.add_profiles(self.rows[len(self.attributes):])
+
+    def vectors(self, n_features):
+        """
+        All rows for the scorer: one CSR matrix, or the shared snapshot base
+        plus one private tail block of the rows appended since
+        """
+        if not self.blocks:
+            return sparse.csr_matrix((0, n_features))
+        first = 1 if self.shared else 0
+        if len(self.blocks) - first > 1:
+            self.blocks = self.blocks[:first] + [sparse.vstack(self.blocks[first:], format='csr')]
+        return self.blocks[0] if len(self.blocks) == 1 else RowBlocks(self.blocks, n_features)
+
+    def matrix(self, n_features):
+        """Return all rows as a single CSR matrix (a private copy once a shared base has a tail)"""
+        vectors = self.vectors(n_features)
+        return vectors.tocsr() if isinstance(vectors, RowBlocks) else vectors
+
+    def pair_side(self, n_features):
+        """Snapshot of this side for the scorer"""
+        count = self.count
+        return PairSide(self.vectors(n_features), self.skills.profile_skills[:count],
+                        self.skills.counts()[:count])
+
+
+class MatchIndex:
+    """
+    Pre-fitted TF-IDF index over the stored profiles.
+
+    The vocabulary and IDF weights are fitted once on the whole corpus.
+    Rows saved afterwards are transformed with the existing model and
+    appended, and once the number of rows added since the last fit passes
+    `refit_threshold` (as a fraction of the fitted corpus) the IDF is
+    refitted on a background thread and swapped in atomically.
+
+    With a `snapshot_store`, every fit is published to disk and processes
+    adopt the newest published model (memory-mapped, so workers share one
+    copy) instead of fitting their own.
+    """
+
+    def __init__(self, text_fn, candidates, internships, dictionary=None,
+                 refit_threshold=DEFAULT_REFIT_THRESHOLD, background_refit=True,
+                 snapshot_store=None, snapshot_interval=SNAPSHOT_CHECK_INTERVAL):
+        self.text_fn = text_fn
+        self.candidates = candidates
+        self.internships = internships
+        self.dictionary = dictionary if dictionary is not None else default_dictionary()
+        self.sides = {
+            'candidate': IndexSide(candidates, 'candidate', self.dictionary),
+            'internship': IndexSide(internships, 'internship', self.dictionary)
+        }
+        self.refit_threshold = refit_threshold
+        self.background_refit = background_refit
+        self.vectorizer = None
+        self.version = 0            # Bumped on every (re)fit
+        self.fitted_rows = 0
+        self.rows_since_fit = 0
+        self.lock = threading.RLock()
+        self._refit_thread = None
+        self.refit_listeners = []   # Called after a background refit swaps in the new model
+        self.snapshot_store = snapshot_store
+        self.snapshot_interval = snapshot_interval
+        self.snapshot = None        # Name of the snapshot the current model came from
+        self._checked_at = float('-inf')
+
+    @property
+    def ready(self):
+        return self.vectorizer is not None
+
+    @property
+    def n_features(self):
+        return len(self.vectorizer.vocabulary_) if self.vectorizer is not None else 0
+
+    def covers(self, rows):
+        """True if `rows` is one of the source lists tracked by this index"""
+        return rows is self.candidates or rows is self.internships
+
+    def _texts(self, side, rows):
+        return [self.text_fn(row, side.user_type) for row in rows]
+
+    def _fit_locked(self):
+        """Fit the vectorizer on every stored row (caller holds the lock)"""
+        rows = {name: list(side.rows) for name, side in self.sides.items()}
+        texts = {name: self._texts(self.sides[name], rows[name]) for name in rows}
+        vectorizer, matrices = self._fit(texts)
+        if vectorizer is None:
+            return False
+        self._swap(vectorizer, matrices)
+        return True
+
+    def _fit(self, texts):
+        """Fit a fresh vectorizer; returns (None, None) if the corpus has no vocabulary"""
+        all_texts = texts['candidate'] + texts['internship']
+        if not all_texts:
+            return None, None
+
+        vectorizer = build_vectorizer()
+        try:
+            tfidf_matrix = vectorizer.fit_transform(all_texts)
+        except ValueError as e:
+            # Empty vocabulary, e.g. every profile is blank or only stop words
+            print(f"Error fitting match index: {str(e)}")
+            return None, None
+
+        n_candidates = len(texts['candidate'])
+        return vectorizer, {
+            'candidate': tfidf_matrix[:n_candidates],
+            'internship': tfidf_matrix[n_candidates:]
+        }
+
+    def _swap(self, vectorizer, matrices, snapshot=None, tails=None):
+        for name, side in self.sides.items():
+            side.reset(matrices[name].shape[0], matrices[name].tocsr(), shared=snapshot is not None)
+            if tails and tails.get(name) is not None:
+                side.append(tails[name].shape[0], tails[name])
+        self.vectorizer = vectorizer
+        self.fitted_rows = sum(side.count for side in self.sides.values())
+        self.rows_since_fit = 0
+        self.version += 1
+        self.snapshot = snapshot
+
+    def sync(self):
+        """Vectorize any rows appended to the source lists since the last sync"""
+        self.refresh()
+        fitted = False
+        with self.lock:
+            for side in self.sides.values():
+                side.add_skills(side.rows[len(side.skills):])
+                side.add_attributes()
+
+            if not any(side.pending_rows() for side in self.sides.values()):
+                return self.ready
+
+            if self.vectorizer is None:
+                if not self._fit_locked():
+                    return False
+                fitted = True
+            else:
+                for side in self.sides.values():
+                    rows = side.pending_rows()
+                    if not rows:
+                        continue
+                    side.append(len(rows), self.vectorizer.transform(self._texts(side, rows)))
+                    self.rows_since_fit += len(rows)
+
+        if fitted:
+            self.publish()
+        else:
+            self._maybe_refit()
+        return True
+
+    def drift(self):
+        """Fraction of rows added since the last fit"""
+        if self.fitted_rows == 0:
+            return 0.0 if self.rows_since_fit == 0 else float('inf')
+        return self.rows_since_fit / self.fitted_rows
+
+    def _maybe_refit(self):
+        if self.drift() <= self.refit_threshold:
+            return
+        if not self.background_refit:
+            self.refit()
+            return
+        with self.lock:
+            if self._refit_thread is not None and self._refit_thread.is_alive():
+                return
+            self._refit_thread = threading.Thread(target=self.refit, daemon=True)
+            self._refit_thread.start()
+
+    def refit(self):
+        """Refit the IDF on the current corpus without blocking queries"""
+        with self.lock:
+            counts = {name: side.count for name, side in self.sides.items()}
+        texts = {name: self._texts(side, side.rows[:counts[name]]) for name, side in self.sides.items()}
+
+        vectorizer, matrices = self._fit(texts)
+        if vectorizer is None:
+            return
+
+        with self.lock:
+            # Rows synced while we were fitting are transformed with the new model
+            for name, side in self.sides.items():
+                tail = side.rows[counts[name]:side.count]
+                if tail:
+                    matrices[name] = sparse.vstack(
+                        [matrices[name], vectorizer.transform(self._texts(side, tail))], format='csr'
+                    )
+            self._swap(vectorizer, matrices)
+        for listener in self.refit_listeners:
+            listener()
+        self.publish()
+
+    def publish(self):
+        """Write the current model, matrices and skill arrays to the snapshot store"""
+        if self.snapshot_store is None:
+            return None
+        with self.lock:
+            if not self.ready:
+                return None
+            vectorizer = self.vectorizer
+            sides = {}
+            for name, side in self.sides.items():
+                count = side.count
+                sides[name] = {
+                    'tfidf': side.matrix(self.n_features),
+                    'skill_ids': side.skills.profile_skills[:count],
+                    'skill_counts': side.skills.counts()[:count],
+                    'postings': [rows[rows < count] for rows in side.skills.all_postings()],
+                    'skill_dtype': SKILL_ID_DTYPE,
+                    'last_id': side.rows[count - 1].get('id') if count else None
+                }
+            skill_names = list(self.dictionary.names)
+            version = self.version
+
+        try:
+            name = self.snapshot_store.publish(vectorizer, sides, skill_names)
+        except OSError as e:
+            print(f"Error publishing index snapshot: {str(e)}")
+            return None
+        with self.lock:
+            if self.version == version:
+                self.snapshot = name
+        return name
+
+    def refresh(self):
+        """Adopt a newer published snapshot; the store is checked at most every `snapshot_interval` seconds"""
+        if self.snapshot_store is None:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at < self.snapshot_interval:
+            return False
+        self._checked_at = now
+        return self.load_snapshot()
+
+    def _adopt_skill_names(self, names):
+        """True if every snapshot skill ID means the same skill in our dictionary"""
+        return all(self.dictionary.id_for(name) == skill_id for skill_id, name in enumerate(names))
+
+    def load_snapshot(self):
+        """
+        Swap in the store's current snapshot if it differs from the model in
+        use and was built from the same leading rows as our source lists.
+        Rows past the snapshot are transformed with its model on the next sync.
+        """
+        for _ in range(SNAPSHOT_LOAD_ATTEMPTS):
+            name = self.snapshot_store.current() if self.snapshot_store is not None else None
+            if name is None or name == self.snapshot:
+                return False
+            try:
+                snapshot = self.snapshot_store.open(name)
+                if snapshot is not None:
+                    return self._adopt_snapshot(name, snapshot)
+            except OSError as e:
+                print(f"Error loading index snapshot {name}: {str(e)}")
+            # Pruned after we read CURRENT: by now CURRENT names a newer version
+        return False
+
+    def _adopt_snapshot(self, name, snapshot):
+        with self.lock:
+            loaded = {}
+            for user_type, side in self.sides.items():
+                meta, arrays = snapshot.side(user_type)
+                n = meta['rows']
+                if len(side.rows) < n or (n and side.rows[n - 1].get('id') != meta['lastId']):
+                    # Published from rows we have not loaded yet; try again later
+                    return False
+                loaded[user_type] = (meta, arrays)
+
+            vectorizer = snapshot.vectorizer(build_vectorizer())
+            # Skill postings can only be preloaded into an empty skill index
+            preload_skills = (all(len(side.skills) == 0 for side in self.sides.values()) and
+                              self._adopt_skill_names(snapshot.meta['skillNames']))
+
+            matrices, tails = {}, {}
+            for user_type, side in self.sides.items():
+                meta, arrays = loaded[user_type]
+                if preload_skills:
+                    side.skills.load_arrays(arrays['skill_ids'], arrays['skill_indptr'], arrays['skill_counts'],
+                                            arrays['posting_rows'], arrays['posting_indptr'])
+                matrices[user_type] = arrays['tfidf']
+                # Our rows past the snapshot form a private tail; the mapped base is never copied
+                tail = side.rows[meta['rows']:side.count]
+                if tail:
+                    tails[user_type] = vectorizer.transform(self._texts(side, tail))
+            self._swap(vectorizer, matrices, snapshot=name, tails=tails)
+        return True
+
+    def transform(self, profile, user_type='candidate'):
+        """Vectorize a single incoming profile with the fitted model"""
+        text = self.text_fn(profile, user_type)
+        with self.lock:
+            return self.vectorizer.transform([text])
+
+    def matrix(self, user_type):
+        """Return the stored TF-IDF matrix for one side of the index"""
+        with self.lock:
+            return self.sides[user_type].matrix(self.n_features)
+
+    def query(self, profile, user_type='candidate'):
+        """
+        Vectorize `profile` and return it with a snapshot of the opposite
+        side, both as PairSides built from the same fitted model even if a
+        refit is in flight, plus the per-row skill overlap from the postings.
+        """
+        target = 'internship' if user_type == 'candidate' else 'candidate'
+        text = self.text_fn(profile, user_type)
+        with self.lock:
+            query_side = PairSide.from_profiles(
+                [profile], user_type, self.vectorizer.transform([text]),
+                self.dictionary, grow=False
+            )
+            side = self.sides[target]
+            stored_side = side.pair_side(self.n_features)
+            stored_side.version = self.version
+        overlap = side.skills.overlap(query_side.skill_ids[0], len(stored_side))
+        return query_side, stored_side, overlap
+
+    def skill_index(self, user_type):
+        """Skill postings for one side, kept in step with the source list"""
+        self.sync()
+        return self.sides[user_type].skills
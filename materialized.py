@@ -0,0 +1,231 @@
+"""
+Materialized Matches
+Top-K matches for every stored candidate and internship, kept current as
+profiles are saved: each new row is scored against the other side in one
+vectorized pass and folded into the affected top-K lists, so dashboards
+read precomputed results instead of rescoring the whole corpus.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from matching import MAX_BLOCK_CELLS, score_block
+
+
+DEFAULT_TOP_K = 10
+EMPTY_KEY = np.iinfo(np.int64).min
+
+
+def rank_keys(rows, total):
+    """
+    One int64 per entry ordering like select_top: score rounded to 2
+    decimals (higher first), then row on the other side (lower first).
+    """
+    filled = rows >= 0
+    cents = np.round(np.where(filled, total, 0.0) * 100).astype(np.int64)
+    return np.where(filled, (cents << 32) - rows, EMPTY_KEY)
+
+
+class TopKTable:
+    """Best K matches (row on the other side + scores) for each row of one side"""
+
+    def __init__(self, k):
+        self.k = k
+        self.size = 0
+        self.rows = np.full((0, k), -1, dtype=np.int32)
+        self.total = np.zeros((0, k), dtype=np.float64)
+        self.tfidf = np.zeros((0, k), dtype=np.float32)
+        self.skill = np.zeros((0, k), dtype=np.float32)
+
+    def __len__(self):
+        return self.size
+
+    def grow(self, size):
+        """Make room for `size` rows (new rows start empty)"""
+        if size > len(self.rows):
+            capacity = max(size, 2 * len(self.rows))
+            extra = capacity - len(self.rows)
+            self.rows = np.vstack([self.rows, np.full((extra, self.k), -1, dtype=np.int32)])
+            self.total = np.vstack([self.total, np.zeros((extra, self.k), dtype=np.float64)])
+            self.tfidf = np.vstack([self.tfidf, np.zeros((extra, self.k), dtype=np.float32)])
+            self.skill = np.vstack([self.skill, np.zeros((extra, self.k), dtype=np.float32)])
+        self.size = max(self.size, size)
+
+    def merge(self, start, stop, others, total, tfidf, skill):
+        """
+        Fold scores against the rows `others` (one column each) into the
+        top K of owner rows start..stop.
+        """
+        k = self.k
+        owners = slice(start, stop)
+        merged_rows = np.hstack([self.rows[owners], np.broadcast_to(others, total.shape)])
+        merged = [np.hstack([self.total[owners], total]),
+                  np.hstack([self.tfidf[owners], tfidf]),
+                  np.hstack([self.skill[owners], skill])]
+
+        width = merged_rows.shape[1]
+        if width > k:
+            keep = np.argpartition(rank_keys(merged_rows, merged[0]), width - k, axis=1)[:, width - k:]
+            merged_rows = np.take_along_axis(merged_rows, keep, axis=1)
+            merged = [np.take_along_axis(values, keep, axis=1) for values in merged]
+
+        self.rows[owners] = merged_rows
+        self.total[owners], self.tfidf[owners], self.skill[owners] = merged
+
+    def top(self, row):
+        """(other_row, total, tfidf, skill) tuples for one owner, best first"""
+        rows, total = self.rows[row], self.total[row]
+        order = np.argsort(-rank_keys(rows, total))
+        return [(int(rows[i]), float(total[i]), float(self.tfidf[row][i]), float(self.skill[row][i]))
+                for i in order if rows[i] >= 0]
+
+    def count(self):
+        """Materialized pairs with a non-zero score"""
+        return int((self.total[:self.size] > 0).sum())
+
+
+class MaterializedMatches:
+    """
+    Top-K tables for both sides of a MatchIndex.
+
+    Saves only call `notify()`; a background thread scores the new rows in
+    blocks of at most `max_cells` pairs, yielding between blocks. When the
+    index is refitted every score changes, so the tables are rebuilt the
+    same way in the background while the old ones keep serving reads.
+    """
+
+    def __init__(self, index, k=DEFAULT_TOP_K, max_cells=MAX_BLOCK_CELLS, background=True):
+        self.index = index
+        self.k = k
+        self.max_cells = max_cells
+        self.background = background
+        self.tables = None          # Serving tables: {'candidate': TopKTable, 'internship': TopKTable}
+        self.version = None         # Index version the serving tables were built from
+        self._build = None          # (version, tables, rows materialized per side)
+        self.lock = threading.Lock()            # One maintainer at a time
+        self.table_lock = threading.Lock()      # Short critical sections around table writes/reads
+        self._wake = threading.Event()
+        self._thread = None
+
+    def notify(self):
+        """Schedule maintenance for newly saved rows; returns immediately"""
+        if not self.background:
+            self.catch_up()
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.catch_up()
+            except Exception as e:
+                print(f"Error materializing matches: {str(e)}")
+
+    def _snapshot(self):
+        """Consistent view of both index sides, or None if the index is not fitted"""
+        with self.index.lock:
+            if not self.index.ready:
+                return None
+            n_features = self.index.n_features
+            sides = self.index.sides
+            return (self.index.version,
+                    sides['candidate'].pair_side(n_features), sides['internship'].pair_side(n_features),
+                    sides['candidate'].skills, sides['internship'].skills)
+
+    def catch_up(self):
+        """Materialize every pair not yet covered by the tables"""
+        with self.lock:
+            while True:
+                snapshot = self._snapshot()
+                if snapshot is None:
+                    return
+                version, candidates, internships, candidate_skills, internship_skills = snapshot
+
+                if self._build is None or self._build[0] != version:
+                    # New model (first fit, refit or adopted snapshot): every score
+                    # changes, so build fresh tables while the old ones keep serving
+                    tables = {'candidate': TopKTable(self.k), 'internship': TopKTable(self.k)}
+                    self._build = (version, tables, {'candidate': 0, 'internship': 0})
+                _, tables, done = self._build
+
+                if not self._step(tables, done, candidates, internships, candidate_skills, internship_skills):
+                    if self.version != version:
+                        with self.table_lock:
+                            self.tables, self.version = tables, version
+                    return
+                # Let request threads run between blocks
+                time.sleep(0)
+
+    def _step(self, tables, done, candidates, internships, candidate_skills, internship_skills):
+        """Score one block of unmaterialized pairs; False once fully caught up"""
+        n_candidates, n_internships = len(candidates), len(internships)
+        done_c, done_i = done['candidate'], done['internship']
+
+        if done_c < n_candidates:
+            stop = n_candidates if done_i == 0 else min(n_candidates, done_c + max(1, self.max_cells // done_i))
+            scores = None
+            if done_i:
+                # New candidates against the internships already covered
+                block = candidates.slice(done_c, stop)
+                overlap = np.vstack([internship_skills.overlap(ids, done_i) for ids in block.skill_ids])
+                scores = score_block(block, internships.slice(0, done_i), overlap)
+            self._apply(tables, 'candidate', stop, (done_c, stop, 0, done_i), scores)
+            done['candidate'] = stop
+            return True
+
+        if done_i < n_internships:
+            stop = n_internships if done_c == 0 else min(n_internships, done_i + max(1, self.max_cells // done_c))
+            scores = None
+            if done_c:
+                # New internships against every covered candidate
+                block = internships.slice(done_i, stop)
+                overlap = np.column_stack([candidate_skills.overlap(ids, done_c) for ids in block.skill_ids])
+                scores = score_block(candidates.slice(0, done_c), block, overlap)
+            self._apply(tables, 'internship', stop, (0, done_c, done_i, stop), scores)
+            done['internship'] = stop
+            return True
+
+        return False
+
+    def _apply(self, tables, user_type, size, block, scores):
+        """
+        Grow one table to `size` rows and fold a (candidates x internships)
+        score block into both tables, so new rows only become readable
+        once they are scored.
+        """
+        c_start, c_stop, i_start, i_stop = block
+        with self.table_lock:
+            tables[user_type].grow(size)
+            if scores is None:
+                return
+            total, tfidf, skill = scores
+            tables['candidate'].merge(c_start, c_stop, np.arange(i_start, i_stop), total, tfidf, skill)
+            tables['internship'].merge(i_start, i_stop, np.arange(c_start, c_stop), total.T, tfidf.T, skill.T)
+
+    def top(self, user_type, row):
+        """
+        Materialized matches for one stored row as (other_row, total, tfidf,
+        skill) tuples, best first; None if the row is not covered yet.
+        """
+        with self.table_lock:
+            if self.tables is None or row >= len(self.tables[user_type]):
+                return None
+            return self.tables[user_type].top(row)
+
+    def stats(self):
+        with self.table_lock:
+            if self.tables is None:
+                return {"candidateMatches": 0, "internshipMatches": 0, "k": self.k, "version": None}
+            return {
+                "candidateMatches": self.tables['candidate'].count(),
+                "internshipMatches": self.tables['internship'].count(),
+                "k": self.k,
+                "version": self.version
+            }
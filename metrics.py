@@ -0,0 +1,195 @@
+"""
+Metrics
+In-process counters, gauges and histograms rendered in the Prometheus text
+format. Stage timers wrap the matching and resume-analysis hot paths; when
+metrics are switched off at runtime they cost one attribute check.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+
+# Seconds; covers sub-millisecond stages up to slow full refits
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_NO_OP = nullcontext()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """One metric family, with a value per label combination"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+                                for labels, value in items]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, *labels, value):
+        with self.lock:
+            self.values[labels] = value
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class CallbackGauge(Metric):
+    """Gauge read at scrape time: `fn` returns a number or {label values tuple: number}"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, fn, labels=()):
+        super().__init__(name, help_text, labels)
+        self.fn = fn
+
+    def render(self):
+        try:
+            values = self.fn()
+        except Exception as e:
+            print(f"Error reading metric {self.name}: {str(e)}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return self.header() + [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+                                for labels, value in sorted(values.items()) if value is not None]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                # Per-bucket (non-cumulative) counts + sum; made cumulative when rendered
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def render(self):
+        with self.lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self.values.items())
+        lines = self.header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = _labels(self.label_names, labels, [('le', _number(float(bound)))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class _StageTimer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(*self.labels, value=time.perf_counter() - self.start)
+        return False
+
+
+class Registry:
+    """All metrics of the process; `enabled` can be flipped at runtime"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.metrics = []
+        self.stages = self.histogram('portal_stage_duration_seconds',
+                                     'Time spent in each matching / resume-analysis stage',
+                                     labels=('component', 'stage'))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._add(Gauge(name, help_text, labels))
+
+    def gauge_callback(self, name, help_text, fn, labels=()):
+        return self._add(CallbackGauge(name, help_text, fn, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def stage(self, component, stage):
+        """Context manager timing one stage (a shared no-op while disabled)"""
+        if not self.enabled:
+            return _NO_OP
+        return _StageTimer(self.stages, (component, stage))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry used by the app and the matching code
+registry = Registry()
+
+
+def stage(component, name):
+    return registry.stage(component, name)
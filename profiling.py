@@ -0,0 +1,208 @@
+"""
+Request Profiling
+Opt-in per-request profiles: a statistical sampler (collapsed stacks, ready
+for flamegraph.pl or speedscope) or cProfile (pstats dump). Finished
+profiles are kept in two bounded buffers, the most recent ones and the N
+slowest ones, for download from the admin endpoints.
+"""
+
+import cProfile
+import heapq
+import io
+import itertools
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+
+MODES = ('sample', 'cprofile')
+DEFAULT_SAMPLE_INTERVAL = 0.005     # Seconds between stack samples
+DEFAULT_KEEP = 20                   # Profiles kept in each buffer
+MAX_STACK_DEPTH = 128
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(frame):
+    """Root-first 'a;b;c' stack for one frame"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class SampleRecorder:
+    """Stack counts for one thread, filled in by the Sampler"""
+
+    mode = 'sample'
+
+    def __init__(self, thread_id):
+        self.id = uuid.uuid4().hex[:12]
+        self.thread_id = thread_id
+        self.stacks = Counter()
+
+    def result(self):
+        """Collapsed stacks, one 'stack count' line each"""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+
+class Sampler:
+    """
+    One background thread sampling the stacks of every thread that is being
+    profiled; it only runs while at least one recorder is active.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.active = {}
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        recorder = SampleRecorder(threading.get_ident())
+        with self.lock:
+            self.active[recorder.thread_id] = recorder
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return recorder
+
+    def stop(self, recorder):
+        with self.lock:
+            self.active.pop(recorder.thread_id, None)
+            if not self.active:
+                self._wake.clear()
+        return recorder
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            self._wake.wait()
+            frames = sys._current_frames()
+            with self.lock:
+                recorders = list(self.active.values())
+            for recorder in recorders:
+                frame = frames.get(recorder.thread_id)
+                if frame is not None and recorder.thread_id != own_id:
+                    recorder.stacks[collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+class CProfileRecorder:
+    """Deterministic profile of one request (heavier; for drilling into a known slow path)"""
+
+    mode = 'cprofile'
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.profile.create_stats()
+        return self
+
+    def result(self):
+        """pstats-compatible dump (load with pstats.Stats or snakeviz)"""
+        return marshal.dumps(self.profile.stats)
+
+    def summary(self, limit=40):
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    @property
+    def samples(self):
+        return None
+
+
+class ProfileStore:
+    """The most recent and the slowest finished profiles, both bounded to `keep`"""
+
+    def __init__(self, keep=DEFAULT_KEEP):
+        self.keep = keep
+        self.recent = deque(maxlen=keep)
+        self.slowest = []       # Min-heap of (duration, seq, profile)
+        self._seq = itertools.count()
+        self.lock = threading.Lock()
+
+    def add(self, profile):
+        with self.lock:
+            self.recent.append(profile)
+            entry = (profile['duration'], next(self._seq), profile)
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, entry)
+            elif entry[0] > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def list(self):
+        """Metadata of every kept profile, slowest first"""
+        with self.lock:
+            profiles = {p['id']: p for p in self.recent}
+            profiles.update((p['id'], p) for _, _, p in self.slowest)
+        return sorted((self.describe(p) for p in profiles.values()), key=lambda p: -p['durationMs'])
+
+    def get(self, profile_id):
+        with self.lock:
+            for profile in itertools.chain(self.recent, (p for _, _, p in self.slowest)):
+                if profile['id'] == profile_id:
+                    return profile
+        return None
+
+    def clear(self):
+        with self.lock:
+            self.recent.clear()
+            self.slowest = []
+
+    @staticmethod
+    def describe(profile):
+        """Profile metadata without the recorded data"""
+        info = {key: profile[key] for key in ('id', 'mode', 'method', 'path', 'endpoint', 'status',
+                                              'startedAt', 'samples')}
+        info["durationMs"] = round(profile['duration'] * 1e3, 2)
+        return info
+
+
+class Profiler:
+    """Starts and finishes request profiles; `mode` profiles every request when set"""
+
+    def __init__(self, mode=None, keep=DEFAULT_KEEP, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.mode = mode
+        self.sampler = Sampler(interval)
+        self.store = ProfileStore(keep)
+
+    def start(self, mode):
+        return self.sampler.start() if mode == 'sample' else CProfileRecorder()
+
+    def finish(self, recorder, duration, **info):
+        """Stop a recorder and keep its profile"""
+        if recorder.mode == 'sample':
+            self.sampler.stop(recorder)
+        else:
+            recorder.stop()
+        self.store.add({
+            "id": recorder.id,
+            "mode": recorder.mode,
+            "duration": duration,
+            "samples": recorder.samples,
+            "recorder": recorder,
+            **info
+        })
@@ -0,0 +1,71 @@
+"""
+Response Encoding
+Content negotiation and compression for JSON responses: gzip from the
+standard library, and Brotli when the optional `brotli` package is
+installed.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:     # Optional: only gzip is offered without it
+    brotli = None
+
+
+COMPRESS_MIN_BYTES = 1024       # Smaller bodies are not worth the CPU or the header bytes
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5              # Close to gzip's speed at a better ratio; 11 is far too slow per request
+
+
+def available_encodings():
+    """Encodings this process can produce, preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encodings):
+    """
+    Best encoding the client accepts (a Werkzeug Accept object), or None.
+    Ties in quality go to our preference order.
+    """
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def project(record, fields, extra=None):
+    """
+    Response entry for a stored record: all of it plus `extra`, or only
+    `fields` (looked up in `extra` first) so nothing else is copied.
+    """
+    extra = extra or {}
+    if fields is None:
+        entry = record.copy()
+        entry.update(extra)
+        return entry
+    entry = {}
+    for field in fields:
+        if field in extra:
+            entry[field] = extra[field]
+        elif field in record:
+            entry[field] = record[field]
+    return entry
+
+
+def parse_fields(value):
+    """Field list from 'a,b,c' or ['a', 'b', 'c']; None means all fields"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    fields = [field.strip() for field in value if isinstance(field, str) and field.strip()]
+    return fields or None
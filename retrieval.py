@@ -0,0 +1,114 @@
+"""
+Candidate Retrieval
+Two-stage matching for large candidate pools: a compact index returns a
+shortlist cheaply and only the shortlist is reranked with the exact
+hybrid score.
+"""
+
+import threading
+
+import numpy as np
+
+
+# Defaults for approximate retrieval (overridable per request)
+DEFAULT_SHORTLIST_SIZE = 1000
+MAX_SHORTLIST_SIZE = 100000
+DEFAULT_LSH_TABLES = 8
+DEFAULT_LSH_BITS = 12
+
+
+class RandomProjectionLSH:
+    """
+    Random-projection (SimHash) buckets over TF-IDF vectors.
+    Each table hashes a vector to the sign pattern of `n_bits` random
+    hyperplanes, so vectors with a small angle tend to share a bucket.
+    """
+
+    def __init__(self, n_features, n_tables=DEFAULT_LSH_TABLES, n_bits=DEFAULT_LSH_BITS, seed=42):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_features, n_tables * n_bits))
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.weights = 1 << np.arange(n_bits, dtype=np.int64)
+        self.tables = [{} for _ in range(n_tables)]
+        self.count = 0
+
+    def _codes(self, vectors):
+        bits = np.asarray(vectors @ self.planes) > 0
+        bits = bits.reshape(vectors.shape[0], self.n_tables, self.n_bits)
+        return bits @ self.weights     # (n_rows, n_tables) bucket codes
+
+    def add(self, vectors):
+        """Hash rows appended after the ones already indexed"""
+        codes = self._codes(vectors)
+        for t, table in enumerate(self.tables):
+            for offset, code in enumerate(codes[:, t].tolist()):
+                table.setdefault(code, []).append(self.count + offset)
+        self.count += vectors.shape[0]
+
+    def collisions(self, vector, n_rows):
+        """Per-row count of tables in which the row shares the query's bucket"""
+        votes = np.zeros(n_rows, dtype=np.int32)
+        codes = self._codes(vector)[0]
+        for t, table in enumerate(self.tables):
+            bucket = table.get(int(codes[t]))
+            if bucket:
+                rows = np.asarray(bucket)
+                np.add.at(votes, rows[rows < n_rows], 1)
+        return votes
+
+
+class CandidateRetriever:
+    """
+    Shortlists stored candidates for an internship query.
+
+    Rows are scored by how many of the required skills they share
+    (from the inverted skill postings) plus how many LSH
+    tables put them in the query's bucket; the best `shortlist_size`
+    rows go on to exact scoring.
+    """
+
+    def __init__(self, n_tables=DEFAULT_LSH_TABLES, n_bits=DEFAULT_LSH_BITS):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.lsh = None
+        self.lsh_version = None
+        self.lock = threading.Lock()
+
+    def _refresh(self, stored_side):
+        """Bring the LSH tables up to date with the index"""
+        if self.lsh is None or self.lsh_version != stored_side.version:
+            self.lsh = RandomProjectionLSH(stored_side.vectors.shape[1], self.n_tables, self.n_bits)
+            self.lsh_version = stored_side.version
+        if self.lsh.count < len(stored_side):
+            self.lsh.add(stored_side.vectors[self.lsh.count:])
+
+    def shortlist(self, query_side, stored_side, overlap, shortlist_size=DEFAULT_SHORTLIST_SIZE):
+        """
+        Row indices of the stored side worth scoring exactly.
+        `overlap` is the per-row shared skill count from the skill postings.
+        """
+        n_rows = len(stored_side)
+        if n_rows <= shortlist_size:
+            return np.arange(n_rows)
+
+        with self.lock:
+            self._refresh(stored_side)
+            votes = self.lsh.collisions(query_side.vectors, n_rows).astype(np.float64)
+
+        # Shared skills dominate; LSH collisions break ties and add recall
+        votes += overlap * (self.n_tables + 1)
+
+        candidates = np.flatnonzero(votes)
+        if len(candidates) > shortlist_size:
+            best = np.argpartition(votes[candidates], -shortlist_size)[-shortlist_size:]
+            candidates = np.sort(candidates[best])
+        return candidates
+
+
+def recall_at_k(exact, approximate, k=10):
+    """Fraction of the exact top-k that the approximate top-k also returned"""
+    expected = set(exact[:k])
+    if not expected:
+        return 1.0
+    return len(expected.intersection(approximate[:k])) / len(expected)
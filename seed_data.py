@@ -3,10 +3,18 @@ Sample Data Seeder
 Populates the database with sample internships and candidates for testing
 """
 
-import requests
+import argparse
+import csv
 import json
+import random
+
+try:
+    import requests
+except ImportError:     # Only needed to talk to a running server; the generators work without it
+    requests = None
 
 BASE_URL = "http://localhost:5000/api"
+BULK_CHUNK_SIZE = 5000      # Rows per bulk upload request
 
 # Sample Internships
 sample_internships = [
@@ -166,10 +174,10 @@ sample_candidates = [
     }
 ]
 
-def seed_internships():
+def seed_internships(internships=sample_internships):
     """Seed sample internships"""
     print("🌱 Seeding internships...")
-    for internship in sample_internships:
+    for internship in internships:
         try:
             response = requests.post(f"{BASE_URL}/save-internship", json=internship)
             if response.status_code == 200:
@@ -179,10 +187,10 @@ def seed_internships():
         except Exception as e:
             print(f"❌ Error adding {internship['title']}: {str(e)}")
 
-def seed_candidates():
+def seed_candidates(candidates=sample_candidates):
     """Seed sample candidates"""
     print("\n🌱 Seeding candidates...")
-    for candidate in sample_candidates:
+    for candidate in candidates:
         try:
             response = requests.post(f"{BASE_URL}/save-candidate-profile", json=candidate)
             if response.status_code == 200:
@@ -192,8 +200,131 @@ def seed_candidates():
         except Exception as e:
             print(f"❌ Error adding {candidate['name']}: {str(e)}")
 
+def _values(records, field):
+    """Distinct values of one field across the sample records"""
+    return sorted({record[field] for record in records})
+
+def _skill_pool():
+    skills = set()
+    for internship in sample_internships:
+        skills.update(s.strip() for s in internship['requiredSkills'].split(','))
+    for candidate in sample_candidates:
+        skills.update(s.strip() for s in candidate['skills'].split(','))
+    return sorted(skills)
+
+FIRST_NAMES = ['Rahul', 'Priya', 'Arjun', 'Ananya', 'Vikram', 'Sneha', 'Karthik', 'Divya', 'Aditya', 'Meera']
+LAST_NAMES = ['Sharma', 'Patel', 'Reddy', 'Iyer', 'Singh', 'Nair', 'Gupta', 'Das', 'Rao', 'Menon']
+
+# Free-text vocabularies taken from the sample data
+INTERNSHIP_VALUES = {field: _values(sample_internships, field) for field in (
+    'title', 'company', 'location', 'department', 'duration', 'workMode', 'description', 'requirements'
+)}
+CANDIDATE_VALUES = {field: _values(sample_candidates, field) for field in (
+    'education', 'institution', 'experience', 'interests', 'availability', 'workMode', 'certifications'
+)}
+
+def synthetic_internship(rng, skills, filler=()):
+    """One internship from the sample values; `filler` words pad the description"""
+    internship = {field: rng.choice(values) for field, values in INTERNSHIP_VALUES.items()}
+    required = rng.sample(skills, rng.randint(3, 8))
+    internship['requiredSkills'] = ', '.join(required)
+    if filler:
+        words = list(filler) + required
+        internship['description'] += ' ' + ' '.join(rng.choice(words) for _ in range(rng.randint(10, 40)))
+    internship['stipend'] = f"₹{rng.randint(5, 50) * 1000:,}/month"
+    internship['deadline'] = f"{rng.randint(7, 60)} days"
+    return internship
+
+def synthetic_candidate(rng, skills, filler=()):
+    """One candidate from the sample values; `filler` words pad the experience"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    candidate = {field: rng.choice(values) for field, values in CANDIDATE_VALUES.items()}
+    own = rng.sample(skills, rng.randint(3, 12))
+    candidate.update({
+        "name": name,
+        "email": name.lower().replace(' ', '.') + f"{rng.randint(1, 99999)}@example.com",
+        "graduationYear": str(rng.randint(2024, 2028)),
+        "skills": ', '.join(own),
+        "resumeScore": rng.randint(40, 100)
+    })
+    if filler:
+        words = list(filler) + own
+        candidate['experience'] += ' ' + ' '.join(rng.choice(words) for _ in range(rng.randint(10, 40)))
+    return candidate
+
+def generate_internships(count, seed=42):
+    """`count` synthetic internships built from the sample values (same seed, same data)"""
+    rng = random.Random(seed)
+    skills = _skill_pool()
+    for _ in range(count):
+        yield synthetic_internship(rng, skills)
+
+def generate_candidates(count, seed=42):
+    """`count` synthetic candidates built from the sample values (same seed, same data)"""
+    rng = random.Random(seed)
+    skills = _skill_pool()
+    for _ in range(count):
+        yield synthetic_candidate(rng, skills)
+
+def write_dataset(records, path):
+    """Write records as JSON, NDJSON or CSV depending on the file extension"""
+    records = iter(records)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            first = next(records, None)
+            if first is None:
+                return
+            writer = csv.DictWriter(f, fieldnames=list(first))
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(records)
+        elif path.endswith('.json'):
+            f.write('[')
+            for i, record in enumerate(records):
+                f.write((',\n' if i else '\n') + json.dumps(record, ensure_ascii=False))
+            f.write('\n]\n')
+        else:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def bulk_seed(kind, records, chunk_size=BULK_CHUNK_SIZE):
+    """Upload records through the bulk endpoint as NDJSON, one request per chunk"""
+    print(f"🌱 Bulk seeding {kind}...")
+    inserted = rejected = 0
+    for chunk in _chunks(records, chunk_size):
+        body = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in chunk)
+        try:
+            response = requests.post(f"{BASE_URL}/{kind}/bulk", data=body.encode('utf-8'),
+                                     headers={'Content-Type': 'application/x-ndjson'})
+            result = response.json()
+            inserted += result.get('inserted', 0)
+            rejected += result.get('rejected', 0)
+            for error in result.get('errors', [])[:5]:
+                print(f"❌ Row {error['row']}: {error['message']}")
+            if not result.get('success'):
+                print(f"❌ Failed: {result.get('message')}")
+                break
+        except Exception as e:
+            print(f"❌ Error uploading {kind}: {str(e)}")
+            break
+        print(f"✅ {inserted} {kind} added")
+    return inserted, rejected
+
 def check_health():
     """Check if server is running"""
+    if requests is None:
+        print("❌ The requests package is required: pip install requests\n")
+        return False
     try:
         response = requests.get(f"{BASE_URL}/health")
         if response.status_code == 200:
@@ -205,7 +336,38 @@ def check_health():
         print("Please start the Flask server first: python app.py\n")
         return False
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the portal with sample or synthetic data")
+    parser.add_argument('--bulk', action='store_true', help='upload through the bulk endpoints')
+    parser.add_argument('--internships', type=int, default=None,
+                        help='generate this many synthetic internships instead of the samples')
+    parser.add_argument('--candidates', type=int, default=None,
+                        help='generate this many synthetic candidates instead of the samples')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for synthetic data')
+    parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE, help='rows per bulk request')
+    parser.add_argument('--output', default=None,
+                        help='write the dataset to <output>.internships.<ext> / <output>.candidates.<ext> '
+                             '(ext: json, ndjson or csv) instead of uploading')
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    internships = (generate_internships(args.internships, args.seed)
+                   if args.internships is not None else sample_internships)
+    candidates = (generate_candidates(args.candidates, args.seed)
+                  if args.candidates is not None else sample_candidates)
+    
+    if args.output:
+        base, _, ext = args.output.rpartition('.')
+        if ext not in ('json', 'ndjson', 'csv') or not base:
+            print("❌ --output must end in .json, .ndjson or .csv")
+            return
+        for kind, records in (('internships', internships), ('candidates', candidates)):
+            path = f"{base}.{kind}.{ext}"
+            write_dataset(records, path)
+            print(f"✅ Wrote {path}")
+        return
+    
     print("=" * 60)
     print("   National Internship Portal - Data Seeder")
     print("=" * 60)
@@ -214,15 +376,21 @@ def main():
     if not check_health():
         return
     
-    seed_internships()
-    seed_candidates()
+    if args.bulk:
+        internship_count, _ = bulk_seed('internships', internships, args.chunk_size)
+        candidate_count, _ = bulk_seed('candidates', candidates, args.chunk_size)
+    else:
+        internships, candidates = list(internships), list(candidates)
+        seed_internships(internships)
+        seed_candidates(candidates)
+        internship_count, candidate_count = len(internships), len(candidates)
     
     print("\n" + "=" * 60)
     print("✅ Data seeding completed successfully!")
     print("=" * 60)
     print("\n📊 Summary:")
-    print(f"   - {len(sample_internships)} internships added")
-    print(f"   - {len(sample_candidates)} candidates added")
+    print(f"   - {internship_count} internships added")
+    print(f"   - {candidate_count} candidates added")
     print("\n🎯 You can now test the matching algorithm!")
     print("   Visit: http://localhost:5000\n")
 
@@ -0,0 +1,234 @@
+"""
+Semantic Matching
+Dense alternative to the TF-IDF engine: profiles are projected into a
+low-dimensional LSA space (TruncatedSVD over a wider TF-IDF vocabulary,
+with skill aliases expanded to their canonical names), fitted in the
+background on the stored corpus. Each side is one contiguous float32
+matrix of unit rows, so scoring a query is a single BLAS matrix-vector
+product followed by a top-K selection.
+"""
+
+import threading
+
+import numpy as np
+
+from lazy import lazy_import
+from matching import DEFAULT_REFIT_THRESHOLD, SKILL_FIELDS, SKILL_WEIGHT, select_top, sklearn_text
+from skills import split_skills
+
+sklearn_decomposition = lazy_import('sklearn.decomposition')
+
+
+DEFAULT_COMPONENTS = 128
+SEMANTIC_MAX_FEATURES = 20000       # The dense projection keeps query cost flat, so the vocabulary can grow
+MIN_FIT_ROWS = 10
+DTYPE = np.float32
+
+
+def normalize(vectors):
+    """Rows scaled to unit length as a C-contiguous float32 array (zero rows stay zero)"""
+    vectors = np.ascontiguousarray(vectors, dtype=DTYPE)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class DenseSide:
+    """Unit vectors for one side in source-list order; capacity doubles as rows are appended"""
+
+    def __init__(self, dimensions):
+        self.vectors = np.zeros((0, dimensions), dtype=DTYPE)
+        self.count = 0
+
+    def append(self, vectors):
+        needed = self.count + len(vectors)
+        if needed > len(self.vectors):
+            # Readers holding a view of the old buffer keep a consistent copy
+            grown = np.zeros((max(needed, 2 * len(self.vectors)), self.vectors.shape[1]), dtype=DTYPE)
+            grown[:self.count] = self.vectors[:self.count]
+            self.vectors = grown
+        self.vectors[self.count:needed] = vectors
+        self.count = needed
+
+    def matrix(self):
+        return self.vectors[:self.count]
+
+
+class SemanticIndex:
+    """
+    LSA vectors for the rows of a MatchIndex (whose source lists, profile
+    text and skill postings it shares).
+
+    Fitting runs on a background thread: at startup when `eager`, else
+    once the first semantic query asks for it; until then `rank` returns
+    None and callers fall back to TF-IDF. Rows saved later are projected
+    with the current model, and the model is refitted once the rows added
+    since the last fit pass `refit_threshold`.
+    """
+
+    def __init__(self, index, components=DEFAULT_COMPONENTS, refit_threshold=DEFAULT_REFIT_THRESHOLD,
+                 eager=False, background=True):
+        self.index = index
+        self.components = components
+        self.refit_threshold = refit_threshold
+        self.wanted = eager
+        self.background = background
+        self.model = None           # (vectorizer, svd)
+        self.sides = None           # user_type -> DenseSide
+        self.version = 0            # Bumped whenever rows are added or refitted
+        self.fitted_rows = 0
+        self.lock = threading.Lock()
+        self._fit_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self.model is not None
+
+    def text(self, profile, user_type):
+        """Profile text plus the canonical name of each listed skill, so aliases ('ml') meet full names"""
+        dictionary = self.index.dictionary
+        skills = [dictionary.canonical(name) for name in split_skills(profile.get(SKILL_FIELDS[user_type]))]
+        return ' '.join([self.index.text_fn(profile, user_type)] + skills)
+
+    def request(self):
+        """Ask for the model to be fitted (from now on, kept up to date)"""
+        self.wanted = True
+        self.notify()
+
+    def notify(self):
+        """Fit or update in the background, if the model is wanted"""
+        if not self.wanted:
+            return
+        if not self.background:
+            self.sync()
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Error fitting semantic index: {str(e)}")
+
+    def sync(self):
+        """Fit if needed (first time or drift past the threshold), then project any new rows"""
+        with self._fit_lock:
+            if self.model is None or self.append_pending():
+                self.fit()
+            self.append_pending()
+        return self.ready
+
+    def fit(self):
+        """Fit the vectorizer and SVD on every stored row and swap them in; False if the corpus is too small"""
+        rows = {user_type: side.rows[:] for user_type, side in self.index.sides.items()}
+        texts = [self.text(profile, user_type) for user_type in ('candidate', 'internship')
+                 for profile in rows[user_type]]
+        if len(texts) < MIN_FIT_ROWS:
+            return False
+
+        vectorizer = sklearn_text.TfidfVectorizer(
+            max_features=SEMANTIC_MAX_FEATURES,
+            ngram_range=(1, 2),
+            stop_words='english',
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        try:
+            tfidf_matrix = vectorizer.fit_transform(texts)
+        except ValueError:      # Empty vocabulary
+            return False
+        components = min(self.components, tfidf_matrix.shape[1] - 1, len(texts) - 1)
+        if components < 1:
+            return False
+        svd = sklearn_decomposition.TruncatedSVD(n_components=components, random_state=0)
+        vectors = normalize(svd.fit_transform(tfidf_matrix))
+
+        n_candidates = len(rows['candidate'])
+        sides = {}
+        for user_type, block in (('candidate', vectors[:n_candidates]), ('internship', vectors[n_candidates:])):
+            sides[user_type] = DenseSide(components)
+            sides[user_type].append(block)
+        with self.lock:
+            self.model = (vectorizer, svd)
+            self.sides = sides
+            self.fitted_rows = len(texts)
+            self.version += 1
+        return True
+
+    def embed(self, texts, model=None):
+        vectorizer, svd = model or self.model
+        return normalize(svd.transform(vectorizer.transform(texts)))
+
+    def append_pending(self):
+        """Project rows saved since the last fit; True once a refit is due"""
+        with self.lock:
+            if self.model is None:
+                return False
+            for user_type, side in self.sides.items():
+                pending = self.index.sides[user_type].rows[side.count:]
+                if pending:
+                    side.append(self.embed([self.text(profile, user_type) for profile in pending]))
+                    self.version += 1
+            added = sum(side.count for side in self.sides.values()) - self.fitted_rows
+            return added > self.refit_threshold * self.fitted_rows
+
+    def rank(self, profile, user_type, top_n=10, skill_weight=SKILL_WEIGHT, match_filter=None):
+        """
+        Top N stored rows of the other side for `profile`, as the profile's
+        skill IDs plus (row, total, semantic, skill) tuples, or None before
+        the first fit. Semantic similarity gets the weight the skill score
+        leaves (100 - skill_weight). With a `match_filter`, only the rows
+        passing it are scored.
+        """
+        if self.model is None:
+            self.request()
+            return None
+        self.append_pending()
+
+        target = 'internship' if user_type == 'candidate' else 'candidate'
+        skills = self.index.sides[target].skills
+        with self.lock:
+            model = self.model
+            matrix = self.sides[target].matrix()
+        n_rows = min(len(matrix), len(skills))
+        rows = None
+        if match_filter is not None:
+            rows = self.index.sides[target].attributes.rows(match_filter, n_rows)
+        query = self.embed([self.text(profile, user_type)], model)[0]
+
+        # One float32 matrix-vector product over the whole side (or the filtered rows)
+        vectors = matrix[:n_rows] if rows is None else matrix[rows]
+        semantic = np.clip(vectors @ query, 0.0, 1.0).astype(np.float64) * (100 - skill_weight)
+
+        # Direct skill match, as in score_block: shared skills over the internship's required skills
+        query_ids, query_count = self.index.dictionary.lookup(profile.get(SKILL_FIELDS[user_type], ''),
+                                                              grow=False)
+        overlap = skills.overlap(query_ids, n_rows)
+        counts = skills.counts()[:n_rows]
+        if rows is not None:
+            overlap, counts = overlap[rows], counts[rows]
+        required = counts if user_type == 'candidate' else query_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill = np.where((counts > 0) & (query_count > 0), overlap / required * skill_weight, 0.0)
+
+        total = semantic + skill
+        best = select_top(total, top_n)
+        rows = np.arange(n_rows) if rows is None else rows
+        return query_ids, [(int(rows[i]), float(total[i]), float(semantic[i]), float(skill[i])) for i in best]
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "components": self.model[1].n_components if self.model else None,
+            "vocabulary": len(self.model[0].vocabulary_) if self.model else 0,
+            "rows": {user_type: side.count for user_type, side in self.sides.items()} if self.sides else {},
+            "version": self.version
+        }
@@ -0,0 +1,347 @@
+"""
+Sharded Matching
+Scatter-gather scoring across local worker processes. Each shard process
+holds a slice of both index sides (TF-IDF rows, skill matrix and filter
+columns); a query is vectorized once by the coordinator, scored by every
+shard in parallel, and the per-shard top-K lists are merged into the
+global top-K. Rows are dealt round-robin, so shards stay within one row of
+each other as profiles are saved. Shards are started like the batch
+workers (`pool_context`): forked only from a single-threaded process,
+otherwise through forkserver or spawn, so they never inherit the server's
+threads or locks.
+"""
+
+import itertools
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+from scipy import sparse
+
+from filters import AttributeColumns, filter_record
+from jobs import pool_context
+from matching import PairSide, rank_pairs, select_top, skill_matrix, sklearn_pairwise
+
+
+SHARD_TIMEOUT = 30.0        # Seconds to wait for every shard to answer a query
+
+
+def widen(matrix, width):
+    """CSR matrix with extra empty columns up to `width`"""
+    if matrix.shape[1] >= width:
+        return matrix
+    return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width))
+
+
+class ShardSide:
+    """One side's rows held by a shard: global row numbers, TF-IDF rows, skills and filter columns"""
+
+    def __init__(self, user_type):
+        self.user_type = user_type
+        self.global_rows = np.empty(0, dtype=np.intp)
+        self.blocks = []            # (TF-IDF CSR, skill CSR) blocks, compacted lazily on read
+        self.skill_ids = []
+        self.counts = np.empty(0, dtype=np.float64)
+        self.attributes = AttributeColumns(user_type)
+
+    def append(self, rows, vectors, skill_ids, counts, records):
+        width = 1 + max([int(ids[-1]) for ids in skill_ids if len(ids)], default=0)
+        self.global_rows = np.concatenate([self.global_rows, rows])
+        self.blocks.append((vectors.tocsr(), skill_matrix(skill_ids, width)))
+        self.skill_ids.extend(skill_ids)
+        self.counts = np.concatenate([self.counts, counts])
+        self.attributes.add_profiles(records)
+
+    def matrices(self):
+        """(TF-IDF, skill) matrices over every row held"""
+        if len(self.blocks) > 1:
+            width = max(skills.shape[1] for _, skills in self.blocks)
+            self.blocks = [(sparse.vstack([vectors for vectors, _ in self.blocks], format='csr'),
+                            sparse.vstack([widen(skills, width) for _, skills in self.blocks], format='csr'))]
+        return self.blocks[0] if self.blocks else (None, None)
+
+    def rank(self, query_side, user_type, top_n, match_filter=None):
+        """
+        Top N rows of this side for a one-row query side, as global rows
+        plus a (total, tfidf, skill) array per row
+        """
+        vectors, skills = self.matrices()
+        if vectors is None:
+            return np.empty(0, dtype=np.intp), np.empty((0, 3))
+        stored_side = PairSide(vectors, self.skill_ids, self.counts)
+
+        # Shared skills from the skill matrix (IDs newer than any held row cannot match)
+        query_ids = query_side.skill_ids[0]
+        wanted = np.zeros(skills.shape[1])
+        wanted[query_ids[query_ids < skills.shape[1]]] = 1.0
+        overlap = skills @ wanted
+
+        rows = np.arange(len(stored_side))
+        if match_filter is not None:
+            rows = self.attributes.rows(match_filter, len(stored_side))
+            stored_side, overlap = stored_side.take(rows), overlap[rows]
+
+        if user_type == 'candidate':
+            ranked = [(j, scores) for _, j, *scores in
+                      rank_pairs(query_side, stored_side, top_n, overlap[np.newaxis, :])]
+        else:
+            ranked = [(i, scores) for i, _, *scores in
+                      rank_pairs(stored_side, query_side, top_n, overlap[:, np.newaxis])]
+        return (np.array([self.global_rows[rows[k]] for k, _ in ranked], dtype=np.intp),
+                np.array([scores for _, scores in ranked], dtype=np.float64).reshape(-1, 3))
+
+
+def serve_shard(connection):
+    """Shard process loop: load/append rows and answer rank requests until told to stop"""
+    sides = {'candidate': ShardSide('candidate'), 'internship': ShardSide('internship')}
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        op = message[0]
+        if op == 'load':
+            _, user_type, payload = message
+            sides[user_type] = ShardSide(user_type)
+            sides[user_type].append(*payload)
+        elif op == 'append':
+            _, user_type, payload = message
+            sides[user_type].append(*payload)
+        elif op == 'rank':
+            _, request_id, user_type, query_side, top_n, match_filter = message
+            target = 'internship' if user_type == 'candidate' else 'candidate'
+            try:
+                connection.send((request_id, sides[target].rank(query_side, user_type, top_n, match_filter), None))
+            except Exception as e:
+                connection.send((request_id, None, str(e)))
+
+
+class ShardPool:
+    """
+    Coordinator for `n_shards` shard processes over the rows of a MatchIndex.
+
+    `sync` ships rows the shards do not hold yet: every row after a (re)fit,
+    since all vectors change, otherwise only the rows appended since the
+    last sync. Syncs run in the background (after saves and refits); until
+    the shards hold every indexed row of the current model, `rank` returns
+    None and the caller scores in process, so results always match
+    in-process scoring exactly. A shard process that dies marks the pool
+    broken; the next sync starts fresh processes.
+    """
+
+    def __init__(self, index, n_shards, timeout=SHARD_TIMEOUT, background=True):
+        self.index = index
+        self.n_shards = n_shards
+        self.timeout = timeout
+        self.background = background
+        self.workers = None         # [(process, connection, send lock)]
+        self.version = None         # Index version the shards hold
+        self.vectorizer = None      # Model that version's rows were vectorized with
+        self.shipped = {'candidate': 0, 'internship': 0}
+        self.broken = False
+        self.lock = threading.Lock()            # One sync at a time
+        self.query_lock = threading.Lock()      # Shipped state vs. the send of each query's rank requests
+        self._pending = {}                      # (shard, request id) -> Future
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def notify(self):
+        """Ship newly saved rows to the shards in the background"""
+        if not self.background:
+            self.sync()
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Error syncing match shards: {str(e)}")
+
+    def _start(self):
+        context = pool_context()
+        if context.get_start_method() == 'fork':
+            # Forked shards inherit the already imported scorer instead of each importing it
+            sklearn_pairwise.load()
+        workers = []
+        for shard in range(self.n_shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=serve_shard, args=(child,), name=f'match-shard-{shard}', daemon=True)
+            process.start()
+            child.close()
+            workers.append((process, parent, threading.Lock()))
+        with self.query_lock:
+            self.workers = workers
+            self.version = None
+            self.shipped = {'candidate': 0, 'internship': 0}
+            self.broken = False
+        for shard, (_, parent, _) in enumerate(workers):
+            threading.Thread(target=self._read, args=(shard, parent), daemon=True).start()
+
+    def _read(self, shard, connection):
+        """Resolve this shard's pending requests as its answers arrive"""
+        while True:
+            try:
+                request_id, result, error = connection.recv()
+            except (EOFError, OSError):
+                break
+            with self._pending_lock:
+                future = self._pending.pop((shard, request_id), None)
+            if future is None:
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(f"Shard {shard}: {error}"))
+
+        if self.workers is None or self.workers[shard][1] is not connection:
+            return      # Closed by _stop
+        self.broken = True
+        with self._pending_lock:
+            lost = [key for key in self._pending if key[0] == shard]
+            for key in lost:
+                self._pending.pop(key).set_exception(RuntimeError(f"Shard {shard} exited"))
+
+    def _send(self, shard, message):
+        _, connection, send_lock = self.workers[shard]
+        with send_lock:
+            connection.send(message)
+
+    def _stop(self):
+        with self.query_lock:
+            workers, self.workers, self.version = self.workers, None, None
+        for process, connection, _ in workers or []:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    def close(self):
+        with self.lock:
+            self._stop()
+
+    def sync(self):
+        """Start the shards if needed and ship rows they do not hold; False until the index is fitted"""
+        with self.lock:
+            if self.broken:
+                self._stop()
+            if self.workers is None:
+                self._start()
+
+            with self.index.lock:
+                if not self.index.ready:
+                    return False
+                version, vectorizer = self.index.version, self.index.vectorizer
+                sides = {}
+                for user_type, side in self.index.sides.items():
+                    count = side.count
+                    sides[user_type] = (side.matrix(self.index.n_features), side.skills.profile_skills[:count],
+                                        side.skills.counts()[:count], side.rows)
+
+            reload = version != self.version
+            if reload:
+                # Under query_lock, so every query that passed current() has
+                # already sent its rank requests; until version is set again
+                # below, queries fall back and none lands in between the loads
+                with self.query_lock:
+                    self.version = None
+            shipped = dict(self.shipped)
+            for user_type, (matrix, skill_ids, counts, profiles) in sides.items():
+                start = 0 if reload else shipped[user_type]
+                count = matrix.shape[0]
+                if start >= count and not reload:
+                    continue
+                for shard in range(self.n_shards):
+                    # Round-robin: global row r lives on shard r % n_shards
+                    rows = np.arange(start + (shard - start) % self.n_shards, count, self.n_shards)
+                    payload = (rows, matrix[rows], [skill_ids[r] for r in rows], counts[rows],
+                               [filter_record(profiles[r], user_type) for r in rows])
+                    self._send(shard, ('load' if reload else 'append', user_type, payload))
+                shipped[user_type] = count
+            with self.query_lock:
+                self.version, self.vectorizer, self.shipped = version, vectorizer, shipped
+            return True
+
+    def current(self):
+        """True if the shards hold every indexed row of the current model (caller holds query_lock)"""
+        if self.workers is None or self.broken:
+            return False
+        with self.index.lock:
+            return (self.index.version == self.version and
+                    all(side.count == self.shipped[user_type] for user_type, side in self.index.sides.items()))
+
+    def _scatter(self, profile, user_type, top_n, match_filter):
+        """Vectorize the query and send it to every shard (caller holds query_lock)"""
+        query_side = PairSide.from_profiles(
+            [profile], user_type, self.vectorizer.transform([self.index.text_fn(profile, user_type)]),
+            self.index.dictionary, grow=False
+        )
+        request_id = next(self._ids)
+        futures = []
+        for shard in range(self.n_shards):
+            future = Future()
+            with self._pending_lock:
+                self._pending[(shard, request_id)] = future
+            futures.append(future)
+            try:
+                self._send(shard, ('rank', request_id, user_type, query_side, top_n, match_filter))
+            except OSError as e:
+                self.broken = True
+                with self._pending_lock:
+                    self._pending.pop((shard, request_id), None)
+                future.set_exception(e)
+        return query_side, request_id, futures
+
+    def rank(self, profile, user_type, top_n=10, match_filter=None):
+        """
+        Top N stored rows of the other side for `profile`, as the profile's
+        skill IDs plus (row, total, tfidf, skill) tuples ordered like
+        rank_pairs; None if the shards cannot answer or are still catching
+        up, which is left to the background sync
+        """
+        with self.query_lock:
+            sent = self._scatter(profile, user_type, top_n, match_filter) if self.current() else None
+        if sent is None:
+            self.notify()
+            return None
+        query_side, request_id, futures = sent
+
+        try:
+            parts = [future.result(timeout=self.timeout) for future in futures]
+        except Exception as e:
+            print(f"Error in sharded matching: {str(e)}")
+            with self._pending_lock:
+                for shard in range(self.n_shards):
+                    self._pending.pop((shard, request_id), None)
+            return None
+
+        # Merge the per-shard top N; global rows break ties as in a single-process ranking
+        rows = np.concatenate([part_rows for part_rows, _ in parts])
+        scores = np.concatenate([part_scores for _, part_scores in parts])
+        best = select_top(scores[:, 0], top_n, rows)
+        return query_side.skill_ids[0], [(int(rows[i]), *map(float, scores[i])) for i in best]
+
+    def stats(self):
+        alive = [process.is_alive() for process, _, _ in self.workers or []]
+        return {
+            "shards": self.n_shards,
+            "alive": sum(alive),
+            "version": self.version,
+            "rows": {user_type: [len(range(shard, count, self.n_shards)) for shard in range(self.n_shards)]
+                     for user_type, count in self.shipped.items()}
+        }
@@ -0,0 +1,236 @@
+"""
+Skill Dictionary & Inverted Skill Index
+Normalizes free-form skill names to integer IDs (folding aliases such as
+"node" / "node.js") and keeps skill -> profile posting lists so overlap
+and "who has skill X" queries only touch the relevant postings.
+"""
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'taxonomy.json')
+
+SKILL_ID_DTYPE = np.uint32
+
+_WHITESPACE = re.compile(r'\s+')
+
+_taxonomies = {}
+
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """Parsed taxonomy JSON (skills, aliases, education keywords), cached per path"""
+    if path not in _taxonomies:
+        with open(path, encoding='utf-8') as f:
+            _taxonomies[path] = json.load(f)
+    return _taxonomies[path]
+
+
+def normalize_skill(skill):
+    """Lower-case a skill name and collapse internal whitespace"""
+    return _WHITESPACE.sub(' ', str(skill).lower()).strip()
+
+
+def split_skills(skills):
+    """Split a comma-separated skill string (or list) into normalized names"""
+    if not skills:
+        return []
+    parts = skills if isinstance(skills, (list, tuple)) else str(skills).split(',')
+    return [name for name in (normalize_skill(p) for p in parts) if name]
+
+
+class SkillDictionary:
+    """Maps skill names and their aliases to stable integer IDs"""
+
+    def __init__(self, taxonomy=None):
+        self.ids = {}               # Normalized name or alias -> skill ID
+        self.names = []             # Skill ID -> display name
+        self.version = 0
+        self.lock = threading.Lock()
+        if taxonomy:
+            self.version = taxonomy.get('version', 0)
+            for entry in taxonomy.get('skills', []):
+                skill_id = self._add(entry['name'])
+                for alias in entry.get('aliases', []):
+                    self.ids.setdefault(normalize_skill(alias), skill_id)
+
+    @classmethod
+    def load(cls, path=TAXONOMY_PATH):
+        """Build a dictionary from a taxonomy JSON file"""
+        return cls(load_taxonomy(path))
+
+    def _add(self, name):
+        key = normalize_skill(name)
+        if key in self.ids:
+            return self.ids[key]
+        skill_id = len(self.names)
+        self.ids[key] = skill_id
+        self.names.append(name)
+        return skill_id
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getstate__(self):
+        # Copies pickled for worker processes (batch scoring) get a lock of their own
+        with self.lock:
+            return dict(self.__dict__, ids=dict(self.ids), names=list(self.names), lock=None)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def id_for(self, skill, grow=True):
+        """ID for one skill name; unknown skills get a new ID when `grow` is set"""
+        key = normalize_skill(skill)
+        skill_id = self.ids.get(key)
+        if skill_id is None and grow and key:
+            with self.lock:
+                skill_id = self._add(key.title())
+        return skill_id
+
+    def lookup(self, skills, grow=True):
+        """
+        Sorted unique ID array for a comma-separated skill list, plus the
+        number of distinct skills named (unknown ones included when not growing).
+        """
+        names = split_skills(skills)
+        ids = set()
+        unknown = set()
+        for name in names:
+            skill_id = self.id_for(name, grow)
+            if skill_id is None:
+                unknown.add(name)
+            else:
+                ids.add(skill_id)
+        return np.array(sorted(ids), dtype=SKILL_ID_DTYPE), len(ids) + len(unknown)
+
+    def name(self, skill_id):
+        return self.names[skill_id]
+
+    def canonical(self, skill):
+        """Normalized canonical name for a skill or alias (unknown skills stay as given)"""
+        skill_id = self.id_for(skill, grow=False)
+        return normalize_skill(self.names[skill_id]) if skill_id is not None else normalize_skill(skill)
+
+
+class SkillIndex:
+    """
+    Skill ID arrays for one list of profiles plus skill -> row postings.
+    Row positions match the profile list the index was built from. Rows
+    can be preloaded from snapshot arrays (see `load_arrays`); later rows
+    are appended to in-memory postings.
+    """
+
+    def __init__(self, dictionary, field):
+        self.dictionary = dictionary
+        self.field = field
+        self.profile_skills = []    # Row -> sorted skill ID array
+        self.postings = []          # Skill ID -> rows added after the preloaded ones (ascending)
+        self._base_postings = None  # (rows, indptr) CSR arrays of preloaded postings
+        self._base_counts = np.empty(0)
+        self._counts = []           # Distinct-skill counts of rows after the preloaded ones
+        self._count_array = np.empty(0)
+
+    def __len__(self):
+        return len(self.profile_skills)
+
+    def load_arrays(self, skill_ids, skill_indptr, counts, posting_rows, posting_indptr):
+        """
+        Preload rows from CSR arrays (e.g. memory-mapped snapshot files)
+        instead of re-reading every profile. Only valid on an empty index.
+        """
+        self.profile_skills = [skill_ids[skill_indptr[r]:skill_indptr[r + 1]]
+                               for r in range(len(skill_indptr) - 1)]
+        self._base_postings = (posting_rows, posting_indptr)
+        self._base_counts = counts
+        self._count_array = counts
+
+    def add_profiles(self, profiles):
+        """Index profiles appended after the ones already indexed"""
+        for profile in profiles:
+            ids, count = self.dictionary.lookup(profile.get(self.field, ''))
+            row = len(self.profile_skills)
+            self.profile_skills.append(ids)
+            self._counts.append(count)
+            if len(self.postings) < len(self.dictionary):
+                self.postings.extend([] for _ in range(len(self.dictionary) - len(self.postings)))
+            for skill_id in ids.tolist():
+                self.postings[skill_id].append(row)
+
+    def counts(self):
+        """Number of distinct skills per row as a numpy array"""
+        counts = self._count_array
+        if len(counts) < len(self):
+            tail = np.array(self._counts[len(counts) - len(self._base_counts):], dtype=np.float64)
+            counts = np.concatenate([counts, tail])
+            self._count_array = counts
+        return counts
+
+    def all_postings(self):
+        """Skill ID -> ascending row array, for every skill in the dictionary"""
+        return [self.posting(skill_id) for skill_id in range(len(self.dictionary))]
+
+    def posting(self, skill_id):
+        if skill_id is None:
+            return np.empty(0, dtype=np.intp)
+        parts = []
+        if self._base_postings is not None:
+            rows, indptr = self._base_postings
+            if skill_id < len(indptr) - 1:
+                parts.append(np.asarray(rows[indptr[skill_id]:indptr[skill_id + 1]], dtype=np.intp))
+        if skill_id < len(self.postings) and self.postings[skill_id]:
+            parts.append(np.asarray(self.postings[skill_id], dtype=np.intp))
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def overlap(self, skill_ids, n_rows=None):
+        """Per-row count of `skill_ids` held, from the postings alone"""
+        n_rows = len(self) if n_rows is None else n_rows
+        postings = [self.posting(int(s)) for s in skill_ids]
+        if not postings:
+            return np.zeros(n_rows)
+        hits = np.concatenate(postings)
+        return np.bincount(hits[hits < n_rows], minlength=n_rows).astype(np.float64)
+
+    def rows_with(self, skills, match='all'):
+        """
+        Rows holding all (or any) of the given skills, ascending.
+        Intersections start from the shortest posting list.
+        """
+        ids = [self.dictionary.id_for(name, grow=False) for name in split_skills(skills)]
+        postings = [self.posting(skill_id) for skill_id in ids]
+        if not postings:
+            return np.empty(0, dtype=np.intp)
+
+        if match == 'any':
+            return np.unique(np.concatenate(postings))
+
+        postings.sort(key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+
+def shared_skill_names(dictionary, left_ids, right_ids):
+    """Display names of the skill IDs present in both arrays"""
+    return [dictionary.name(int(s)) for s in np.intersect1d(left_ids, right_ids, assume_unique=True)]
+
+
+_default_dictionary = None
+
+
+def default_dictionary():
+    """Process-wide skill dictionary loaded from the bundled taxonomy"""
+    global _default_dictionary
+    if _default_dictionary is None:
+        _default_dictionary = SkillDictionary.load()
+    return _default_dictionary
@@ -0,0 +1,180 @@
+"""
+Match Index Snapshots
+Persists the fitted TF-IDF model, the per-side CSR matrices and the skill
+arrays as plain .npy files so worker processes can memory-map one shared
+copy instead of each refitting and holding its own. Every publish writes
+a new version directory and then atomically repoints CURRENT at it.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from scipy import sparse
+
+
+CURRENT_FILE = 'CURRENT'
+DEFAULT_KEEP_VERSIONS = 3
+
+# Seconds a superseded version is kept, so readers that just read CURRENT can still map it
+DEFAULT_PRUNE_GRACE = 60.0
+
+# Stored per side: TF-IDF matrix, skill ID arrays (CSR by row) and postings (CSR by skill)
+SIDE_ARRAYS = (
+    'tfidf_data', 'tfidf_indices', 'tfidf_indptr',
+    'skill_ids', 'skill_indptr', 'skill_counts',
+    'posting_rows', 'posting_indptr'
+)
+
+
+def csr_arrays(skill_ids):
+    """(flat values, indptr) for a list of 1-D arrays"""
+    indptr = np.zeros(len(skill_ids) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ids) for ids in skill_ids])
+    values = np.concatenate(skill_ids) if skill_ids else np.empty(0)
+    return values, indptr
+
+
+class Snapshot:
+    """One published version, opened with memory-mapped arrays"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+    def array(self, name):
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+
+    def vectorizer(self, vectorizer):
+        """Restore the fitted vocabulary and IDF weights into a fresh vectorizer"""
+        vectorizer.vocabulary_ = self.meta['vocabulary']
+        vectorizer.idf_ = np.array(self.array('idf'))
+        return vectorizer
+
+    def side(self, user_type):
+        """Meta and arrays for one side of the index"""
+        meta = self.meta['sides'][user_type]
+        arrays = {name: self.array(f"{user_type}.{name}") for name in SIDE_ARRAYS}
+        arrays['tfidf'] = sparse.csr_matrix(
+            (arrays['tfidf_data'], arrays['tfidf_indices'], arrays['tfidf_indptr']),
+            shape=(meta['rows'], len(self.meta['vocabulary'])),
+            copy=False
+        )
+        return meta, arrays
+
+
+class SnapshotStore:
+    """Directory of versioned snapshots with an atomically updated CURRENT pointer"""
+
+    def __init__(self, root, keep=DEFAULT_KEEP_VERSIONS, grace=DEFAULT_PRUNE_GRACE):
+        self.root = root
+        self.keep = keep
+        self.grace = grace
+        os.makedirs(root, exist_ok=True)
+
+    def current(self):
+        """Name of the current version, or None"""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def open(self, name=None):
+        """Open a version (default: the current one); None if there is none"""
+        name = name or self.current()
+        if name is None:
+            return None
+        try:
+            return Snapshot(os.path.join(self.root, name))
+        except (OSError, ValueError) as e:
+            print(f"Error opening index snapshot {name}: {str(e)}")
+            return None
+
+    def versions(self):
+        return sorted(entry for entry in os.listdir(self.root) if entry.startswith('v'))
+
+    def _new_version_dir(self):
+        # mkdir is atomic, so concurrent publishers never share a directory
+        versions = self.versions()
+        number = int(versions[-1][1:]) + 1 if versions else 1
+        while True:
+            path = os.path.join(self.root, f"v{number:08d}")
+            try:
+                os.mkdir(path)
+                return path
+            except FileExistsError:
+                number += 1
+
+    def publish(self, vectorizer, sides, skill_names):
+        """
+        Write a new version and make it current.
+        `sides` maps user type -> dict with 'tfidf' (CSR), 'skill_ids'
+        (row -> ID array), 'skill_counts', 'postings' (skill -> rows),
+        'skill_dtype' and 'last_id' (profile ID of the last row, so
+        readers can check the snapshot matches their own rows).
+        """
+        path = self._new_version_dir()
+        meta = {
+            "vocabulary": {term: int(col) for term, col in vectorizer.vocabulary_.items()},
+            "skillNames": list(skill_names),
+            "sides": {}
+        }
+        np.save(os.path.join(path, 'idf.npy'), vectorizer.idf_)
+
+        for user_type, side in sides.items():
+            tfidf = side['tfidf']
+            skill_ids, skill_indptr = csr_arrays(side['skill_ids'])
+            posting_rows, posting_indptr = csr_arrays(
+                [np.asarray(rows, dtype=np.int64) for rows in side['postings']]
+            )
+            arrays = {
+                'tfidf_data': tfidf.data,
+                'tfidf_indices': tfidf.indices,
+                'tfidf_indptr': tfidf.indptr,
+                'skill_ids': skill_ids.astype(side['skill_dtype']),
+                'skill_indptr': skill_indptr,
+                'skill_counts': np.asarray(side['skill_counts'], dtype=np.float64),
+                'posting_rows': posting_rows.astype(np.int64),
+                'posting_indptr': posting_indptr
+            }
+            for name, values in arrays.items():
+                np.save(os.path.join(path, f"{user_type}.{name}.npy"), values)
+            meta['sides'][user_type] = {"rows": tfidf.shape[0], "lastId": side['last_id']}
+
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        # Readers only ever follow CURRENT, so swapping it publishes the version
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(os.path.basename(path))
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
+
+        self.prune()
+        return os.path.basename(path)
+
+    def prune(self):
+        """
+        Delete all but the newest `keep` versions, once each has been
+        superseded for at least `grace` seconds. A version stops being
+        current when its successor is published, so the successor's
+        meta.json time is when readers stop picking it up.
+        """
+        current = self.current()
+        versions = self.versions()
+        now = time.time()
+        for name, successor in zip(versions[:-self.keep], versions[1:]):
+            if name == current:
+                continue
+            try:
+                superseded = os.path.getmtime(os.path.join(self.root, successor, 'meta.json'))
+            except OSError:
+                continue        # Successor still being written
+            if now - superseded >= self.grace:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
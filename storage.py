@@ -0,0 +1,546 @@
+"""
+Storage
+Repository interface for users, candidate profiles and internships, with
+an embedded SQLite implementation (WAL mode, so several worker processes
+can read while one writes).
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from skills import default_dictionary, normalize_skill, split_skills
+
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+SCHEMA_VERSION = 3
+
+
+class Repository(ABC):
+    """Persistence operations the app relies on; a backend must implement all of them"""
+
+    @abstractmethod
+    def add_user(self, user):
+        """Store a new user; returns False if the email is already registered"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user(self, email):
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_users(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_profiles(self, user_type, profiles):
+        """Store candidate or internship profiles; returns them with assigned IDs"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_profile(self, user_type, profile_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def profiles_after(self, user_type, after_id=0):
+        """Profiles with an ID above `after_id`, in ID order"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_profiles(self, user_type):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_profiles(self, user_type, filters=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of profiles, newest first, matching `filters`.
+        Returns (profiles, next_cursor); next_cursor is None on the last page.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def batch_run(self, run):
+        """Parameters stored for a batch match run, or None if there is no such run"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def start_batch_run(self, run, params):
+        """Start batch match run `run` afresh (dropping any rows it already has) with `params`"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_batch_matches(self, run, chunk, matches):
+        """Store one chunk of a batch match run; the chunk counts as done only once all its rows are stored"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def batch_chunks(self, run):
+        """Set of chunks of `run` already stored"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_batch_matches(self, run, internship_id):
+        """One internship's stored batch matches, best first"""
+        raise NotImplementedError
+
+
+# Column -> profile field for the columns each profile table indexes
+PROFILE_COLUMNS = {
+    'candidate': {
+        'email': 'email',
+        'location': 'location',
+        'work_mode': 'workMode',
+        'skills': 'skills'
+    },
+    'internship': {
+        'title': 'title',
+        'company': 'company',
+        'location': 'location',
+        'department': 'department',
+        'work_mode': 'workMode',
+        'skills': 'requiredSkills'
+    }
+}
+
+PROFILE_TABLES = {'candidate': 'candidates', 'internship': 'internships'}
+
+
+def text_key(value):
+    """Case- and whitespace-insensitive form of a filter value"""
+    return normalize_skill(value) if value else None
+
+
+def location_key(location):
+    """Filter key for a location: the city, so 'Mumbai' matches 'Mumbai, Maharashtra'"""
+    return text_key(str(location).split(',')[0]) if location else None
+
+
+def parse_stipend(stipend):
+    """Monthly stipend as an integer ("₹25,000/month" -> 25000), or None"""
+    if stipend is None:
+        return None
+    if isinstance(stipend, (int, float)):
+        return int(stipend)
+    match = re.search(r'\d[\d,]*', str(stipend))
+    return int(match.group(0).replace(',', '')) if match else None
+
+
+# Derived column -> function of the profile, for the equality/range filters
+FILTER_COLUMNS = {
+    'candidate': {
+        'location_key': lambda p: location_key(p.get('location')),
+        'work_mode_key': lambda p: text_key(p.get('workMode'))
+    },
+    'internship': {
+        'location_key': lambda p: location_key(p.get('location')),
+        'work_mode_key': lambda p: text_key(p.get('workMode')),
+        'department_key': lambda p: text_key(p.get('department')),
+        'stipend_amount': lambda p: parse_stipend(p.get('stipend'))
+    }
+}
+
+# Request filter -> (derived column, key function), per profile type
+EQUALITY_FILTERS = {
+    'candidate': {'location': ('location_key', location_key), 'workMode': ('work_mode_key', text_key)},
+    'internship': {
+        'location': ('location_key', location_key),
+        'workMode': ('work_mode_key', text_key),
+        'department': ('department_key', text_key)
+    }
+}
+
+# Profile fields covered by free-text search
+SEARCH_FIELDS = {
+    'candidate': ('name', 'experience', 'interests'),
+    'internship': ('title', 'description')
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    user_type TEXT NOT NULL,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT,
+    location TEXT,
+    work_mode TEXT,
+    skills TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates (email);
+CREATE INDEX IF NOT EXISTS idx_candidates_location ON candidates (location);
+CREATE INDEX IF NOT EXISTS idx_candidates_work_mode ON candidates (work_mode);
+
+CREATE TABLE IF NOT EXISTS internships (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    department TEXT,
+    work_mode TEXT,
+    skills TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_internships_location ON internships (location);
+CREATE INDEX IF NOT EXISTS idx_internships_work_mode ON internships (work_mode);
+
+-- One row per (skill, profile) so "who has skill X" is an index range scan
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    skill TEXT NOT NULL,
+    profile_id INTEGER NOT NULL REFERENCES candidates (id),
+    PRIMARY KEY (skill, profile_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS internship_skills (
+    skill TEXT NOT NULL,
+    profile_id INTEGER NOT NULL REFERENCES internships (id),
+    PRIMARY KEY (skill, profile_id)
+) WITHOUT ROWID;
+"""
+
+# Filter columns (backfilled from the stored JSON) and full-text indexes
+MIGRATION_V2 = """
+ALTER TABLE candidates ADD COLUMN location_key TEXT;
+ALTER TABLE candidates ADD COLUMN work_mode_key TEXT;
+CREATE INDEX IF NOT EXISTS idx_candidates_location_key ON candidates (location_key, id);
+CREATE INDEX IF NOT EXISTS idx_candidates_work_mode_key ON candidates (work_mode_key, id);
+
+ALTER TABLE internships ADD COLUMN location_key TEXT;
+ALTER TABLE internships ADD COLUMN work_mode_key TEXT;
+ALTER TABLE internships ADD COLUMN department_key TEXT;
+ALTER TABLE internships ADD COLUMN stipend_amount INTEGER;
+CREATE INDEX IF NOT EXISTS idx_internships_location_key ON internships (location_key, id);
+CREATE INDEX IF NOT EXISTS idx_internships_work_mode_key ON internships (work_mode_key, id);
+CREATE INDEX IF NOT EXISTS idx_internships_department_key ON internships (department_key, id);
+-- No stipend index: a range matches a large share of rows, so walking IDs
+-- newest first fills a page sooner than sorting every row in the range
+
+-- Contentless: only maps words to profile IDs, the text itself stays in `data`
+CREATE VIRTUAL TABLE IF NOT EXISTS candidate_search USING fts5 (name, experience, interests, content='');
+CREATE VIRTUAL TABLE IF NOT EXISTS internship_search USING fts5 (title, description, content='')
+"""
+
+# Offline batch match reports (see batch_match.py): run parameters, then one row per internship and rank
+MIGRATION_V3 = """
+CREATE TABLE IF NOT EXISTS batch_runs (
+    run TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS batch_matches (
+    run TEXT NOT NULL REFERENCES batch_runs (run),
+    chunk INTEGER NOT NULL,
+    internship_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    match_score REAL,
+    tfidf_score REAL,
+    skill_score REAL,
+    matched_skills TEXT,
+    PRIMARY KEY (run, internship_id, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_batch_matches_chunk ON batch_matches (run, chunk)
+"""
+
+# Batch match column -> output field
+BATCH_MATCH_COLUMNS = {
+    'internship_id': 'internshipId',
+    'rank': 'rank',
+    'candidate_id': 'candidateId',
+    'match_score': 'matchScore',
+    'tfidf_score': 'tfidfScore',
+    'skill_score': 'skillScore',
+    'matched_skills': 'matchedSkills'
+}
+
+
+def _statements(script):
+    lines = [line for line in script.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def _search_query(text):
+    """FTS5 query matching every word of `text` (whole words; quoted so no FTS syntax leaks in)"""
+    words = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{word}"' for word in words) if words else None
+
+
+def _column_value(value):
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(v) for v in value)
+    return value
+
+
+class SQLiteRepository(Repository):
+    """
+    SQLite-backed repository.
+
+    Each thread gets its own connection. WAL journaling lets readers run
+    alongside a writer, and SQLite's file locking serializes writers
+    across processes, so AUTOINCREMENT IDs are never handed out twice.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, timeout=30.0, dictionary=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.timeout = timeout
+        # Skills are stored under their canonical names so aliases filter alike
+        self.dictionary = dictionary if dictionary is not None else default_dictionary()
+        self._local = threading.local()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._migrate()
+
+    def _migrate(self):
+        """Bring the schema up to SCHEMA_VERSION (tracked in PRAGMA user_version)"""
+        conn = self.connection()
+        # IMMEDIATE takes the write lock up front, so concurrent workers migrate once
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < 1:
+                for statement in _statements(SCHEMA):
+                    conn.execute(statement)
+            if version < 2:
+                for statement in _statements(MIGRATION_V2):
+                    conn.execute(statement)
+                self._backfill(conn)
+            if version < 3:
+                for statement in _statements(MIGRATION_V3):
+                    conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _backfill(self, conn):
+        """Fill derived columns, canonical skills and search entries for existing rows"""
+        for user_type, table in PROFILE_TABLES.items():
+            columns = FILTER_COLUMNS[user_type]
+            update = f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?"
+            conn.execute(f"DELETE FROM {user_type}_skills")
+            rows = conn.execute(f"SELECT id, data FROM {table}").fetchall()
+            for start in range(0, len(rows), self.batch_size):
+                profiles = [self._profile(row) for row in rows[start:start + self.batch_size]]
+                conn.executemany(update, [[fn(p) for fn in columns.values()] + [p['id']] for p in profiles])
+                self._index_profiles(conn, user_type, profiles)
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    # ---- users ----
+
+    def add_user(self, user):
+        try:
+            with self.connection() as conn:
+                conn.execute(
+                    'INSERT INTO users (email, password, user_type, created_at) VALUES (?, ?, ?, ?)',
+                    (user['email'], user['password'], user['userType'], user.get('createdAt'))
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def get_user(self, email):
+        row = self.connection().execute(
+            'SELECT email, password, user_type, created_at FROM users WHERE email = ?', (email,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"email": row['email'], "password": row['password'],
+                "userType": row['user_type'], "createdAt": row['created_at']}
+
+    def count_users(self):
+        return self.connection().execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    # ---- profiles ----
+
+    def _skill_keys(self, skills):
+        return {self.dictionary.canonical(name) for name in split_skills(skills)}
+
+    def _index_profiles(self, conn, user_type, profiles):
+        """Skill rows and full-text entries for stored profiles"""
+        skill_field = PROFILE_COLUMNS[user_type]['skills']
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {user_type}_skills (skill, profile_id) VALUES (?, ?)",
+            [(skill, p['id']) for p in profiles for skill in self._skill_keys(p.get(skill_field))]
+        )
+        fields = SEARCH_FIELDS[user_type]
+        conn.executemany(
+            f"INSERT INTO {user_type}_search (rowid, {', '.join(fields)}) "
+            f"VALUES (?, {', '.join('?' for _ in fields)})",
+            [[p['id']] + [_column_value(p.get(field)) for field in fields] for p in profiles]
+        )
+
+    def add_profiles(self, user_type, profiles):
+        table = PROFILE_TABLES[user_type]
+        columns = PROFILE_COLUMNS[user_type]
+        derived = FILTER_COLUMNS[user_type]
+        names = list(columns) + list(derived)
+        insert = (f"INSERT INTO {table} ({', '.join(names)}, data) "
+                  f"VALUES ({', '.join('?' for _ in names)}, ?)")
+
+        stored = []
+        conn = self.connection()
+        for start in range(0, len(profiles), self.batch_size):
+            batch = []
+            # One transaction per batch: a single fsync instead of one per row
+            with conn:
+                for profile in profiles[start:start + self.batch_size]:
+                    profile = {key: value for key, value in profile.items() if key != 'id'}
+                    values = ([_column_value(profile.get(field)) for field in columns.values()] +
+                              [fn(profile) for fn in derived.values()])
+                    cursor = conn.execute(insert, values + [json.dumps(profile)])
+                    batch.append({"id": cursor.lastrowid, **profile})
+                self._index_profiles(conn, user_type, batch)
+            stored.extend(batch)
+        return stored
+
+    def add_profile(self, user_type, profile):
+        return self.add_profiles(user_type, [profile])[0]
+
+    def _profile(self, row):
+        return {"id": row['id'], **json.loads(row['data'])}
+
+    def get_profile(self, user_type, profile_id):
+        row = self.connection().execute(
+            f"SELECT id, data FROM {PROFILE_TABLES[user_type]} WHERE id = ?", (profile_id,)
+        ).fetchone()
+        return self._profile(row) if row is not None else None
+
+    def profiles_after(self, user_type, after_id=0):
+        rows = self.connection().execute(
+            f"SELECT id, data FROM {PROFILE_TABLES[user_type]} WHERE id > ? ORDER BY id", (after_id,)
+        )
+        return [self._profile(row) for row in rows]
+
+    def count_profiles(self, user_type):
+        return self.connection().execute(
+            f"SELECT COUNT(*) FROM {PROFILE_TABLES[user_type]}"
+        ).fetchone()[0]
+
+    def profile_ids_with_skill(self, user_type, skill):
+        """IDs of profiles listing `skill` (or one of its aliases), ascending"""
+        rows = self.connection().execute(
+            f"SELECT profile_id FROM {user_type}_skills WHERE skill = ? ORDER BY profile_id",
+            (self.dictionary.canonical(skill),)
+        )
+        return [row[0] for row in rows]
+
+    def list_profiles(self, user_type, filters=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Filters: location, workMode, department (exact, case-insensitive;
+        location compares the city), skills (all of them, aliases folded),
+        stipendMin/stipendMax and q (free text over SEARCH_FIELDS). Pages are
+        keyed on the profile ID, newest first.
+        Raises ValueError for filters the profile type does not support.
+        """
+        filters = {key: value for key, value in (filters or {}).items() if value not in (None, '')}
+        table = PROFILE_TABLES[user_type]
+        skills_table = f"{user_type}_skills"
+        search_table = f"{user_type}_search"
+        conditions = []     # (SQL, parameter) pairs
+
+        for name, (column, key_fn) in EQUALITY_FILTERS[user_type].items():
+            if name in filters:
+                conditions.append((f"p.{column} = ?", key_fn(filters.pop(name))))
+
+        for name, operator in (('stipendMin', '>='), ('stipendMax', '<=')):
+            if name in filters:
+                if user_type != 'internship':
+                    raise ValueError(f"{name} only applies to internships")
+                conditions.append((f"p.stipend_amount {operator} ?", int(filters.pop(name))))
+
+        skills = sorted(self._skill_keys(filters.pop('skills', None)))
+        query = _search_query(filters.pop('q', None))
+
+        if filters:
+            raise ValueError(f"Unsupported filter for {table}: {', '.join(sorted(filters))}")
+
+        # Walk one ID-ordered index newest first and stop once a page is full:
+        # the full-text index when searching, else the first skill's postings,
+        # else the table itself. CROSS JOIN pins that index as the outer loop.
+        if query is not None:
+            source = f"{search_table} d CROSS JOIN {table} p ON p.id = d.rowid"
+            key = "d.rowid"
+            conditions.insert(0, (f"d.{search_table} MATCH ?", query))
+        elif skills:
+            source = f"{skills_table} d CROSS JOIN {table} p ON p.id = d.profile_id"
+            key = "d.profile_id"
+            conditions.insert(0, ("d.skill = ?", skills.pop(0)))
+        else:
+            source = f"{table} p"
+            key = "p.id"
+
+        for skill in skills:
+            conditions.append(
+                (f"EXISTS (SELECT 1 FROM {skills_table} s WHERE s.skill = ? AND s.profile_id = p.id)", skill)
+            )
+        if cursor is not None:
+            if not str(cursor).isdigit():
+                raise ValueError("Invalid cursor")
+            conditions.append((f"{key} < ?", int(cursor)))
+
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where = f"WHERE {' AND '.join(sql for sql, _ in conditions)}" if conditions else ''
+        rows = self.connection().execute(
+            f"SELECT p.id, p.data FROM {source} {where} ORDER BY {key} DESC LIMIT ?",
+            [value for _, value in conditions] + [limit + 1]
+        ).fetchall()
+
+        profiles = [self._profile(row) for row in rows[:limit]]
+        next_cursor = str(profiles[-1]['id']) if len(rows) > limit else None
+        return profiles, next_cursor
+
+    # ---- batch match reports ----
+
+    def batch_run(self, run):
+        row = self.connection().execute('SELECT params FROM batch_runs WHERE run = ?', (run,)).fetchone()
+        return json.loads(row['params']) if row is not None else None
+
+    def start_batch_run(self, run, params):
+        with self.connection() as conn:
+            conn.execute('DELETE FROM batch_matches WHERE run = ?', (run,))
+            conn.execute(
+                'INSERT OR REPLACE INTO batch_runs (run, params, created_at) VALUES (?, ?, ?)',
+                (run, json.dumps(params), datetime.now().isoformat())
+            )
+
+    def add_batch_matches(self, run, chunk, matches):
+        columns = list(BATCH_MATCH_COLUMNS)
+        insert = (f"INSERT OR REPLACE INTO batch_matches (run, chunk, {', '.join(columns)}) "
+                  f"VALUES (?, ?, {', '.join('?' for _ in columns)})")
+        with self.connection() as conn:
+            conn.executemany(insert, [[run, chunk] + [_column_value(match[BATCH_MATCH_COLUMNS[column]])
+                                                      for column in columns] for match in matches])
+
+    def batch_chunks(self, run):
+        rows = self.connection().execute('SELECT DISTINCT chunk FROM batch_matches WHERE run = ?', (run,))
+        return {row[0] for row in rows}
+
+    def get_batch_matches(self, run, internship_id):
+        rows = self.connection().execute(
+            f"SELECT {', '.join(BATCH_MATCH_COLUMNS)} FROM batch_matches "
+            f"WHERE run = ? AND internship_id = ? ORDER BY rank", (run, internship_id)
+        )
+        return [{field: row[column] for column, field in BATCH_MATCH_COLUMNS.items()} for row in rows]
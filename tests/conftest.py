@@ -0,0 +1,33 @@
+"""
+Shared fixtures: small deterministic corpora from the seed data generators
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seed_data import generate_candidates, generate_internships
+
+
+def numbered(records):
+    """Records with sequential IDs, as the repository would store them"""
+    return [dict(record, id=number) for number, record in enumerate(records, 1)]
+
+
+@pytest.fixture
+def candidates():
+    return numbered(generate_candidates(200, seed=1))
+
+
+@pytest.fixture
+def internships():
+    return numbered(generate_internships(60, seed=2))
+
+
+@pytest.fixture
+def matcher(candidates, internships):
+    from app import HybridMatcher
+    return HybridMatcher(candidates, internships, semantic_mode=None)
@@ -0,0 +1,60 @@
+import csv
+
+import pytest
+
+from batch_match import BatchMatchJob, CsvOutput, plan_blocks
+
+
+def report_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return sorted((int(row['internshipId']), int(row['rank']), int(row['candidateId']), float(row['matchScore']))
+                      for row in csv.DictReader(f))
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_resumed_run_equals_indexed_match(tmp_path, matcher):
+    top_k = 5
+    path = str(tmp_path / 'report.csv')
+    # Small budget, so the run has several chunks to resume from
+    job = BatchMatchJob(matcher.index, top_k=top_k, memory_mb=1, workers=1)
+
+    def stop_after_first(done, total):
+        assert total > 1
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        job.run(CsvOutput(path), progress=stop_after_first)
+    summary = job.run(CsvOutput(path))
+    assert summary['resumedChunks'] == 1
+    assert summary['rows'] == (summary['internships'] - summary['chunkInternships']) * top_k
+
+    expected = []
+    for internship in matcher.index.internships:
+        for rank, result in enumerate(matcher.indexed_match(internship, 'internship', top_n=top_k), 1):
+            expected.append((internship['id'], rank, result['candidate']['id'], result['match_score']))
+    assert report_rows(path) == sorted(expected)
+
+
+def test_restart_discards_progress(tmp_path, matcher):
+    path = str(tmp_path / 'report.csv')
+    job = BatchMatchJob(matcher.index, top_k=3, workers=1)
+    job.run(CsvOutput(path))
+    summary = job.run(CsvOutput(path), restart=True)
+    assert summary['resumedChunks'] == 0
+    assert len(report_rows(path)) == summary['internships'] * 3
+
+
+def test_plan_blocks_counts_worker_copies():
+    budget = 64 * 2 ** 20
+    chunk, block, workers = plan_blocks(100000, 1000, budget, 4)
+    assert workers == 4 and chunk * block * 4 * 160 <= budget
+
+    # Each unforked worker holds its own 10 MB corpus copy: at most half the budget goes to copies
+    chunk, block, workers = plan_blocks(100000, 1000, budget, 4, worker_bytes=10 * 2 ** 20)
+    assert workers == 3
+    assert chunk * block * workers * 160 <= budget - workers * 10 * 2 ** 20
+
+    assert plan_blocks(100000, 1000, budget, 4, worker_bytes=budget)[2] == 1
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from cache import LRUCache, MatchCache
+
+
+def test_lru_evicts_least_recent():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_match_cache_hit_within_ttl():
+    cache = MatchCache(ttl=60)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('key', lambda: calls.append(1) or ['result']) == ['result']
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 2
+
+
+def test_match_cache_expires_after_ttl():
+    cache = MatchCache(ttl=0.05)
+    calls = []
+    cache.get_or_compute('key', lambda: calls.append(1))
+    time.sleep(0.1)
+    cache.get_or_compute('key', lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_errors_are_not_cached():
+    cache = MatchCache(ttl=60)
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('key', fail)
+    assert cache.get_or_compute('key', lambda: 'ok') == 'ok'
+
+
+def test_single_flight_shares_result_and_error():
+    cache = MatchCache(ttl=60)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise RuntimeError('boom')
+
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(cache.get_or_compute('key', slow))
+        except RuntimeError as e:
+            outcomes.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=call) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    while cache.stats()['coalesced'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader] + waiters:
+        thread.join(5)
+
+    assert calls == [1]
+    assert outcomes == ['boom'] * 4
+    assert len(cache.memory) == 0
+
+
+def test_cached_match_does_not_cache_failures(candidates, internships):
+    from app import HybridMatcher
+
+    matcher = HybridMatcher(candidates, internships, match_cache=MatchCache(ttl=60), semantic_mode=None)
+    query = dict(candidates[0], id=None)
+    score_pairs, failing = matcher.score_pairs, [True]
+
+    def flaky(*args, **kwargs):
+        if failing[0]:
+            raise RuntimeError('boom')
+        return score_pairs(*args, **kwargs)
+
+    matcher.score_pairs = flaky
+    assert matcher.cached_match(query, 'candidate') == []
+    failing[0] = False
+    assert len(matcher.cached_match(query, 'candidate')) == 10
@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+
+from filters import MatchFilter
+
+TODAY = date(2026, 1, 15)
+
+
+@pytest.mark.parametrize('value, enabled', [
+    (True, True), ('true', True), ('TRUE', True), ('1', True),
+    (False, False), ('false', False), ('0', False)
+])
+def test_open_only_booleans(value, enabled):
+    match_filter = MatchFilter.parse('internship', {'openOnly': value, 'workMode': 'Remote'}, TODAY)
+    assert match_filter.deadline_after == (TODAY.toordinal() if enabled else None)
+
+
+@pytest.mark.parametrize('value', ['yes', 'no', 1, 2, [], {'a': 1}])
+def test_open_only_rejects_non_booleans(value):
+    with pytest.raises(ValueError, match='openOnly must be a boolean'):
+        MatchFilter.parse('internship', {'openOnly': value}, TODAY)
+
+
+def test_nothing_constrained():
+    assert MatchFilter.parse('internship', None) is None
+    assert MatchFilter.parse('internship', {'workMode': '', 'openOnly': 'false'}) is None
+
+
+def test_parse_values():
+    match_filter = MatchFilter.parse('internship', {
+        'workMode': ' remote ', 'location': 'Mumbai, Maharashtra', 'stipendMin': '20000',
+        'openOnly': True, 'deadlineAfter': '2026-03-01'
+    }, TODAY)
+    assert match_filter.equals == {'workMode': 'remote', 'location': 'mumbai'}
+    assert match_filter.stipend_min == 20000
+    assert match_filter.deadline_after == date(2026, 3, 1).toordinal()
+
+
+@pytest.mark.parametrize('values', [
+    {'stipendMin': 'lots'},
+    {'deadlineAfter': 'soon'},
+    {'availability': 'Immediate'},      # Candidate-only filter
+    'Remote'
+])
+def test_parse_errors(values):
+    with pytest.raises(ValueError):
+        MatchFilter.parse('internship', values, TODAY)
+
+
+def test_matches():
+    match_filter = MatchFilter.parse('internship', {'workMode': 'Remote', 'stipendMin': 20000}, TODAY)
+    assert match_filter.matches({'workMode': 'REMOTE', 'stipend': '₹25,000/month'})
+    assert not match_filter.matches({'workMode': 'Remote', 'stipend': '₹10,000/month'})
+    assert not match_filter.matches({'workMode': 'Hybrid', 'stipend': '₹25,000/month'})
+    assert not match_filter.matches({'workMode': 'Remote'})
@@ -0,0 +1,79 @@
+import io
+import json
+
+import pytest
+
+from ingest import RowError, iter_json_array, iter_ndjson, validate_row
+
+
+class ChunkedStream(io.BytesIO):
+    """Returns at most `size` bytes per read, to split tokens across chunks"""
+
+    def __init__(self, data, size):
+        super().__init__(data)
+        self.size = size
+        self.read_bytes = 0
+
+    def read(self, n=-1):
+        data = super().read(self.size)
+        self.read_bytes += len(data)
+        return data
+
+
+def parse(text, size=3):
+    return list(iter_json_array(ChunkedStream(text.encode('utf-8'), size)))
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64 * 1024])
+def test_json_array_across_chunk_boundaries(size):
+    values = [{"name": "Priya", "skills": "Python, SQL"}, 1.5e-3, -20, True, None, "café \\u00e9", []]
+    assert parse(json.dumps(values), size) == values
+
+
+def test_json_array_empty_and_whitespace():
+    assert parse(' \n[ ]\n') == []
+
+
+@pytest.mark.parametrize('text', [
+    '[{"a": 1} {"b": 2}]',      # No comma between elements
+    '[1 2]',
+    '[1,]',
+    '[,1]',
+    '[1,,2]',
+    '{"a": 1}',
+    '[1',
+])
+def test_json_array_rejects_malformed(text):
+    with pytest.raises(ValueError):
+        parse(text)
+
+
+def test_malformed_element_stops_reading():
+    elements = [json.dumps({"name": "x" * 100, "n": n}) for n in range(5000)]
+    elements[3] = '{"name": oops}'
+    stream = ChunkedStream(('[' + ','.join(elements) + ']').encode('utf-8'), 4096)
+    with pytest.raises(ValueError):
+        list(iter_json_array(stream))
+    assert stream.read_bytes <= 8192
+
+
+def test_element_size_is_bounded():
+    stream = ChunkedStream(b'[{"a": "' + b'x' * 100000, 1024)
+    with pytest.raises(ValueError, match='longer than'):
+        list(iter_json_array(stream, max_element_chars=10000))
+    assert stream.read_bytes < 20000
+
+
+def test_ndjson_bad_line_is_a_row_error():
+    rows = list(iter_ndjson(io.BytesIO(b'{"a": 1}\n\nnot json\n{"b": 2}\n')))
+    assert rows[0] == {"a": 1} and rows[2] == {"b": 2}
+    assert isinstance(rows[1], RowError)
+
+
+def test_validate_row():
+    profile = validate_row('candidate', {"name": "Priya", "skills": "Python", "resumeScore": "87"})
+    assert profile['resumeScore'] == 87 and profile['certifications'] == []
+    with pytest.raises(RowError, match='Missing required fields: skills'):
+        validate_row('candidate', {"name": "Priya"})
+    with pytest.raises(RowError):
+        validate_row('internship', {"title": "Intern", "company": "X", "requiredSkills": "Go", "stipend": {}})
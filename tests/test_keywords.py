@@ -0,0 +1,46 @@
+import pytest
+
+from keywords import KeywordMatcher
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return KeywordMatcher({
+        'Java': 'Java', 'C++': 'C++', 'Node.js': 'Node.js', 'SQL': 'SQL', 'Python': 'Python',
+        'Machine Learning': 'Machine Learning', 'B.Com': 'B.COM', 'bcom': 'B.COM'
+    })
+
+
+@pytest.mark.parametrize('text, found', [
+    ('Java and JavaScript', ['Java']),
+    ('JavaScript only', []),
+    ('mysql, sqlite', []),
+    ('C++, Node.js.', ['C++', 'Node.js']),
+    ('C++11', []),
+    ('see node.js/docs', ['Node.js']),
+    ('Java-based services', ['Java']),
+    ('machine   LEARNING', ['Machine Learning']),
+    ('B.Com (2023), bcom', ['B.COM']),
+])
+def test_word_boundaries(matcher, text, found):
+    assert matcher.find_unique(text) == found
+
+
+@pytest.mark.parametrize('text', [
+    'Mail jo@b.com or jo.python@bcom.in',
+    'see www.python.org or http://sql.io',
+    'me@java.com',
+])
+def test_emails_and_urls_are_not_keywords(matcher, text):
+    assert matcher.find_unique(text) == []
+
+
+def test_finditer_spans(matcher):
+    text = 'Python, SQL'
+    assert [(value, text[start:end]) for value, start, end in matcher.finditer(text)] == [
+        ('Python', 'Python'), ('SQL', 'SQL')
+    ]
+
+
+def test_empty_matcher():
+    assert KeywordMatcher({}).find_unique('anything') == []
@@ -0,0 +1,63 @@
+import numpy as np
+from scipy import sparse
+
+from filters import MatchFilter
+from matching import MatchIndex, RowBlocks
+
+
+def make_index(matcher, candidates, internships, **kwargs):
+    return MatchIndex(matcher.create_profile_text, candidates, internships, matcher.skill_dictionary,
+                      background_refit=False, **kwargs)
+
+
+def test_incremental_sync_uses_the_fitted_model(matcher, candidates, internships):
+    index = make_index(matcher, candidates[:150], internships, refit_threshold=1.0)
+    assert index.sync()
+    version, vectorizer = index.version, index.vectorizer
+
+    index.candidates.extend(candidates[150:])
+    assert index.sync()
+    side = index.sides['candidate']
+    assert index.version == version and side.count == len(candidates)
+    expected = vectorizer.transform(index._texts(side, side.rows))
+    assert abs(index.matrix('candidate') - expected).max() < 1e-12
+
+
+def test_refit_after_drift(matcher, candidates, internships):
+    index = make_index(matcher, candidates[:100], internships, refit_threshold=0.25)
+    index.sync()
+    version = index.version
+    refits = []
+    index.refit_listeners.append(lambda: refits.append(index.version))
+
+    index.candidates.extend(candidates[100:])
+    index.sync()
+    assert index.version > version and refits == [index.version]
+    assert index.drift() == 0
+
+    fresh = make_index(matcher, candidates, internships)
+    fresh.sync()
+    assert abs(index.matrix('candidate') - fresh.matrix('candidate')).max() < 1e-12
+
+
+def test_filter_pushdown_equals_filtering_afterwards(matcher, candidates, internships):
+    match_filter = MatchFilter.parse('internship', {'workMode': internships[0]['workMode'], 'stipendMin': 20000})
+    query = candidates[5]
+    everything = matcher.indexed_match(query, 'candidate', top_n=len(internships))
+    expected = [result for result in everything if match_filter.matches(result['internship'])][:5]
+
+    filtered = matcher.indexed_match(query, 'candidate', top_n=5, match_filter=match_filter)
+    assert expected
+    assert ([(result['internship']['id'], result['match_score']) for result in filtered] ==
+            [(result['internship']['id'], result['match_score']) for result in expected])
+
+
+def test_row_blocks_indexing():
+    rng = np.random.default_rng(0)
+    full = sparse.random(30, 8, density=0.3, format='csr', random_state=rng)
+    blocks = RowBlocks([full[:10], full[10:12], full[12:]], 8)
+    assert blocks.shape == (30, 8)
+    assert abs(blocks.tocsr() - full).max() == 0
+    assert abs(blocks[5:20] - full[5:20]).max() == 0
+    rows = np.array([29, 0, 11, 10, 3, 11])
+    assert abs(blocks[rows] - full[rows]).max() == 0
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+from matching import MatchIndex
+from snapshots import SnapshotStore
+
+
+def make_index(matcher, candidates, internships, store):
+    return MatchIndex(matcher.create_profile_text, list(candidates), list(internships), matcher.skill_dictionary,
+                      background_refit=False, snapshot_store=store, snapshot_interval=0)
+
+
+def test_load_snapshot_keeps_the_mapped_base(tmp_path, matcher, candidates, internships):
+    store = SnapshotStore(str(tmp_path))
+    publisher = make_index(matcher, candidates[:150], internships, store)
+    publisher.sync()
+    assert store.current() == publisher.snapshot
+
+    reader = make_index(matcher, candidates[:150], internships, store)
+    assert reader.load_snapshot() and reader.snapshot == store.current()
+    side = reader.sides['candidate']
+    assert side.shared and isinstance(side.blocks[0].data.base.base, np.memmap)
+
+    # Rows saved after the snapshot go into a private tail next to the mapped base
+    reader.candidates.extend(candidates[150:])
+    reader.sync()
+    assert len(side.blocks) == 2 and isinstance(side.blocks[0].data.base.base, np.memmap)
+    expected = reader.vectorizer.transform(reader._texts(side, side.rows))
+    assert abs(reader.matrix('candidate') - expected).max() < 1e-12
+
+
+def test_prune_waits_for_the_grace_period(tmp_path, matcher, candidates, internships):
+    store = SnapshotStore(str(tmp_path), keep=1, grace=3600)
+    index = make_index(matcher, candidates, internships, store)
+    index.sync()
+    for _ in range(3):
+        index.publish()
+    assert len(store.versions()) == 4
+
+    store.grace = 0
+    store.prune()
+    assert store.versions() == [store.current()]
+
+
+def test_load_snapshot_retries_a_pruned_version(tmp_path, matcher, candidates, internships):
+    store = SnapshotStore(str(tmp_path), grace=0)
+    index = make_index(matcher, candidates, internships, store)
+    index.sync()
+    first = store.current()
+    index.publish()
+    index.publish()
+    store.keep = 1
+    store.prune()
+    assert not os.path.exists(os.path.join(str(tmp_path), first))
+
+    # CURRENT read just before the version it named was pruned
+    reader = make_index(matcher, candidates, internships, store)
+    names = iter([first])
+    current = store.current
+    store.current = lambda: next(names, None) or current()
+    assert reader.load_snapshot()
+    assert reader.snapshot == current()
+
+
+def test_load_snapshot_missing_files_is_not_an_error(tmp_path, matcher, candidates, internships):
+    store = SnapshotStore(str(tmp_path))
+    index = make_index(matcher, candidates, internships, store)
+    index.sync()
+    os.remove(os.path.join(str(tmp_path), store.current(), 'candidate.tfidf_indptr.npy'))
+
+    reader = make_index(matcher, candidates, internships, store)
+    assert reader.load_snapshot() is False
+    assert reader.snapshot is None